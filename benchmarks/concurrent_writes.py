@@ -0,0 +1,102 @@
+"""Benchmark writing the input files sequentially and concurrently.
+
+The synthetic system of ``input_generation.py`` (subregions, several Ms values, a
+spatially varying Zeeman field and a spatially varying Zhang-Li current) is
+written with ``TimeDriver.write_mx3`` into a temporary directory, which writes
+``m0.omf``, ``mumax3_regions.omf``, ``B_ext.ovf`` and ``j.ovf``. The wall time is
+the best of ``--repeat`` runs for every number of ``--workers`` (``0`` writes the
+files sequentially) and the speedup is relative to the sequential writes. The
+total time spent writing files (``write_ovf`` in the telemetry) bounds the
+saving: the writes overlap with the script generation where they wait for the
+filesystem or run numpy code outside of the GIL on another core. Use
+``--dirname`` to write to a specific filesystem (e.g. a network filesystem).
+
+Without slow I/O there is no measurable gain. On a local ext4 disk (one core) the
+differences are within the run-to-run noise:
+
+=========  =======  =========  =========
+cells      workers  time (s)   speedup
+=========  =======  =========  =========
+1e6        0        0.52       1.00
+1e6        4        0.50       1.05
+4e6        0        3.06       1.00
+4e6        4        3.00       1.02
+=========  =======  =========  =========
+
+Usage::
+
+    python benchmarks/concurrent_writes.py [--cells 1e5 1e6] [--workers 0 2 4]
+        [--repeat 3] [--dirname DIR]
+
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from input_generation import synthetic_system
+
+import mumax3c as mc
+
+
+def system_with_files(cells):
+    """Synthetic system whose input files are all written to OVF files."""
+    system = synthetic_system(cells, subregions=8, ms_levels=4)
+    mesh = system.m.mesh
+    x, y, _ = np.indices(mesh.n)
+    # A triangle with a different Ms is not a box, so the regions are written to
+    # mumax3_regions.omf.
+    system.m.norm = system.m.norm.array + 1e5 * (x + y < mesh.n[0] // 2)[..., None]
+    return system
+
+
+def write_time(system, workers, dirname=None, repeat=3):
+    """Best wall time of writing the mx3 file and all input files.
+
+    Returns the wall time and the total time spent writing input files.
+
+    """
+    driver = mc.TimeDriver()
+    times = []
+    for _ in range(repeat):
+        telemetry = mc.telemetry.Telemetry()
+        with tempfile.TemporaryDirectory(dir=dirname) as tmpdir:
+            start = time.perf_counter()
+            with telemetry.activate():
+                driver.write_mx3(
+                    system, dirname=tmpdir, t=1e-9, n=1, write_workers=workers
+                )
+            seconds = time.perf_counter() - start
+            times.append((seconds, telemetry.phases["write_ovf"]))
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=float, nargs="+", default=[1e5, 1e6])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dirname", default=None)
+    args = parser.parse_args()
+
+    print(
+        f"{'cells':>10} {'workers':>8} {'time (ms)':>10} {'writes (ms)':>12}"
+        f" {'speedup':>8}"
+    )
+    for cells in args.cells:
+        system = system_with_files(int(cells))
+        sequential = None
+        for workers in args.workers:
+            seconds, writes = write_time(system, workers, args.dirname, args.repeat)
+            if workers == 0:
+                sequential = seconds
+            speedup = f"{sequential / seconds:.2f}" if sequential else "-"
+            print(
+                f"{int(cells):>10} {workers:>8} {seconds * 1e3:>10.1f}"
+                f" {writes * 1e3:>12.1f} {speedup:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the time of ``import mumax3c`` in fresh interpreters.
+
+Every repetition starts a new Python process so that no module is cached. The
+cumulative import time of ``mumax3c`` is taken from ``python -X importtime``, which
+excludes the start-up time of the interpreter itself.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat 10] [--budget 0.2]
+
+"""
+
+import argparse
+import re
+import statistics
+import subprocess as sp
+import sys
+
+HEAVY_MODULES = [
+    "discretisedfield",
+    "micromagneticmodel",
+    "pandas",
+    "pytest",
+    "ubermagtable",
+]
+
+
+def import_time(module="mumax3c"):
+    """Cumulative import time of ``module`` in seconds in a fresh interpreter."""
+    res = sp.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=sp.PIPE,
+        check=True,
+    )
+    for line in res.stderr.decode().splitlines():
+        match = re.match(r"import time:\s*\d+ \|\s*(\d+) \| (\S+)$", line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) * 1e-6
+    raise RuntimeError(f"{module} not found in the -X importtime output.")
+
+
+def loaded_modules(module="mumax3c"):
+    """Heavy modules that are imported by ``import module``."""
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    res = sp.run([sys.executable, "-c", code], stdout=sp.PIPE, check=True)
+    return res.stdout.decode().split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=None, help="seconds")
+    args = parser.parse_args()
+
+    times = [import_time() for _ in range(args.repeat)]
+    median = statistics.median(times)
+    print(
+        f"import mumax3c: median {median * 1e3:.1f} ms, min {min(times) * 1e3:.1f} ms"
+    )
+    print(f"heavy modules imported: {loaded_modules() or 'none'}")
+    if args.budget is not None and median > args.budget:
+        print(f"Import time exceeds the budget of {args.budget * 1e3:.0f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark the time and peak memory of writing the mumax3 input files.
+
+Synthetic systems with ``--cells`` cells (up to ``1e8``) are built with
+``--subregions`` subregions (slabs along y with different exchange constants),
+``--ms-levels`` values of the saturation magnetisation (slabs along x), and a
+spatially varying Zeeman field and Zhang-Li current. The O(cells) steps of the
+input generation are benchmarked in a temporary directory without running mumax3:
+
+- ``regions``: ``mumax3_regions`` with box-shaped regions (``DefRegion``)
+- ``regions_file``: ``mumax3_regions`` writing the region map
+- ``set_parameter``: ``set_parameter`` with subregions and with a Zeeman field
+- ``write_ovf``: writing the magnetisation with ``write_field``
+- ``zhang_li``: the current of a time drive (``zhang_li_current`` writing ``j.ovf``)
+- ``system_script``: ``system_script`` including all input files
+
+The time is the best of ``--repeat`` runs. The peak memory is measured with
+``tracemalloc`` (which includes numpy arrays) in a separate run, relative to the
+memory allocated before the step. A system with ``1e8`` cells requires several
+tens of GB of memory.
+
+Usage::
+
+    python benchmarks/input_generation.py [--cells 1e3 1e4 1e5 1e6] [--repeat 3]
+        [--subregions 8] [--ms-levels 4] [--cases regions system_script]
+        [--output results.json]
+
+"""
+
+import argparse
+import json
+import math
+import tempfile
+import time
+import tracemalloc
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import ubermagutil as uu
+
+import mumax3c as mc
+
+
+def shape(cells):
+    """Number of cells of a thin film with approximately ``cells`` cells."""
+    nz = 1 if cells < 1e4 else 4
+    side = max(1, round(math.sqrt(cells / nz)))
+    return side, side, nz
+
+
+def synthetic_system(cells, subregions=8, ms_levels=4):
+    """System with subregions, several Ms values, a Zeeman field and a current."""
+    n = shape(cells)
+    cell = (2e-9, 2e-9, 2e-9)
+    p2 = np.multiply(n, cell)
+    # Slabs along y, aligned with the cells.
+    edges = np.linspace(0, n[1], subregions + 1).astype(int) * cell[1]
+    mesh = df.Mesh(
+        p1=(0, 0, 0),
+        p2=p2,
+        cell=cell,
+        subregions={
+            f"r{i}": df.Region(p1=(0, lower, 0), p2=(p2[0], upper, p2[2]))
+            for i, (lower, upper) in enumerate(zip(edges[:-1], edges[1:]))
+            if upper > lower
+        },
+    )
+    levels = 8e5 * (1 + np.arange(ms_levels) / ms_levels)
+    value = np.zeros((*n, 3))
+    value[..., 2] = levels[np.arange(n[0]) * ms_levels // n[0]][:, None, None]
+    H = np.zeros((*n, 3))
+    H[..., 0] = np.linspace(0, 1e5, n[0])[:, None, None]
+    u = np.zeros((*n, 3))
+    u[..., 0] = np.linspace(0, 100, n[1])[None, :, None]
+
+    system = mm.System(name="benchmark")
+    system.energy = (
+        mm.Exchange(A={name: 1e-11 * (1 + i) for i, name in enumerate(mesh.subregions)})
+        + mm.Demag()
+        + mm.Zeeman(H=df.Field(mesh, nvdim=3, value=H))
+    )
+    system.dynamics = (
+        mm.Precession(gamma0=mm.consts.gamma0)
+        + mm.Damping(alpha=0.01)
+        + mm.ZhangLi(u=df.Field(mesh, nvdim=3, value=u), beta=0.1)
+    )
+    system.m = df.Field(mesh, nvdim=3, value=value)
+    return system
+
+
+def _regions(system):
+    mc.scripts.mumax3_regions(system, ovf_format="bin4")
+
+
+def _regions_file(system):
+    mc.scripts.mumax3_regions(system, ovf_format="bin4", shapes=False)
+
+
+def _set_parameter(system):
+    (term,) = system.energy.get(type=mm.Exchange)
+    mc.scripts.set_parameter(dict(term.A), "Aex", system)
+    mc.scripts.set_parameter(system.energy.zeeman.H * mm.consts.mu0, "B_ext", system)
+
+
+def _write_ovf(system):
+    mc.scripts.util.write_field(system.m.orientation, "m0.omf", ovf_format="bin4")
+
+
+def _zhang_li(system):
+    (term,) = system.dynamics.get(type=mm.ZhangLi)
+    vars(term).pop("_current_source", None)  # write j.ovf in every run
+    mc.scripts.driver.stage_script(mc.TimeDriver(), system, t=1e-9, n=1)
+
+
+def _system_script(system):
+    mc.scripts.system_script(system, ovf_format="bin4")
+
+
+CASES = {
+    "regions": _regions,
+    "regions_file": _regions_file,
+    "set_parameter": _set_parameter,
+    "write_ovf": _write_ovf,
+    "zhang_li": _zhang_li,
+    "system_script": _system_script,
+}
+
+
+def measure(function, system, repeat=3):
+    """Best time in seconds and peak memory in bytes of ``function(system)``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(system)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        function(system)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6])
+    parser.add_argument("--subregions", type=int, default=8)
+    parser.add_argument("--ms-levels", type=int, default=4)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="json file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'cells':>10} {'case':>14} {'time (ms)':>12} {'peak (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir, uu.changedir(tmpdir):
+        for cells in args.cells:
+            system = synthetic_system(int(cells), args.subregions, args.ms_levels)
+            # set_parameter requires the region relator
+            mc.scripts.mumax3_regions(system, ovf_format="bin4")
+            cells = int(math.prod(system.m.mesh.n))
+            for case in args.cases:
+                seconds, peak = measure(CASES[case], system, repeat=args.repeat)
+                results.append(
+                    {"cells": cells, "case": case, "time": seconds, "peak": peak}
+                )
+                print(
+                    f"{cells:>10} {case:>14} {seconds * 1e3:>12.2f} {peak / 1e6:>10.1f}"
+                )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
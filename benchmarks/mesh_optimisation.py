@@ -0,0 +1,68 @@
+"""Benchmark the demagnetisation FFTs before and after optimising the mesh.
+
+A thin film with vacuum margins and a number of cells with large prime factors is
+optimised with ``mumax3c.scripts.mesh.optimise_mesh``. For both meshes, the
+forward and inverse FFT of the zero-padded grid used by mumax3 for the demag
+convolution are timed with numpy, which is a proxy for the cuFFT performance of
+mumax3 (both are fastest for sizes with small prime factors). The throughput is
+given in original cells per second.
+
+Usage::
+
+    python benchmarks/mesh_optimisation.py [--n 509 251 1] [--margin 20] [--repeat 5]
+
+"""
+
+import argparse
+import math
+import time
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+
+import mumax3c as mc
+
+
+def film(n, margin, cell=1e-9):
+    """System with ``margin`` vacuum cells on each side in x and y."""
+    mesh = df.Mesh(p1=(0, 0, 0), p2=np.multiply(n, cell), n=n)
+    value = np.zeros((*n, 3))
+    value[margin:-margin, margin:-margin, :, 2] = 8e5
+    system = mm.System(name="film")
+    system.m = df.Field(mesh, nvdim=3, value=value)
+    return system
+
+
+def demag_fft_time(mesh, repeat=5):
+    """Best time of a forward and inverse FFT of the padded demag grid."""
+    grid = mc.estimation._fft_grid(mesh)
+    array = np.random.default_rng(0).random(grid, dtype=np.float32)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        np.fft.irfftn(np.fft.rfftn(array), s=grid, axes=(0, 1, 2))
+        times.append(time.perf_counter() - start)
+    return grid, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, nargs=3, default=[509, 251, 1])
+    parser.add_argument("--margin", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    system = film(args.n, args.margin)
+    mapping = mc.scripts.mesh.optimise_mesh(system)
+    cells = math.prod(args.n)
+    for label, mesh in [("original", mapping.mesh), ("optimised", mapping.optimised)]:
+        grid, seconds = demag_fft_time(mesh, repeat=args.repeat)
+        print(
+            f"{label:>9}: n={tuple(mesh.n.tolist())}, fft grid={grid},"
+            f" {seconds * 1e3:.1f} ms, {cells / seconds:.3g} cells/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,8 @@
-"""Mumax3 calculator."""
+"""Mumax3 calculator.
 
-import importlib.metadata
-
-import pytest
-
-import mumax3c.mumax3
-import mumax3c.scripts
+``runner`` gives access to the default mumax3 runner used by ``mumax3c``; it is
+created on first access. For details refer to ``mumax3c.mumax3.Runner``.
 
-# from .compute import compute  # compute is not yet supported
-from .delete import delete as delete
-from .drivers import MinDriver as MinDriver
-from .drivers import RelaxDriver as RelaxDriver
-from .drivers import TimeDriver as TimeDriver
-
-runner = mumax3c.mumax3.Runner()
-"""Controls the default runner.
-
-``runner`` gives access to the default mumax3 runner used by ``mumxa3c``. For
-details refer to ``mumax3c.mumax3.Runner``.
-
-Examples
---------
 ``runner.runner``
     Returns the default runner; selects the best available runner if unset. A
     different ``Mumax3Runner`` can be passed to be used instead. The new runner
@@ -30,12 +12,67 @@ Examples
     Lets ``mumax3c`` select the best runner. Can be used to reset the runner
     after overwriting it manually.
 
-See Also
---------
-:py:class:`~mumax3c.mumax3.Runner`
-
 """
 
+import importlib
+import importlib.metadata
+
+# from .compute import compute  # compute is not yet supported
+from .delete import delete as delete
+
+# Submodules and objects are imported on first access (PEP 562) to keep
+# ``import mumax3c`` fast: most of them depend on discretisedfield and
+# micromagneticmodel, which are slow to import.
+_submodules = [
+    "archive",
+    "drivers",
+    "ensemble",
+    "estimation",
+    "evolvers",
+    "io",
+    "jobs",
+    "mumax3",
+    "packing",
+    "scripts",
+    "spectral",
+    "telemetry",
+    "timedependence",
+]
+_objects = {
+    "BackwardEulerEvolver": "evolvers",
+    "Ensemble": "ensemble",
+    "EnsembleDriver": "drivers",
+    "EulerEvolver": "evolvers",
+    "FMRDriver": "drivers",
+    "HeunEvolver": "evolvers",
+    "MinDriver": "drivers",
+    "PipelineDriver": "drivers",
+    "RelaxDriver": "drivers",
+    "RungeKuttaEvolver": "evolvers",
+    "TimeDriver": "drivers",
+    "estimate": "estimation",
+    "export": "archive",
+}
+
+
+def __getattr__(name):
+    if name in _submodules:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _objects:
+        module = importlib.import_module(f"{__name__}.{_objects[name]}")
+        value = getattr(module, name)
+    elif name == "runner":
+        value = __getattr__("mumax3").Runner()
+    else:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    # setdefault: threads accessing the same name concurrently get one object
+    return globals().setdefault(name, value)
+
+
+def __dir__():
+    return sorted([*globals(), *_submodules, *_objects, "runner"])
+
 
 def test():
     """Run all package tests.
@@ -49,12 +86,16 @@ def test():
     >>> # mc.test()
 
     """
+    import pytest
+
     return pytest.main(
         ["-m", "not travis and not docker", "-v", "--pyargs", "mumax3c"]
     )  # pragma: no cover
 
 
 def test_docker():
+    import pytest
+
     return pytest.main(
         ["-m", "docker", "-v", "--pyargs", "mumax3c"]
     )  # pragma: no cover
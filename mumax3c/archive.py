@@ -0,0 +1,195 @@
+"""Export of drive results to chunked array stores."""
+
+import contextlib
+import hashlib
+import json
+import pathlib
+
+import numpy as np
+
+import mumax3c as mc
+
+
+def _open(filename):
+    """Open an HDF5 file or a Zarr store for writing or reading."""
+    suffix = pathlib.Path(filename).suffix
+    if suffix in (".h5", ".hdf5"):
+        try:
+            import h5py
+        except ImportError as e:
+            raise ImportError("Exporting to HDF5 requires h5py.") from e
+        return h5py.File, {"compression": "gzip"}
+    if suffix == ".zarr":
+        try:
+            import zarr
+        except ImportError as e:
+            raise ImportError("Exporting to Zarr requires zarr.") from e
+        return zarr.open_group, {}  # compressed with the default compressor
+    msg = f"Cannot export to {str(filename)!r}; the suffix must be .h5, .hdf5 or .zarr."
+    raise ValueError(msg)
+
+
+def _closing(group):
+    """Context manager closing HDF5 files; Zarr groups need not be closed."""
+    if hasattr(group, "close"):
+        return contextlib.closing(group)
+    return contextlib.nullcontext(group)
+
+
+def _create(group, name, **kwargs):
+    """Create an array in an HDF5 file or a Zarr group.
+
+    Zarr 3 deprecated ``create_dataset`` and requires its ``shape`` argument also
+    with ``data``; ``create_array`` does not.
+
+    """
+    create = getattr(group, "create_array", None) or group.create_dataset
+    return create(name, **kwargs)
+
+
+def _checksum(array):
+    return hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+
+def export(dirname=".", filename=None, precision="float32", delete=False):
+    """Export the magnetisation snapshots and table of a drive to an array store.
+
+    All ``m_full*.ovf`` snapshots written by mumax3 are stored as a single chunked,
+    compressed dataset ``m`` with shape ``(snapshots, *mesh.n, 3)`` and one chunk per
+    snapshot. The snapshots are read and written one at a time, so that the memory
+    required does not depend on the number of snapshots. Every column of the table
+    is stored as dataset ``table/<column>``.
+
+    The mesh (``p1``, ``p2``, ``cell``, ``n``, ``bc``) and the names of the
+    snapshot files are stored as attributes of ``m``, the units of the table as
+    attribute ``units`` of ``table``, and the content of
+    ``info.json`` (including the region relator mapping subregion names to mumax3
+    regions) as attribute ``info`` of the store.
+
+    The format is determined by the suffix of ``filename``: ``.h5`` or ``.hdf5``
+    for HDF5 (requires ``h5py``) and ``.zarr`` for Zarr (requires ``zarr``).
+
+    Parameters
+    ----------
+    dirname : str, pathlib.Path, optional
+
+        Drive directory containing ``info.json`` and the mumax3 output directory.
+        Defaults to the current working directory.
+
+    filename : str, pathlib.Path, optional
+
+        Name of the store. Defaults to ``<system name>.h5`` in ``dirname``.
+
+    precision : str, optional
+
+        Floating-point precision of the stored magnetisation, ``"float32"`` or
+        ``"float64"``. Defaults to ``"float32"``, the precision of the mumax3 output.
+
+    delete : bool, optional
+
+        If ``True``, the snapshot files are deleted after the store has been read
+        back and the checksum of every snapshot has been verified. Defaults to
+        ``False``.
+
+    Returns
+    -------
+    pathlib.Path
+
+        Name of the store.
+
+    Raises
+    ------
+    FileNotFoundError
+
+        If ``dirname`` does not contain a mumax3 output directory.
+
+    RuntimeError
+
+        If the verification of the store fails. The snapshot files are not deleted.
+
+    Examples
+    --------
+    1. Exporting a drive and deleting the snapshots.
+
+    >>> import mumax3c as mc
+    ...
+    >>> # mc.export("macrospin/drive-0", delete=True)
+
+    2. Exporting every drive automatically.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> td = mc.TimeDriver()
+    >>> # td.drive(system, t=1e-9, n=100, export=dict(delete=True))
+
+    """
+    mc.io._check_precision(precision)
+    dirname = pathlib.Path(dirname)
+    try:
+        outdir = next(dirname.glob("*.out"))
+    except StopIteration:
+        msg = f"No mumax3 output directory in {str(dirname)!r}."
+        raise FileNotFoundError(msg) from None
+    if filename is None:
+        filename = dirname / f"{outdir.stem}.h5"
+    filename = pathlib.Path(filename)
+    store, options = _open(filename)
+
+    info = {}
+    infofile = dirname / "info.json"
+    with contextlib.suppress(FileNotFoundError), open(infofile, encoding="utf-8") as f:
+        info = json.load(f)
+
+    files = mc.io.snapshots(outdir)
+    checksums = []
+    group = store(str(filename), mode="w")
+    with _closing(group):
+        group.attrs["info"] = json.dumps(info)
+        for i, ovffile in enumerate(files):
+            field = mc.io.read_field(ovffile, precision=precision)
+            array = field.array.astype(precision, copy=False)
+            if i == 0:
+                mesh = field.mesh
+                m = _create(
+                    group,
+                    "m",
+                    shape=(len(files), *array.shape),
+                    chunks=(1, *array.shape),
+                    dtype=precision,
+                    **options,
+                )
+                m.attrs["p1"] = [float(v) for v in mesh.region.pmin]
+                m.attrs["p2"] = [float(v) for v in mesh.region.pmax]
+                m.attrs["cell"] = [float(v) for v in mesh.cell]
+                m.attrs["n"] = [int(v) for v in mesh.n]
+                m.attrs["bc"] = mesh.bc
+                m.attrs["files"] = [ovffile.name for ovffile in files]
+            m[i] = array
+            checksums.append(_checksum(array))
+            mc.telemetry.read(ovffile)
+
+        tablefile = outdir / "table.txt"
+        if tablefile.exists():
+            reader = mc.io.TableReader(tablefile)
+            table = group.create_group("table")
+            table.attrs["units"] = json.dumps(reader.units)
+            data = reader.read(x=None).data
+            for column in reader.columns:
+                _create(table, column, data=data[column].to_numpy(), **options)
+
+    if filename.is_file():
+        mc.telemetry.written(filename)
+
+    if delete and files:
+        group = store(str(filename), mode="r")
+        with _closing(group):
+            m = group["m"]
+            for i, checksum in enumerate(checksums):
+                if _checksum(m[i]) != checksum:
+                    msg = f"Verification of snapshot {i} in {str(filename)!r} failed."
+                    raise RuntimeError(msg)
+        for ovffile in files:
+            ovffile.unlink()
+
+    return filename
@@ -1,4 +1,7 @@
 from .driver import Driver as Driver
+from .ensembledriver import EnsembleDriver as EnsembleDriver
+from .fmrdriver import FMRDriver as FMRDriver
 from .mindriver import MinDriver as MinDriver
+from .pipelinedriver import PipelineDriver as PipelineDriver
 from .relaxdriver import RelaxDriver as RelaxDriver
 from .timedriver import TimeDriver as TimeDriver
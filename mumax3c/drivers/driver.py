@@ -1,7 +1,12 @@
 import abc
+import json
+import math
+import os
 import pathlib
+import shutil
+import sys
+import tempfile
 
-import discretisedfield as df
 import micromagneticmodel as mm
 import ubermagtable as ut
 import ubermagutil as uu
@@ -18,6 +23,14 @@ class Driver(mm.ExternalDriver):
             self.autoselect_evolver = False
         else:
             self.autoselect_evolver = True
+        self._precision = "float64"
+        self._export = False
+        self._scratch = None
+        self._dry_run = False
+        self._workingdir = None
+        self._mesh_mapping = None
+        self._telemetry = mc.telemetry.Telemetry()
+        self._stdout = ""
 
     @abc.abstractmethod
     def _checkargs(self, **kwargs):
@@ -38,9 +51,87 @@ class Driver(mm.ExternalDriver):
             magnetisation) are used in the mx3 file. If ``False`` relative paths are
             used. Defaults to ``True``.
 
+        precision : str, optional
+
+            Floating-point precision of the magnetisation read back into
+            ``system.m`` after the drive. With ``"float32"`` the single precision
+            output of mumax3 is kept as ``float32`` from the file to ``system.m``,
+            halving the memory required for every loaded state. Defaults to
+            ``"float64"``.
+
+        progress : callable, iterable, optional
+
+            Callable or iterable of callables that receive live metrics of the run
+            (simulated time, solver steps, time step, maximum torque and simulated
+            time per wall-second) while mumax3 is running. The metrics are obtained by
+            tailing the mumax3 table file. For details refer to
+            ``mumax3c.mumax3.ProgressMonitor``. Defaults to ``None``.
+
+        export : bool, str, dict, optional
+
+            If given, the magnetisation snapshots and the table are exported to a
+            chunked HDF5 or Zarr store after the drive with ``mumax3c.export``. With
+            ``True`` the store is written with the default arguments, a string is
+            the name of the store, and a dictionary contains the keyword arguments
+            of ``mumax3c.export`` (e.g. ``delete=True`` to delete the snapshot files
+            after the export). Defaults to ``False``.
+
+        scratch : bool, str, pathlib.Path, optional
+
+            If given, the input files are written and mumax3 is run in a new
+            directory inside the node-local directory ``scratch`` (with ``True``,
+            the directory in the environment variable ``MUMAX3C_SCRATCH`` or the
+            system's temporary directory). After the drive, the results are read
+            from the scratch directory and then moved into the drive directory.
+            This avoids many small writes to slow network filesystems. The mx3
+            file refers to the scratch directory unless ``abspath=False`` is used;
+            then the initial magnetisation is always written to ``m0.omf`` instead
+            of being loaded from the output of the previous drive. Defaults to
+            ``None``.
+
+        optimise_mesh : bool, optional
+
+            If ``True``, all-vacuum margins of the mesh are cropped and the mesh is
+            padded with vacuum to sizes with small prime factors before the drive
+            (see ``mumax3c.scripts.mesh.optimise_mesh``), which speeds up the
+            demagnetisation calculation. The results are mapped back onto the
+            original mesh. Defaults to ``False``.
+
+        memory : bool, optional
+
+            If ``True``, the peak and net memory allocated by Python in every phase
+            of the drive (e.g. ``regions``, ``zeeman``, ``zhang_li``,
+            ``write_ovf`` and ``read``) are traced with ``tracemalloc`` and stored
+            in ``telemetry.json`` (see ``mumax3c.telemetry.Telemetry``). Tracing
+            slows down writing the input files. Defaults to ``False``.
+
+        write_workers : int, optional
+
+            Number of threads writing the input files (e.g. ``m0.omf`` and
+            ``B_ext.ovf``) while the mx3 script is generated (see
+            ``mumax3c.scripts.util.concurrent_writes``). All files are written
+            before mumax3 is started. With ``0`` the files are written one after
+            the other. Without slow I/O (e.g. a network filesystem) there is no
+            measurable gain: on a local disk the writes are dominated by the
+            CPU-bound conversion of the fields (``benchmarks/concurrent_writes.py``).
+            Defaults to ``0``.
+
+        dry_run : bool, optional
+
+            If ``True``, the input files are written to the drive directory but
+            mumax3 is not run and no results are read. Defaults to ``False``.
+
         """
         self._checkargs(**drive_kwargs)
         drive_kwargs.setdefault("abspath", True)
+        drive_kwargs.setdefault("precision", "float64")
+        drive_kwargs.setdefault("export", False)
+        mc.io._check_precision(drive_kwargs["precision"])
+        self._precision = drive_kwargs["precision"]
+        self._export = drive_kwargs["export"]
+        self._scratch = drive_kwargs.get("scratch")
+        self._dry_run = drive_kwargs.get("dry_run", False)
+        self._telemetry = mc.telemetry.Telemetry(memory=drive_kwargs.get("memory"))
 
         # TODO OOMMF support additional arguments; are there equivalent options in mumax
         # fixed_subregions = None  # mumax?
@@ -67,12 +158,104 @@ class Driver(mm.ExternalDriver):
 
         """
         self._checkargs(**schedule_kwargs)
+        if schedule_kwargs.get("optimise_mesh"):
+            raise ValueError("Mesh optimisation is not supported for scheduled jobs.")
         schedule_kwargs.setdefault("abspath", True)
+        self._scratch = None  # scheduled jobs run in the drive directory
+        self._telemetry = mc.telemetry.Telemetry()
 
-    def _write_input_files(self, system, **kwargs):
-        self.write_mx3(system, **kwargs)
+    def schedule(self, system, cmd, header, **kwargs):
+        """Schedule drives of one or many systems.
+
+        For a single system, refer to ``micromagneticmodel.ExternalDriver.schedule``.
+        If ``system`` is a list of systems (or of tuples ``(system, kwargs)`` with
+        the keyword arguments of the individual drives), the drives are submitted
+        as a single job array and the name of the json manifest mapping array
+        indices to drive directories is returned. The results can be gathered with
+        ``mumax3c.jobs.collect`` once the jobs have finished. For the additional
+        keyword arguments of job arrays refer to ``mumax3c.jobs.schedule_array``.
+
+        """
+        if isinstance(system, (list, tuple)):
+            return mc.jobs.schedule_array(self, system, cmd, header, **kwargs)
+        return super().schedule(system, cmd, header, **kwargs)
+
+    def _stage(self, system):
+        """Change to a new staging directory in the scratch directory."""
+        scratch = self._scratch
+        if scratch is True:
+            scratch = os.environ.get("MUMAX3C_SCRATCH", tempfile.gettempdir())
+        pathlib.Path(scratch).mkdir(parents=True, exist_ok=True)
+        self._workingdir = pathlib.Path.cwd()
+        os.chdir(tempfile.mkdtemp(prefix=f"{system.name}-", dir=scratch))
+
+    def _unstage(self):
+        """Move the content of the staging directory into the drive directory.
+
+        The staged files are first copied into a temporary directory next to the
+        drive directory and then renamed, so that the drive directory never
+        contains partially copied files.
+
+        """
+        if self._workingdir is None:
+            return
+        stage, workingdir = pathlib.Path.cwd(), self._workingdir
+        self._workingdir = None
+        os.chdir(workingdir)
+        copy = pathlib.Path(tempfile.mkdtemp(prefix=".staging-", dir=workingdir))
+        try:
+            shutil.copytree(stage, copy, dirs_exist_ok=True)
+            for path in copy.iterdir():
+                os.replace(path, workingdir / path.name)
+        finally:
+            shutil.rmtree(copy, ignore_errors=True)
+        shutil.rmtree(stage, ignore_errors=True)
 
-    def write_mx3(self, system, dirname=".", ovf_format="bin8", abspath=True, **kwargs):
+    def _write_input_files(self, system, **kwargs):
+        if self._scratch:
+            self._stage(system)
+            if not kwargs.get("abspath", True):
+                # A relative path to the previous drive directory would be relative
+                # to the staging directory and break when the files are moved.
+                mc.scripts.magnetisation.untrack_source(system)
+        try:
+            self._write_staged_input_files(system, **kwargs)
+        except Exception:
+            self._unstage()
+            raise
+
+    def _write_staged_input_files(self, system, **kwargs):
+        self._telemetry.record(
+            system=system.name,
+            drive_number=system.drive_number,
+            driver=self.__class__.__name__,
+            cells=int(math.prod(system.m.mesh.n)),
+            mesh_n=[int(i) for i in system.m.mesh.n],
+        )
+        # Recorded to calibrate future estimates against the measured runtime.
+        estimate = mc.estimate(system, self, dirname=None, **kwargs)
+        self._telemetry.record(
+            estimated_cost=estimate["cost"],
+            estimated_device_memory=estimate["device_memory"],
+        )
+        with self._telemetry.activate(), self._telemetry.phase("write_inputs"):
+            self.write_mx3(system, **kwargs)
+        phases = self._telemetry.phases
+        # With concurrent writes, only waiting for the writes delays the script.
+        writing = phases.get("write_wait", phases.get("write_ovf", 0.0))
+        phases["script"] = phases["write_inputs"] - writing
+        self._telemetry.write()
+
+    def write_mx3(
+        self,
+        system,
+        dirname=".",
+        ovf_format="bin8",
+        abspath=True,
+        optimise_mesh=False,
+        write_workers=0,
+        **kwargs,
+    ):
         """Write the mx3 file and related files.
 
         Takes ``micromagneticmodel.System`` and write the mx3 file (and related files)
@@ -115,8 +298,24 @@ class Driver(mm.ExternalDriver):
             filenames are written to the file. Relative files require mumax3 to be run
             from inside the directory containing the mx3 and other input files.
 
+        optimise_mesh : bool, optional
+
+            If ``optimise_mesh=True`` the system is driven on a cropped and padded
+            mesh (see ``mumax3c.scripts.mesh.optimise_mesh``). The mapping to the
+            original mesh is used when reading the results.
+
+        write_workers : int, optional
+
+            Number of threads writing the input files while the script is
+            generated; ``0`` writes them sequentially. There is no measurable gain
+            without slow I/O. Defaults to ``0``.
+
         """
-        with uu.changedir(dirname):
+        mapping = mc.scripts.mesh.optimise_mesh(system) if optimise_mesh else None
+        self._mesh_mapping = mapping
+        optimised = mc.scripts.mesh.optimised_system(system, mapping)
+        writes = mc.scripts.util.concurrent_writes(write_workers)
+        with uu.changedir(dirname), optimised, writes:
             mx3 = mc.scripts.system_script(
                 system, ovf_format=ovf_format, abspath=abspath
             )
@@ -125,26 +324,103 @@ class Driver(mm.ExternalDriver):
                 system,
                 compute=None,  # TODO does mumax3 support compute?
                 ovf_format=ovf_format,
+                abspath=abspath,
                 **kwargs,
             )
             with open(self._mx3filename(system), "w", encoding="utf-8") as mx3file:
                 mx3file.write(mx3)
+            mc.telemetry.written(self._mx3filename(system))
 
         # TODO if self/system is modified for mx3 creation reset it here
+        self._region_relator = system.region_relator
+        self._region_ms = system.region_ms
         delattr(system, "region_relator")
-
-    def _call(self, system, runner, verbose=1, dry_run=False, **kwargs):
-        if runner is None:
-            runner = mc.runner.runner
-        if dry_run:
-            return runner.call(argstr=self._mx3filename(system), dry_run=True)
-        else:
-            runner.call(
-                argstr=self._mx3filename(system),
-                verbose=verbose,
+        delattr(system, "region_ms")
+
+    def _write_info_json(self, system, start_time, **kwargs):
+        # Callables (e.g. progress callbacks) cannot be stored in the json file
+        # and paths (e.g. scratch) are stored as strings.
+        kwargs = {key: value for key, value in kwargs.items() if not callable(value)}
+        kwargs = {
+            key: os.fspath(value) if isinstance(value, os.PathLike) else value
+            for key, value in kwargs.items()
+        }
+        # Stored for exports, which map the mumax3 regions back to subregions.
+        kwargs["region_relator"] = getattr(self, "_region_relator", {})
+        super()._write_info_json(system, start_time, **kwargs)
+
+    def _call(self, system, runner, verbose=1, dry_run=False, progress=None, **kwargs):
+        try:
+            if runner is None:
+                runner = mc.runner.runner
+            if dry_run:
+                # Nothing is run, so the input files are moved to the drive directory.
+                self._unstage()
+                return runner._call(argstr=self._mx3filename(system), dry_run=True)
+            self._call_runner(
+                system, runner, verbose=verbose, progress=progress, **kwargs
+            )
+        except Exception:
+            # Keep the input files and the output of failed runs for inspection.
+            self._unstage()
+            raise
+
+    def _call_runner(self, system, runner, verbose=1, progress=None, **kwargs):
+        # The progress is obtained from the table instead of globbing for m_full
+        # files: the table is only read from the last position.
+        monitor = None
+        if progress or (verbose >= 2 and kwargs.get("n")):
+            monitor = mc.mumax3.ProgressMonitor(
+                f"{system.name}.out/table.txt",
+                callbacks=progress,
                 total=kwargs.get("n"),
-                glob_name=f"{system.name}.out/m_full*.ovf",
+                bar=verbose >= 2,
+                desc=f"Running mumax3 ({runner.__class__.__name__})",
+            )
+            monitor.start()
+        self._telemetry.record(runner=runner.__class__.__name__, returncode=None)
+        try:
+            with self._telemetry.phase("run"):
+                res = self._run(
+                    runner,
+                    argstr=self._mx3filename(system),
+                    verbose=0 if monitor is not None and verbose >= 2 else verbose,
+                )
+            self._stdout = (getattr(res, "stdout", None) or b"").decode(
+                "utf-8", "replace"
             )
+        finally:
+            if monitor is not None:
+                monitor.terminate()
+            self._telemetry.record(success=self._telemetry.data["returncode"] == 0)
+            self._telemetry.write()
+
+    def _run(self, runner, argstr, verbose=1):
+        """Run mumax3 like ``runner.call`` and record the exit status.
+
+        ``runner._call`` is used directly, so that the exit status of a failed run
+        is recorded before the error is raised.
+
+        """
+        if verbose >= 1:
+            context = uu.progress.summary(
+                package_name=runner.package_name,
+                runner_name=runner.__class__.__name__,
+            )
+        else:
+            context = uu.progress.quiet()
+        with context:
+            res = runner._call(argstr=argstr)
+        self._telemetry.record(returncode=res.returncode)
+        if res.returncode != 0:
+            msg = f"Error in {runner.package_name} run.\n"
+            msg += f"command: {' '.join(res.args)}\n"
+            if sys.platform != "win32":
+                # stdout and stderr are not captured on Windows.
+                msg += f"stdout: {(res.stdout or b'').decode('utf-8', 'replace')}\n"
+                msg += f"stderr: {(res.stderr or b'').decode('utf-8', 'replace')}\n"
+            raise RuntimeError(msg)
+        return res
 
     def _schedule_commands(self, system, runner):
         if runner is None:
@@ -154,18 +430,85 @@ class Driver(mm.ExternalDriver):
         ]
 
     def _read_data(self, system):
-        # Update system's magnetisation. An example .ovf filename: m_full000000.ovf
-        ovffiles = pathlib.Path(f"{system.name}.out").glob("m_full*.ovf")
-        lastovffile = sorted(ovffiles)[-1]
-        # pass Field.array instead of Field for better performance
-        # Mumax3 norm changes so need to set back to old norm
-        norm_field = system.m.norm
-        system.m.array = df.Field.from_file(str(lastovffile)).array
-        system.m.norm = norm_field
-
-        system.table = ut.Table.fromfile(
-            str(pathlib.Path(f"{system.name}.out/table.txt")), x=self._x
-        )
+        if self._dry_run:
+            return  # mumax3 was not run
+        try:
+            self._read_state(system)
+            if (packing := getattr(system, "packing", None)) is not None:
+                packing.unpack(self._region_relator, self._region_ms)
+            if self._export:
+                if self._export is True:
+                    kwargs = {}
+                elif isinstance(self._export, dict):
+                    kwargs = self._export
+                else:
+                    kwargs = {"filename": self._export}
+                with self._telemetry.activate(), self._telemetry.phase("export"):
+                    mc.export(".", **kwargs)
+                self._telemetry.write()
+        finally:
+            self._unstage()
+        # Snapshots on an optimised mesh cannot be loaded into the original mesh.
+        files = mc.io.snapshots(f"{system.name}.out")
+        if files and self._mesh_mapping is None:
+            mc.scripts.magnetisation.track_source(system, files[-1])
+
+    def _read_state(self, system):
+        """Read the magnetisation, table and solver statistics of the drive."""
+        with self._telemetry.activate(), self._telemetry.phase("read"):
+            # Update system's magnetisation. Example .ovf filename: m_full000000.ovf
+            lastovffile = mc.io.snapshots(f"{system.name}.out")[-1]
+            # pass Field.array instead of Field for better performance
+            # Mumax3 norm changes so need to set back to old norm
+            norm_field = system.m.norm
+            field = mc.io.read_field(lastovffile, precision=self._precision)
+            if self._mesh_mapping is not None:
+                field = self._mesh_mapping.to_original(field)
+            system.m.dtype = field.dtype
+            system.m.array = field.array
+            system.m.norm = norm_field
+            mc.telemetry.read(lastovffile)
+
+            tablefile = pathlib.Path(f"{system.name}.out/table.txt")
+            system.table = ut.Table.fromfile(str(tablefile), x=self._x)
+            if self._mesh_mapping is not None:
+                self._mesh_mapping.to_original_table(system.table)
+            self._rename_regions(system.table)
+            mc.telemetry.read(tablefile)
+
+            self._read_solver_stats(system)
+        self._telemetry.write()
+
+    def _rename_regions(self, table):
+        """Name the average magnetisation columns of the regions after subregions.
+
+        mumax3 names the columns of the regions ``m.region<index><component>``; they
+        are renamed to ``m<component>_<subregion>``, or
+        ``m<component>_<subregion>_<index>`` if the subregion consists of several
+        regions.
+
+        """
+        columns = {}
+        for name, regions in getattr(self, "_region_relator", {}).items():
+            for region in regions if name else []:
+                suffix = name if len(regions) == 1 else f"{name}_{region}"
+                for component in "xyz":
+                    columns[f"m.region{region}{component}"] = f"m{component}_{suffix}"
+        table.data = table.data.rename(columns=columns)
+        table.units = {columns.get(key, key): unit for key, unit in table.units.items()}
+
+    def _read_solver_stats(self, system):
+        """Add solver statistics from the mumax3 log and stdout to info.json."""
+        logfile = pathlib.Path(f"{system.name}.out/log.txt")
+        log = logfile.read_text(encoding="utf-8") if logfile.exists() else ""
+        stats = mc.io.parse_log(f"{log}\n{self._stdout}")
+        self._telemetry.record(**stats)
+        if pathlib.Path("info.json").exists():
+            with open("info.json", encoding="utf-8") as jsonfile:
+                info = json.load(jsonfile)
+            info["solver_stats"] = stats
+            with open("info.json", "w", encoding="utf-8") as jsonfile:
+                json.dump(info, jsonfile)
 
     @staticmethod
     def _mx3filename(system):
@@ -0,0 +1,134 @@
+import pathlib
+
+import ubermagtable as ut
+
+import mumax3c as mc
+from .timedriver import TimeDriver
+
+
+class EnsembleDriver(TimeDriver):
+    """Thermal ensemble driver.
+
+    The ensemble driver evolves a system at finite temperature ``realizations``
+    times from the same initial magnetisation. All realizations run sequentially in
+    a single mumax3 process: before every realization the magnetisation is reset
+    to its initial value, the time is reset to zero and the thermal seed is set to
+    ``seed + realization``. Input files are written and mumax3 is started only once.
+
+    After the drive, the table of every realization is available as
+    ``table_<realization>.txt`` in the output directory and the results of all
+    realizations are stored as ``mumax3c.Ensemble`` in ``system.ensemble``. The
+    magnetisation of the system is the final magnetisation of the last
+    realization and ``system.table`` is the table of the last realization.
+
+    Only attributes in ``_allowed_attributes`` can be defined. For details on
+    possible values for individual attributes and their default values, please
+    refer to ``Mumax3`` documentation (https://mumax.github.io).
+
+    Examples
+    --------
+    1. Defining driver with a keyword argument.
+
+    >>> import mumax3c as mc
+    ...
+    >>> ed = mc.EnsembleDriver(evolver=mc.HeunEvolver(FixDt=1e-14))
+
+    2. Driving an ensemble of 100 realizations.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> system.T = 300
+    >>> # ed.drive(system, t=1e-9, n=100, realizations=100)
+    >>> # system.ensemble.mean
+
+    """
+
+    def _checkargs(self, **kwargs):
+        super()._checkargs(**kwargs)
+        realizations = kwargs.get("realizations")
+        if not isinstance(realizations, int) or realizations <= 0:
+            msg = f"Cannot drive with {realizations=}."
+            raise ValueError(msg)
+        if not isinstance(kwargs.get("seed", 0), int):
+            msg = f"Cannot drive with {type(kwargs['seed'])=}."
+            raise ValueError(msg)
+        if kwargs.get("optimise_mesh"):
+            raise ValueError("Mesh optimisation is not supported for ensembles.")
+
+    def _check_system(self, system):
+        """Checks the system has dynamics and a finite temperature"""
+        super()._check_system(system)
+        if not system.T > 0:
+            raise RuntimeError("Ensemble drives require a finite temperature.")
+
+    def drive_kwargs_setup(self, drive_kwargs):
+        """Additional keyword arguments allowed for drive.
+
+        In addition to the keyword arguments of all drivers (see
+        ``mumax3c.Driver.drive_kwargs_setup``), an ensemble drive accepts the
+        following keyword arguments.
+
+        Parameters
+        ----------
+        realizations : int
+
+            Number of realizations.
+
+        seed : int, optional
+
+            Thermal seed of the first realization; realization ``i`` uses the seed
+            ``seed + i``. Defaults to ``0``.
+
+        snapshots : bool, optional
+
+            If ``True``, the magnetisation of every realization is saved ``n`` times.
+            If ``False``, only the final magnetisation of every realization is saved.
+            Defaults to ``True``.
+
+        aggregate : bool, optional
+
+            If ``True``, the mean and variance over all realizations of the table
+            (``table_mean.txt``, ``table_variance.txt``) and of the final
+            magnetisation (``m_mean.ovf``, ``m_variance.ovf``) are written to the
+            output directory. Defaults to ``False``.
+
+        """
+        super().drive_kwargs_setup(drive_kwargs)
+        drive_kwargs.setdefault("seed", 0)
+        drive_kwargs.setdefault("snapshots", True)
+        drive_kwargs.setdefault("aggregate", False)
+        self._ensemble_kwargs = {
+            key: drive_kwargs[key]
+            for key in ["n", "realizations", "snapshots", "aggregate"]
+        }
+
+    def schedule_kwargs_setup(self, schedule_kwargs):
+        super().schedule_kwargs_setup(schedule_kwargs)
+        schedule_kwargs.setdefault("seed", 0)
+        schedule_kwargs.setdefault("snapshots", True)
+
+    def _read_state(self, system):
+        outdir = pathlib.Path(f"{system.name}.out")
+        realizations = self._ensemble_kwargs["realizations"]
+        with self._telemetry.activate(), self._telemetry.phase("read"):
+            mc.ensemble.split_table(outdir / "table.txt", realizations)
+        super()._read_state(system)
+
+        with self._telemetry.activate(), self._telemetry.phase("read"):
+            system.table = ut.Table.fromfile(
+                str(outdir / mc.ensemble.table_filename(realizations - 1)), x=self._x
+            )
+            self._rename_regions(system.table)
+            system.ensemble = mc.Ensemble.fromdir(
+                ".", x=self._x, precision=self._precision
+            )
+            if self._ensemble_kwargs["aggregate"]:
+                ensemble = system.ensemble
+                mc.ensemble.write_table(ensemble.mean, outdir / "table_mean.txt")
+                mc.ensemble.write_table(
+                    ensemble.variance, outdir / "table_variance.txt"
+                )
+                ensemble.m_mean.to_file(str(outdir / "m_mean.ovf"))
+                ensemble.m_variance.to_file(str(outdir / "m_variance.ovf"))
+        self._telemetry.write()
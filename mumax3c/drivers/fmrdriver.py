@@ -0,0 +1,143 @@
+import numbers
+import pathlib
+
+import numpy as np
+
+import mumax3c as mc
+from .timedriver import TimeDriver
+
+# mumax3 expressions of the time dependence of the excitation pulses.
+_pulses = {
+    "sinc": "sinc(2 * pi * {frequency} * (t - {t0}))",
+    "gaussian": "exp(-pow((t - {t0}) / {width}, 2) / 2)",
+    "rect": "heaviside(t - {t0}) * heaviside({t0} + {width} - t)",
+}
+
+
+class FMRDriver(TimeDriver):
+    """Ferromagnetic resonance driver.
+
+    The FMR driver excites the system with a uniform magnetic field pulse and
+    samples the average magnetisation ``n`` times at a fixed interval ``t / n``.
+    Only the table is written at every sample: it contains the average
+    magnetisation of the whole system and, if the mesh has subregions, of every
+    subregion (columns ``m<component>_<subregion>``; subregions with several
+    saturation magnetisation values have one column per mumax3 region,
+    ``m<component>_<subregion>_<region>``). The magnetisation is saved only
+    ``snapshots`` times. After the drive, the amplitude spectrum of all
+    magnetisation columns of the table is stored in ``system.spectrum`` (see
+    ``mumax3c.spectral.table_spectrum``).
+
+    Only attributes in ``_allowed_attributes`` can be defined. For details on
+    possible values for individual attributes and their default values, please
+    refer to ``Mumax3`` documentation (https://mumax.github.io). Use ``FixDt`` for
+    a fixed time step.
+
+    Examples
+    --------
+    1. Defining driver with a keyword argument.
+
+    >>> import mumax3c as mc
+    ...
+    >>> fd = mc.FMRDriver(FixDt=1e-14)
+
+    2. Driving a system with a sinc pulse.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> excitation = dict(H=(1e3, 0, 0), shape="sinc", frequency=5e10)
+    >>> # fd.drive(system, t=5e-9, n=5000, excitation=excitation)
+    >>> # system.spectrum["mx"].idxmax()
+
+    """
+
+    def _checkargs(self, **kwargs):
+        super()._checkargs(**kwargs)
+        snapshots = kwargs.get("snapshots", 1)
+        if not isinstance(snapshots, int) or snapshots <= 0:
+            msg = f"Cannot drive with {snapshots=}."
+            raise ValueError(msg)
+        if kwargs["n"] % snapshots != 0:
+            msg = f"Cannot save {snapshots=} for n={kwargs['n']} samples."
+            raise ValueError(msg)
+        if (excitation := kwargs.get("excitation")) is not None:
+            self._excitation(excitation, kwargs["t"], kwargs["n"])
+
+    def drive_kwargs_setup(self, drive_kwargs):
+        """Additional keyword arguments allowed for drive.
+
+        In addition to the keyword arguments of all drivers (see
+        ``mumax3c.Driver.drive_kwargs_setup``), an FMR drive accepts the following
+        keyword arguments.
+
+        Parameters
+        ----------
+        excitation : dict, optional
+
+            Uniform excitation field pulse, added to the Zeeman field of the system.
+            The dictionary contains the amplitude ``H`` (vector in A/m) and
+            optionally the ``shape`` of the pulse and its parameters (in s and Hz):
+
+            - ``"sinc"`` (default): ``sinc(2 pi frequency (t - t0))``, exciting all
+              frequencies up to ``frequency`` (default: the Nyquist frequency
+              ``n / (2 t)``) equally; ``t0`` defaults to ``2 / frequency``.
+            - ``"gaussian"``: ``exp(-((t - t0) / width)**2 / 2)``; ``width``
+              defaults to the sampling interval ``t / n`` and ``t0`` to
+              ``5 * width``.
+            - ``"rect"``: constant between ``t0`` and ``t0 + width``; ``width``
+              defaults to the sampling interval and ``t0`` to ``0``.
+
+            Defaults to ``None`` (no excitation, e.g. for a ringdown from a tilted
+            magnetisation).
+
+        snapshots : int, optional
+
+            Number of equidistant magnetisation snapshots; the last snapshot is the
+            final magnetisation. ``n`` must be a multiple of ``snapshots``.
+            Defaults to ``1``.
+
+        """
+        super().drive_kwargs_setup(drive_kwargs)
+        drive_kwargs.setdefault("snapshots", 1)
+        drive_kwargs.setdefault("excitation", None)
+
+    def schedule_kwargs_setup(self, schedule_kwargs):
+        super().schedule_kwargs_setup(schedule_kwargs)
+        schedule_kwargs.setdefault("snapshots", 1)
+        schedule_kwargs.setdefault("excitation", None)
+
+    @staticmethod
+    def _excitation(excitation, t, n):
+        """Amplitude and mumax3 expression of the time dependence of the pulse."""
+        excitation = dict(excitation)
+        H = excitation.pop("H", None)
+        if (
+            not isinstance(H, (tuple, list, np.ndarray))
+            or len(H) != 3
+            or not all(isinstance(i, numbers.Real) for i in H)
+        ):
+            msg = f"Cannot excite with {H=}; a vector in A/m is required."
+            raise ValueError(msg)
+        shape = excitation.pop("shape", "sinc")
+        if shape not in _pulses:
+            msg = f"Cannot excite with {shape=}; must be one of {', '.join(_pulses)}."
+            raise ValueError(msg)
+        if shape == "sinc":
+            frequency = excitation.pop("frequency", n / (2 * t))
+            parameters = {"frequency": frequency, "t0": 2 / frequency}
+        else:
+            width = excitation.pop("width", t / n)
+            t0 = 5 * width if shape == "gaussian" else 0
+            parameters = {"width": width, "t0": t0}
+        parameters["t0"] = excitation.pop("t0", parameters["t0"])
+        if excitation:
+            msg = f"Cannot excite a {shape} pulse with {', '.join(excitation)}."
+            raise ValueError(msg)
+        return H, _pulses[shape].format(**parameters)
+
+    def _read_state(self, system):
+        super()._read_state(system)
+        system.spectrum = mc.spectral.table_spectrum(system.table)
+        outdir = pathlib.Path(f"{system.name}.out")
+        system.spectrum.to_csv(outdir / "spectrum.txt", sep="\t")
@@ -0,0 +1,135 @@
+import collections
+import pathlib
+
+import ubermagtable as ut
+
+import mumax3c as mc
+from .driver import Driver
+
+Stage = collections.namedtuple("Stage", ["driver", "table", "m"])
+Stage.__doc__ = "Results of a single stage of a pipeline drive."
+
+
+class PipelineDriver(Driver):
+    """Pipeline driver.
+
+    The pipeline driver chains several minimisation, relaxation and time evolution
+    stages in a single mumax3 run. Each stage continues from the final
+    magnetisation of the previous stage without reading it into Python and writing
+    it again. ``stages`` is a sequence of drivers (``MinDriver``, ``RelaxDriver`` or
+    ``TimeDriver``) or of tuples ``(driver, kwargs)`` with the keyword arguments of
+    the stage (e.g. ``t`` and ``n`` for ``TimeDriver``). Driver attributes set by a
+    stage remain in effect for the subsequent stages unless they are set again.
+
+    After the drive, the table of every stage is available as
+    ``table_stage<stage>.txt`` in the output directory and ``system.stages`` is a
+    list with the driver, table and final magnetisation of every stage. The
+    magnetisation and table of the system are those of the last stage.
+
+    Examples
+    --------
+    1. Defining a pipeline.
+
+    >>> import mumax3c as mc
+    ...
+    >>> pd = mc.PipelineDriver(
+    ...     stages=[
+    ...         mc.RelaxDriver(),
+    ...         mc.MinDriver(MinimizerStop=1e-6),
+    ...         (mc.TimeDriver(), dict(t=1e-9, n=100)),
+    ...     ]
+    ... )
+
+    2. Driving a system.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> # pd.drive(system)
+    >>> # system.stages[1].m
+
+    3. Passing a stage which is not supported.
+
+    >>> pd = mc.PipelineDriver(stages=[mc.EnsembleDriver()])
+    >>> pd.drive(system)
+    Traceback (most recent call last):
+       ...
+    TypeError: ...
+
+    """
+
+    _allowed_attributes = ["stages"]
+
+    @property
+    def _stages(self):
+        """Stages as a list of ``(driver, kwargs)`` tuples."""
+        stages = []
+        for stage in getattr(self, "stages", []):
+            driver, kwargs = stage if isinstance(stage, tuple) else (stage, {})
+            stages.append((driver, dict(kwargs)))
+        return stages
+
+    @staticmethod
+    def _rows(driver, kwargs):
+        """Number of table rows and m_full snapshots written by a stage."""
+        return kwargs["n"] if isinstance(driver, mc.TimeDriver) else 1
+
+    def _checkargs(self, **kwargs):
+        if not self._stages:
+            raise ValueError("Cannot drive a pipeline without stages.")
+        for driver, stage_kwargs in self._stages:
+            if type(driver) not in (mc.MinDriver, mc.RelaxDriver, mc.TimeDriver):
+                msg = f"Cannot use {type(driver)=} as a pipeline stage."
+                raise TypeError(msg)
+            driver._checkargs(**stage_kwargs)
+
+    def _check_system(self, system):
+        """Checks the system fulfils the requirements of all stages"""
+        for driver, _ in self._stages:
+            driver._check_system(system)
+
+    def _write_info_json(self, system, start_time, **kwargs):
+        kwargs["stages"] = [
+            {"driver": repr(driver), **stage_kwargs}
+            for driver, stage_kwargs in self._stages
+        ]
+        super()._write_info_json(system, start_time, **kwargs)
+
+    def _read_state(self, system):
+        outdir = pathlib.Path(f"{system.name}.out")
+        with self._telemetry.activate(), self._telemetry.phase("read"):
+            with open(outdir / "table.txt", encoding="utf-8") as f:
+                header, *rows = f.readlines()
+            norm = system.m.norm
+            files = mc.io.snapshots(outdir)
+            stages = []
+            start = 0
+            for i, (driver, kwargs) in enumerate(self._stages):
+                stop = start + self._rows(driver, kwargs)
+                tablefile = outdir / f"table_stage{i}.txt"
+                with open(tablefile, "w", encoding="utf-8") as f:
+                    f.write(header)
+                    f.writelines(rows[start:stop])
+                m = mc.io.read_field(files[stop - 1], precision=self._precision)
+                table = ut.Table.fromfile(str(tablefile), x=driver._x)
+                if self._mesh_mapping is not None:
+                    m = self._mesh_mapping.to_original(m)
+                    self._mesh_mapping.to_original_table(table)
+                self._rename_regions(table)
+                m.norm = norm
+                mc.telemetry.read(files[stop - 1])
+                stages.append(Stage(driver, table, m))
+                start = stop
+
+            system.m.dtype = stages[-1].m.dtype
+            system.m.array = stages[-1].m.array
+            system.table = stages[-1].table
+            system.stages = stages
+            mc.telemetry.read(outdir / "table.txt")
+
+            self._read_solver_stats(system)
+        self._telemetry.write()
+
+    @property
+    def _x(self):
+        return self._stages[-1][0]._x
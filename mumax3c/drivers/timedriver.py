@@ -1,3 +1,4 @@
+import mumax3c as mc
 from .driver import Driver
 
 
@@ -25,7 +26,13 @@ class TimeDriver(Driver):
        ...
     AttributeError: ...
 
-    3. Getting the list of allowed attributes.
+    3. Selecting the solver with an evolver.
+
+    >>> import mumax3c as mc
+    ...
+    >>> td = mc.TimeDriver(evolver=mc.RungeKuttaEvolver(method="rk23", MaxErr=1e-4))
+
+    4. Getting the list of allowed attributes.
 
     >>> import mumax3c as mc
     ...
@@ -36,6 +43,7 @@ class TimeDriver(Driver):
     """
 
     _allowed_attributes = [
+        "evolver",
         "DemagAccuracy",
         "dt",
         "FixDt",
@@ -61,6 +69,7 @@ class TimeDriver(Driver):
         if n <= 0:
             msg = f"Cannot drive with {n=}."
             raise ValueError(msg)
+        mc.evolvers.convert(getattr(self, "evolver", None))._script()
 
     def _check_system(self, system):
         """Checks the system has dynamics in it"""
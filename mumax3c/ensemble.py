@@ -0,0 +1,174 @@
+import json
+import pathlib
+
+import discretisedfield as df
+import numpy as np
+import pandas as pd
+import ubermagtable as ut
+
+import mumax3c as mc
+
+
+class Ensemble:
+    """Results of an ensemble drive.
+
+    An ensemble consists of the tables and the final magnetisation of all
+    realizations of a thermal ensemble drive (see ``mumax3c.EnsembleDriver``). The
+    final magnetisation of all realizations is stacked into a single array with the
+    realization as first axis.
+
+    Parameters
+    ----------
+    tables : list
+
+        One ``ubermagtable.Table`` per realization.
+
+    m : numpy.ndarray
+
+        Final normalised magnetisation of all realizations with shape ``(realizations,
+        *mesh.n, 3)``.
+
+    mesh : discretisedfield.Mesh
+
+        Mesh of the magnetisation.
+
+    Examples
+    --------
+    1. Loading the results of an ensemble drive.
+
+    >>> import mumax3c as mc
+    ...
+    >>> # ensemble = mc.Ensemble.fromdir("system/drive-0")
+
+    """
+
+    def __init__(self, tables, m, mesh):
+        self.tables = list(tables)
+        self.m = m
+        self.mesh = mesh
+
+    @property
+    def realizations(self):
+        """Number of realizations."""
+        return len(self.tables)
+
+    def __len__(self):
+        return self.realizations
+
+    def __repr__(self):
+        return f"Ensemble(realizations={self.realizations}, mesh.n={self.mesh.n})"
+
+    @property
+    def data(self):
+        """Data of all tables stacked with the realization as additional column."""
+        return pd.concat(
+            [table.data.assign(realization=i) for i, table in enumerate(self.tables)],
+            ignore_index=True,
+        )
+
+    @property
+    def mean(self):
+        """Table with the mean over all realizations at every saved step."""
+        return self._aggregate("mean")
+
+    @property
+    def variance(self):
+        """Table with the variance over all realizations at every saved step."""
+        return self._aggregate("var")
+
+    @property
+    def m_mean(self):
+        """Mean final normalised magnetisation over all realizations."""
+        return df.Field(self.mesh, nvdim=3, value=self.m.mean(axis=0))
+
+    @property
+    def m_variance(self):
+        """Variance of the final normalised magnetisation over all realizations."""
+        return df.Field(self.mesh, nvdim=3, value=self.m.var(axis=0))
+
+    def _aggregate(self, method):
+        table = self.tables[0]
+        data = np.stack([table.data.to_numpy() for table in self.tables])
+        data = getattr(data, method)(axis=0)
+        data = pd.DataFrame(data, columns=table.data.columns)
+        if table.x is not None:
+            data[table.x] = table.data[table.x].to_numpy()
+        return ut.Table(data, units=dict(table.units), x=table.x)
+
+    @classmethod
+    def fromdir(cls, dirname, x="t", precision="float64"):
+        """Load the results of an ensemble drive.
+
+        Parameters
+        ----------
+        dirname : str, pathlib.Path
+
+            Directory of the drive (``<dirname>/<system-name>/drive-<number>``).
+
+        x : str, optional
+
+            Independent variable of the tables. Defaults to ``"t"``.
+
+        precision : str, optional
+
+            Floating-point precision of the magnetisation (see
+            ``mumax3c.io.read_field``). Defaults to ``"float64"``.
+
+        Returns
+        -------
+        mumax3c.Ensemble
+
+            Ensemble.
+
+        """
+        dirname = pathlib.Path(dirname)
+        with open(dirname / "info.json", encoding="utf-8") as f:
+            info = json.load(f)
+        (outdir,) = dirname.glob("*.out")
+
+        files = mc.io.snapshots(outdir)
+        step = info["n"] if info.get("snapshots", True) else 1
+        fields = [
+            mc.io.read_field(files[(i + 1) * step - 1], precision=precision)
+            for i in range(info["realizations"])
+        ]
+        tables = [
+            ut.Table.fromfile(str(outdir / table_filename(i)), x=x)
+            for i in range(info["realizations"])
+        ]
+        m = np.stack([field.orientation.array for field in fields])
+        return cls(tables, m, fields[0].mesh)
+
+
+def write_table(table, filename):
+    """Write a table in the mumax3 table format."""
+    header = "\t".join(
+        f"{column} ({table.units.get(column, '')})" for column in table.data.columns
+    )
+    np.savetxt(filename, table.data.to_numpy(), delimiter="\t", header=header)
+
+
+def table_filename(realization):
+    """Name of the table file of a single realization."""
+    return f"table_{realization:06d}.txt"
+
+
+def split_table(filename, realizations):
+    """Split a mumax3 table into one table file per realization.
+
+    The rows of the realizations follow each other in ``filename`` and every
+    realization has the same number of rows. The files are written next to
+    ``filename`` and named ``table_<realization>.txt``.
+
+    """
+    filename = pathlib.Path(filename)
+    with open(filename, encoding="utf-8") as f:
+        header, *rows = f.readlines()
+    if len(rows) % realizations != 0:
+        msg = f"Cannot split {len(rows)} rows into {realizations=}."
+        raise ValueError(msg)
+    n = len(rows) // realizations
+    for i in range(realizations):
+        with open(filename.parent / table_filename(i), "w", encoding="utf-8") as f:
+            f.write(header)
+            f.writelines(rows[i * n : (i + 1) * n])
@@ -0,0 +1,253 @@
+import math
+import numbers
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+
+import mumax3c as mc
+
+# Number of intermediate torque buffers (vector fields) used by the mumax3 solvers
+# (setsolver argument); the minimiser is stored as solver 0.
+_solver_buffers = {-1: 4, 0: 4, 1: 1, 2: 2, 3: 4, 4: 6, 5: 7, 6: 6}
+
+# Typical number of time steps of a relaxation or minimisation; used if no
+# telemetry is available.
+_static_steps = 1000
+
+# Typical adaptive time step in seconds; used to estimate the number of steps of
+# time drives.
+_typical_dt = 1e-13
+
+_header_bytes = 1024  # approximate size of an OVF header
+
+# Evaluations per demag kernel element and periodic image; mumax3 integrates the
+# demag tensor numerically over the source cell once before the first step.
+_kernel_points = 100
+
+
+def _solver(driver):
+    if isinstance(driver, mc.TimeDriver):
+        return mc.evolvers.convert(getattr(driver, "evolver", None))._solver
+    elif isinstance(driver, mc.RelaxDriver):
+        return 3  # relax() uses the Bogacki-Shampine solver
+    return 0
+
+
+def _fft_grid(mesh):
+    """Size of the zero-padded grid used by mumax3 for the demag convolution.
+
+    Directions with periodic boundary conditions and directions with a single cell
+    are not padded.
+
+    """
+    return tuple(
+        int(n) if dim in mesh.bc or n == 1 else 2 * int(n)
+        for dim, n in zip("xyz", mesh.n)
+    )
+
+
+def _field_files(system):
+    """Number of full-grid vector fields written as input files besides m0."""
+    files = 0
+    for term in system.energy.get(type=mm.Zeeman):
+        if isinstance(term.H, (df.Field, tuple, list, dict, np.ndarray)):
+            files += 1
+    for term in system.dynamics.get(type=mm.ZhangLi):
+        if isinstance(term.u, df.Field):
+            files += 1
+    return files
+
+
+def _estimate(system, driver, **kwargs):
+    mesh = system.m.mesh
+    cells = int(math.prod(mesh.n))
+    grid = _fft_grid(mesh)
+    repetitions = mc.scripts.mesh.pbc_repetitions(mesh)
+    solver = _solver(driver)
+
+    # Vector fields (3 float32 values per cell) kept on the device: m, effective
+    # field, solver buffers, a backup of m for rejected steps, and input fields.
+    vector_fields = 2 + _solver_buffers[solver] + 1 + _field_files(system)
+    if system.T > 0:
+        vector_fields += 2  # thermal field and random numbers
+    if system.dynamics.get(type=mm.ZhangLi):
+        vector_fields += 1  # spin-transfer torque
+    device_memory_bytes = cells * (vector_fields * 3 * 4 + 1)  # 1 byte: regions
+
+    demag = mm.Demag() in system.energy
+    fft_cells = math.prod(grid)
+    if demag:
+        # Complex buffers of the real-to-complex FFT for 3 components, the demag
+        # kernel (6 components, reduced by symmetry) and the cuFFT workspace.
+        complex_cells = (grid[0] // 2 + 1) * grid[1] * grid[2]
+        kernel_cells = math.prod(n // 2 + 1 for n in grid)
+        device_memory_bytes += complex_cells * 8 * (3 + 1) + kernel_cells * 4 * 6
+
+    if isinstance(driver, mc.TimeDriver):
+        snapshots = kwargs["n"]
+        evolver = mc.evolvers.convert(getattr(driver, "evolver", None))
+        fixdt = getattr(driver, "FixDt", getattr(evolver, "FixDt", 0))
+        dt = fixdt if isinstance(fixdt, numbers.Real) and fixdt > 0 else _typical_dt
+        steps = max(1, math.ceil(kwargs["t"] / dt))
+        # Ensemble drives run all realizations one after the other.
+        realizations = kwargs.get("realizations", 1)
+        steps *= realizations
+        rows = snapshots * realizations
+        if isinstance(driver, mc.FMRDriver):
+            snapshots = kwargs.get("snapshots", 1)
+        elif kwargs.get("snapshots", True):
+            snapshots *= realizations
+        else:
+            snapshots = realizations
+    else:
+        snapshots = rows = 1
+        steps = _static_steps
+
+    vector_file = cells * 3 * 4 + _header_bytes
+    input_bytes = vector_file * (1 + _field_files(system)) + cells * 4 + _header_bytes
+    table_bytes = rows * 16 * (8 + len(system.energy))
+    output_bytes = snapshots * vector_file + table_bytes
+
+    evaluations = max(1, _solver_buffers[solver] - 1) if solver else 1
+    local_terms = max(1, len(system.energy) + len(system.dynamics))
+    per_evaluation = cells * local_terms
+    if demag:
+        per_evaluation += 3 * fft_cells * math.log2(max(fft_cells, 2))
+    cost = float(steps * evaluations * per_evaluation)
+    if demag:
+        # The periodic images are summed into the kernel, which therefore needs
+        # no additional memory but takes longer to compute.
+        images = math.prod(2 * r + 1 for r in repetitions)
+        cost += float(kernel_cells * 6 * images * _kernel_points)
+
+    return {
+        "cells": cells,
+        "fft_grid": grid,
+        "pbc_repetitions": repetitions,
+        "solver": solver,
+        "steps": steps,
+        "device_memory": int(device_memory_bytes),
+        "input_bytes": int(input_bytes),
+        "output_bytes": int(output_bytes),
+        "cost": cost,
+        "runtime": None,
+        "calibration_drives": 0,
+    }
+
+
+def estimate(system, driver, dirname=".", device_memory=None, **kwargs):
+    """Estimate the resources required to drive a system.
+
+    The estimate is computed from the mesh size, the periodic boundary conditions
+    and their repetitions, the energy and dynamics terms, the solver and the number
+    of saved snapshots, without writing any file or running mumax3. Periodic
+    directions are not zero-padded for the demag convolution; their images are
+    summed into the demag kernel, which increases the cost of computing the
+    kernel but not the device memory. It can be used to find simulations
+    that exceed the device memory or take very long before any of them is started.
+
+    The runtime ``cost`` is given in arbitrary units and only allows comparing
+    different simulations. If telemetry of previous drives (see
+    ``mumax3c.telemetry``) is available in ``dirname``, the cost is calibrated
+    against the recorded mumax3 runtimes and an estimated ``runtime`` in seconds is
+    returned as well.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        System to be driven.
+
+    driver : mumax3c.Driver
+
+        Driver used to drive the system.
+
+    dirname : str, pathlib.Path, optional
+
+        Base directory of previous simulations used for calibration. If ``None``,
+        the estimate is not calibrated. Defaults to the current working directory.
+
+    device_memory : int, optional
+
+        Available device memory in bytes. If passed, ``fits_device`` is added to the
+        result.
+
+    kwargs
+
+        Keyword arguments that would be passed to ``drive`` (e.g. ``t`` and ``n``
+        for ``TimeDriver``).
+
+    Returns
+    -------
+    dict
+
+        Estimate with keys ``cells``, ``fft_grid``, ``pbc_repetitions``,
+        ``solver``, ``steps``,
+        ``device_memory`` (bytes), ``input_bytes``, ``output_bytes``, ``cost``,
+        ``runtime`` (seconds or ``None`` without calibration),
+        ``calibration_drives`` (number of drives used for the calibration) and
+        optionally ``fits_device``.
+        For ``PipelineDriver`` the estimates of all stages are combined and
+        ``solver`` is a list with the solver of every stage.
+
+    Examples
+    --------
+    1. Estimating the resources of a time drive.
+
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> report = mc.estimate(system, mc.TimeDriver(), t=1e-9, n=100)
+    >>> report["cells"]
+    1
+    >>> report["output_bytes"] > 100 * 12
+    True
+
+    2. Checking the device memory of a thin film with periodic boundary conditions.
+
+    >>> import discretisedfield as df
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-6, 5e-7, 1e-9), n=(1000, 500, 1), bc="x")
+    >>> system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    >>> system.energy += mm.Demag()
+    >>> report = mc.estimate(system, mc.RelaxDriver(), device_memory=8 * 1024**3)
+    >>> report["fft_grid"]
+    (1000, 1000, 1)
+    >>> report["fits_device"]
+    True
+
+    """
+    if isinstance(driver, mc.PipelineDriver):
+        reports = [
+            _estimate(system, stage, **stage_kwargs)
+            for stage, stage_kwargs in driver._stages
+        ]
+        report = {
+            **reports[0],
+            "solver": [stage["solver"] for stage in reports],
+            "device_memory": max(stage["device_memory"] for stage in reports),
+        }
+        for key in ["steps", "output_bytes", "cost"]:
+            report[key] = sum(stage[key] for stage in reports)
+    else:
+        report = _estimate(system, driver, **kwargs)
+
+    if device_memory is not None:
+        report["fits_device"] = report["device_memory"] <= device_memory
+
+    if dirname is None:
+        return report
+    telemetry = mc.telemetry.collect(dirname)
+    if {"estimated_cost", "run_time", "success"}.issubset(telemetry.columns):
+        telemetry = telemetry.dropna(subset=["estimated_cost", "run_time"])
+        telemetry = telemetry[telemetry["success"] == True]  # noqa: E712
+        if len(telemetry) > 0:
+            seconds_per_cost = np.median(
+                telemetry["run_time"] / telemetry["estimated_cost"]
+            )
+            report["runtime"] = float(report["cost"] * seconds_per_cost)
+            report["calibration_drives"] = len(telemetry)
+
+    return report
@@ -0,0 +1,7 @@
+from .backwardeulerevolver import BackwardEulerEvolver as BackwardEulerEvolver
+from .benchmark import benchmark as benchmark
+from .eulerevolver import EulerEvolver as EulerEvolver
+from .evolver import Evolver as Evolver
+from .evolver import convert as convert
+from .heunevolver import HeunEvolver as HeunEvolver
+from .rungekuttaevolver import RungeKuttaEvolver as RungeKuttaEvolver
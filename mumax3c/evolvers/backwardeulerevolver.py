@@ -0,0 +1,38 @@
+from .evolver import Evolver
+
+
+class BackwardEulerEvolver(Evolver):
+    """Backward (implicit) Euler evolver (mumax3 solver -1).
+
+    Unconditionally stable first-order solver. mumax3 requires a fixed time step,
+    which has to be passed as ``FixDt``. For details on possible values for
+    individual attributes and their default values, please refer to ``Mumax3``
+    documentation (https://mumax.github.io).
+
+    Examples
+    --------
+    1. Defining evolver.
+
+    >>> import mumax3c as mc
+    ...
+    >>> evolver = mc.BackwardEulerEvolver(FixDt=1e-13)
+
+    2. Using the evolver without a fixed time step.
+
+    >>> evolver = mc.BackwardEulerEvolver()
+    >>> evolver._script()
+    Traceback (most recent call last):
+       ...
+    ValueError: ...
+
+    """
+
+    @property
+    def _solver(self):
+        return -1
+
+    def _script(self):
+        if not getattr(self, "FixDt", 0):
+            msg = f"{self.__class__.__name__} requires a fixed time step (FixDt)."
+            raise ValueError(msg)
+        return super()._script()
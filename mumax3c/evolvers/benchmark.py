@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+import mumax3c as mc
+from .evolver import convert
+
+
+def benchmark(system, evolvers, t, n, reference=None, **kwargs):
+    """Compare the accuracy and cost of evolvers on a reference problem.
+
+    The system is driven with the ``reference`` evolver and with each of the
+    ``evolvers``, always starting from the same initial magnetisation. The
+    trajectory (average magnetisation at the ``n`` saved times) and the final
+    magnetisation of every run are compared with the reference run. The cost is
+    measured as mumax3 wall time and number of solver steps and effective field
+    evaluations. Evolvers with different tolerances are compared by passing the
+    same evolver with different ``MaxErr`` or ``FixDt``.
+
+    After the benchmark the magnetisation of the system is reset to its initial
+    value.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        Reference problem.
+
+    evolvers : iterable
+
+        Evolvers to be compared. Any value accepted by
+        ``mumax3c.evolvers.convert`` can be used.
+
+    t : numbers.Real
+
+        Simulated time in seconds.
+
+    n : int
+
+        Number of saved steps.
+
+    reference : micromagneticmodel.Evolver, str, optional
+
+        Evolver of the reference run. Defaults to the Runge-Kutta-Fehlberg method
+        with ``MaxErr=1e-7``.
+
+    kwargs
+
+        Additional keyword arguments passed to ``mumax3c.TimeDriver.drive`` (e.g.
+        ``dirname`` or ``runner``).
+
+    Returns
+    -------
+    pandas.DataFrame
+
+        One row per run (reference first) with the evolver, the mumax3 solver, the
+        mumax3 wall time ``run_time`` in seconds, the number of ``steps`` and
+        ``evaluations``, the maximum deviation of the normalised average
+        magnetisation from the reference ``table_error``, and the maximum deviation
+        of the normalised final magnetisation from the reference ``error``.
+
+    Examples
+    --------
+    1. Comparing solvers and tolerances.
+
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> evolvers = [
+    ...     mc.RungeKuttaEvolver(method=method, MaxErr=max_err)
+    ...     for method in ["rk23", "rkf54"]
+    ...     for max_err in [1e-3, 1e-5]
+    ... ]
+    >>> # table = mc.evolvers.benchmark(system, evolvers, t=1e-9, n=100)
+
+    """
+    if reference is None:
+        reference = mc.RungeKuttaEvolver(method="rkf56", MaxErr=1e-7)
+    evolvers = [convert(reference), *(convert(evolver) for evolver in evolvers)]
+    initial = system.m.array.copy()
+
+    results = []
+    try:
+        for evolver in evolvers:
+            system.m.array = initial
+            driver = mc.TimeDriver(evolver=evolver)
+            driver.drive(system, t=t, n=n, **kwargs)
+            table = system.table.data[["mx", "my", "mz"]].to_numpy()
+            results.append((evolver, driver._telemetry, table, system.m.orientation))
+    finally:
+        system.m.array = initial
+
+    _, _, reference_table, reference_m = results[0]
+    rows = []
+    for evolver, telemetry, table, m in results:
+        rows.append(
+            {
+                "evolver": repr(evolver),
+                "solver": evolver._solver,
+                "run_time": telemetry.phases["run"],
+                "steps": telemetry.data.get("steps"),
+                "evaluations": telemetry.data.get("evaluations"),
+                "table_error": float(
+                    np.max(np.linalg.norm(table - reference_table, axis=1))
+                ),
+                "error": float(
+                    np.max(np.linalg.norm((m - reference_m).array, axis=-1))
+                ),
+            }
+        )
+    return pd.DataFrame(rows)
@@ -0,0 +1,25 @@
+from .evolver import Evolver
+
+
+class EulerEvolver(Evolver):
+    """Euler evolver (mumax3 solver 1).
+
+    First-order solver with a single evaluation of the effective field per step.
+    Without ``FixDt`` the time step is adapted to the maximum torque and
+    ``MaxErr``. For details on possible values for individual attributes and their
+    default values, please refer to ``Mumax3`` documentation
+    (https://mumax.github.io).
+
+    Examples
+    --------
+    1. Defining evolver with a fixed time step.
+
+    >>> import mumax3c as mc
+    ...
+    >>> evolver = mc.EulerEvolver(FixDt=1e-14)
+
+    """
+
+    @property
+    def _solver(self):
+        return 1
@@ -0,0 +1,104 @@
+import abc
+
+import micromagneticmodel as mm
+
+import mumax3c as mc
+
+
+class Evolver(mm.Evolver):
+    """Evolver base class.
+
+    Every evolver corresponds to one of the mumax3 solvers selected with
+    ``setsolver``. In addition to the solver specific attributes, the time step
+    control of mumax3 can be set. For details on possible values for individual
+    attributes and their default values, please refer to ``Mumax3`` documentation
+    (https://mumax.github.io).
+
+    """
+
+    _allowed_attributes = ["FixDt", "MaxDt", "MinDt", "MaxErr", "Headroom"]
+
+    @property
+    @abc.abstractmethod
+    def _solver(self):
+        """Argument of ``setsolver`` in the mx3 file."""
+
+    def _script(self):
+        mx3 = f"setsolver({self._solver})\n"
+        if not hasattr(self, "FixDt"):
+            mx3 += "fixDt = 0\n"
+        for attr, value in self:
+            if attr in Evolver._allowed_attributes:
+                mx3 += f"{attr} = {value}\n"
+        return mx3
+
+
+def convert(evolver):
+    """Convert an evolver to a ``mumax3c`` evolver.
+
+    ``mumax3c`` evolvers are returned unchanged. Evolvers of other calculators
+    (``micromagneticmodel.Evolver`` objects) are mapped onto the ``mumax3c``
+    evolver with the same class name; the Runge-Kutta ``method`` and the time step
+    control attributes are kept, all other attributes are not supported by mumax3
+    and ignored. Strings are interpreted as the name of the Runge-Kutta ``method``
+    or as ``"euler"``, ``"heun"`` and ``"backward_euler"``. ``None`` is converted
+    to the default evolver (``RungeKuttaEvolver`` with Dormand-Prince method).
+
+    Parameters
+    ----------
+    evolver : micromagneticmodel.Evolver, str, None
+
+        Evolver to be converted.
+
+    Returns
+    -------
+    mumax3c.evolvers.Evolver
+
+        Evolver that can be used with ``mumax3c.TimeDriver``.
+
+    Raises
+    ------
+    TypeError
+
+        If the evolver cannot be mapped onto a mumax3 solver.
+
+    Examples
+    --------
+    1. Converting evolvers.
+
+    >>> import mumax3c as mc
+    ...
+    >>> mc.evolvers.convert(None)
+    RungeKuttaEvolver()
+    >>> mc.evolvers.convert("rk23")
+    RungeKuttaEvolver(method='rk23')
+    >>> mc.evolvers.convert("euler")
+    EulerEvolver()
+
+    """
+    if evolver is None:
+        return mc.RungeKuttaEvolver()
+    if isinstance(evolver, Evolver):
+        return evolver
+    if isinstance(evolver, str):
+        if evolver in mc.RungeKuttaEvolver._methods:
+            return mc.RungeKuttaEvolver(method=evolver)
+        evolvers = {
+            "euler": mc.EulerEvolver,
+            "heun": mc.HeunEvolver,
+            "backward_euler": mc.BackwardEulerEvolver,
+        }
+        if evolver in evolvers:
+            return evolvers[evolver]()
+    elif isinstance(evolver, mm.Evolver):
+        cls = getattr(mc.evolvers, evolver.__class__.__name__, None)
+        if isinstance(cls, type) and issubclass(cls, Evolver):
+            attributes = {
+                attr: getattr(evolver, attr)
+                for attr in cls._allowed_attributes
+                if hasattr(evolver, attr)
+            }
+            return cls(**attributes)
+
+    msg = f"Cannot map {evolver=} onto a mumax3 solver."
+    raise TypeError(msg)
@@ -0,0 +1,24 @@
+from .evolver import Evolver
+
+
+class HeunEvolver(Evolver):
+    """Heun evolver (mumax3 solver 2).
+
+    Second-order solver with two evaluations of the effective field per step. It
+    is often used with a fixed time step for finite temperature simulations. For
+    details on possible values for individual attributes and their default values,
+    please refer to ``Mumax3`` documentation (https://mumax.github.io).
+
+    Examples
+    --------
+    1. Defining evolver with a fixed time step.
+
+    >>> import mumax3c as mc
+    ...
+    >>> evolver = mc.HeunEvolver(FixDt=1e-14)
+
+    """
+
+    @property
+    def _solver(self):
+        return 2
@@ -0,0 +1,56 @@
+from .evolver import Evolver
+
+
+class RungeKuttaEvolver(Evolver):
+    """Runge-Kutta evolver.
+
+    The Runge-Kutta ``method`` selects the mumax3 solver:
+
+    - ``"rk23"``: Bogacki-Shampine (solver 3),
+    - ``"rk4"``: classical Runge-Kutta (solver 4),
+    - ``"rkf54"``: Dormand-Prince (solver 5, default),
+    - ``"rkf56"``: Runge-Kutta-Fehlberg (solver 6).
+
+    The OOMMF method names ``"rk2"`` (Heun, solver 2), ``"rkf54m"`` and
+    ``"rkf54s"`` (both Dormand-Prince) are accepted as well. For details on possible
+    values for individual attributes and their default values, please refer to
+    ``Mumax3`` documentation (https://mumax.github.io).
+
+    Examples
+    --------
+    1. Defining evolver with a keyword argument.
+
+    >>> import mumax3c as mc
+    ...
+    >>> evolver = mc.RungeKuttaEvolver(method="rk23", MaxErr=1e-4)
+    >>> evolver._solver
+    3
+
+    2. Passing an argument which is not allowed.
+
+    >>> evolver = mc.RungeKuttaEvolver(start_dm=0.01)
+    Traceback (most recent call last):
+       ...
+    AttributeError: ...
+
+    """
+
+    _allowed_attributes = [*Evolver._allowed_attributes, "method"]
+
+    _methods = {
+        "rk2": 2,
+        "rk23": 3,
+        "rk4": 4,
+        "rkf54": 5,
+        "rkf54m": 5,
+        "rkf54s": 5,
+        "rkf56": 6,
+    }
+
+    @property
+    def _solver(self):
+        method = getattr(self, "method", "rkf54")
+        if method not in self._methods:
+            msg = f"Unknown Runge-Kutta {method=}; use one of {list(self._methods)}."
+            raise ValueError(msg)
+        return self._methods[method]
@@ -0,0 +1,618 @@
+import contextlib
+import io
+import json
+import math
+import os
+import pathlib
+import re
+
+import discretisedfield as df
+import numpy as np
+import pandas as pd
+import ubermagtable as ut
+
+# ubermagtable.util.columns reads the whole file to rename the columns of the header.
+from ubermagtable.util.util import mumax3_dict, rename_column
+
+_precisions = ("float32", "float64")
+
+
+def _check_precision(precision):
+    if precision not in _precisions:
+        raise ValueError(
+            f"Invalid {precision=}; must be one of {', '.join(_precisions)}."
+        )
+
+
+def read_field(filename, precision="float64"):
+    """Read a field written by mumax3.
+
+    With ``precision="float64"`` the file is read with
+    ``discretisedfield.Field.from_file``. With ``precision="float32"`` single
+    precision binary files (the default output of mumax3c) are read without
+    converting the data to double precision, which halves the memory required
+    for every loaded field. Other files are converted to single precision after
+    reading.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        Name of the OVF file.
+
+    precision : str, optional
+
+        Floating-point precision of the returned field, ``"float32"`` or
+        ``"float64"``. Defaults to ``"float64"``.
+
+    Returns
+    -------
+    discretisedfield.Field
+
+        Field read from the file.
+
+    Raises
+    ------
+    ValueError
+
+        If ``precision`` is not supported.
+
+    Examples
+    --------
+    1. Reading a single precision field.
+
+    >>> import discretisedfield as df
+    >>> import mumax3c as mc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 1e-9), n=(2, 2, 1))
+    >>> field = df.Field(mesh, nvdim=3, value=(0, 0, 1))
+    >>> field.to_file("m.ovf", representation="bin4")
+    >>> mc.io.read_field("m.ovf", precision="float32").array.dtype
+    dtype('float32')
+    >>> import os; os.remove("m.ovf")
+
+    """
+    _check_precision(precision)
+    if precision == "float64":
+        return df.Field.from_file(str(filename))
+
+    header, offset, nbytes = _read_ovf2_header(filename)
+    if nbytes != 4:
+        field = df.Field.from_file(str(filename))
+        return df.Field(
+            field.mesh,
+            nvdim=field.nvdim,
+            value=field.array,
+            vdims=field.vdims,
+            unit=field.unit,
+            dtype=np.float32,
+        )
+
+    mesh = df.Mesh(
+        region=df.Region(
+            p1=[float(header[f"{key}min"]) for key in "xyz"],
+            p2=[float(header[f"{key}max"]) for key in "xyz"],
+            units=[header["meshunit"]] * 3,
+        ),
+        cell=[float(header[f"{key}stepsize"]) for key in "xyz"],
+    )
+    with contextlib.suppress(FileNotFoundError):
+        mesh.load_subregions(filename)
+    nvdim = int(header["valuedim"])
+    # Skip the check value, which is stored before the data.
+    array = np.fromfile(
+        filename, dtype="<f4", count=math.prod(mesh.n) * nvdim, offset=offset + 4
+    )
+    array = array.reshape((*reversed(mesh.n), nvdim)).transpose((2, 1, 0, 3))
+
+    vdims = [label.split("_")[-1] for label in header.get("valuelabels", "").split()]
+    if len(vdims) != nvdim or len(set(vdims)) != nvdim:
+        vdims = None
+    units = set(header.get("valueunits", "").split())
+    unit = units.pop() if len(units) == 1 else None
+
+    return df.Field(
+        mesh, nvdim=nvdim, value=array, vdims=vdims, unit=unit, dtype=np.float32
+    )
+
+
+def _read_ovf2_header(filename):
+    """Return header, data offset and number of bytes per value of an OVF file.
+
+    For text files the number of bytes per value is ``None``.
+
+    """
+    header = {}
+    offset = 0
+    nbytes = None
+    with open(filename, "rb") as f:
+        for line in f:
+            offset += len(line)
+            line = line.decode("utf-8")
+            if line.lower().startswith("# begin: data"):
+                if match := re.search(r"binary\s+(\d)", line, flags=re.IGNORECASE):
+                    nbytes = int(match.group(1))
+                break
+            key, sep, value = line[1:].partition(":")  # remove leading `#`
+            if sep:
+                header[key.strip()] = value.strip()
+    return header, offset, nbytes
+
+
+def snapshots(dirname, name="m_full"):
+    """Sorted list of snapshot files with name ``name`` in ``dirname``."""
+    return sorted(pathlib.Path(dirname).glob(f"{name}*.ovf"))
+
+
+def table_columns(header):
+    """Column names in the header line of a mumax3 table file.
+
+    Examples
+    --------
+    1. Extracting column names.
+
+    >>> import mumax3c as mc
+    ...
+    >>> mc.io.table_columns("# t (s)\\tmx ()\\tmy ()\\tmz ()\\tE_total (J)\\n")
+    ['t', 'mx', 'my', 'mz', 'E_total']
+
+    """
+    return [
+        re.sub(r"\s*\(.*\)$", "", column.strip())
+        for column in header.lstrip("#").strip().split("\t")
+    ]
+
+
+class TableTail:
+    """Incrementally read rows appended to a mumax3 table file.
+
+    Every call to ``read`` returns only the rows written since the previous call.
+    The position in the file is stored in ``offset``; it can be saved and passed
+    to a new ``TableTail`` to continue reading where a previous one stopped.
+    Incomplete lines (rows that mumax3 is still writing) are not returned until
+    they are complete.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        Name of the table file. The file does not have to exist yet.
+
+    offset : int, optional
+
+        Position in bytes from which reading starts. Defaults to ``0``.
+
+    Examples
+    --------
+    1. Reading rows as they are appended.
+
+    >>> import mumax3c as mc
+    ...
+    >>> with open("table.txt", "w") as f:
+    ...     _ = f.write("# t (s)\\tmx ()\\n1e-12\\t0.5\\n")
+    >>> tail = mc.io.TableTail("table.txt")
+    >>> tail.read()
+    array([[1.e-12, 5.e-01]])
+    >>> tail.columns
+    ['t', 'mx']
+    >>> with open("table.txt", "a") as f:
+    ...     _ = f.write("2e-12\\t0.6\\n3e-12")
+    >>> tail.read()
+    array([[2.e-12, 6.e-01]])
+    >>> import os; os.remove("table.txt")
+
+    """
+
+    def __init__(self, filename, offset=0):
+        self.filename = pathlib.Path(filename)
+        self.offset = offset
+        self.columns = None
+
+    def read(self):
+        """Read the complete rows appended since the last call.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Two-dimensional array with one row per table row. The array is empty if
+            no new rows are available.
+
+        """
+        if self.columns is None:
+            with contextlib.suppress(FileNotFoundError), open(self.filename) as f:
+                header = f.readline()
+                if header.endswith("\n"):
+                    self.columns = table_columns(header)
+                    self.offset = max(self.offset, len(header.encode("utf-8")))
+        if self.columns is None:
+            return np.empty((0, 0))
+
+        with open(self.filename, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # only complete lines
+        self.offset += end
+        rows = [line.split() for line in data[:end].decode("utf-8").splitlines()]
+        rows = [row for row in rows if row and not row[0].startswith("#")]
+        return np.array(rows, dtype=float).reshape(-1, len(self.columns))
+
+
+def table_units(header):
+    """Units of the columns in the header line of a mumax3 table file.
+
+    Examples
+    --------
+    1. Extracting units.
+
+    >>> import mumax3c as mc
+    ...
+    >>> mc.io.table_units("# t (s)\\tmx ()\\tE_total (J)\\n")
+    ['s', '', 'J']
+
+    """
+    return [
+        match.group(1) if (match := re.search(r"\((.*)\)$", column.strip())) else ""
+        for column in header.lstrip("#").strip().split("\t")
+    ]
+
+
+class TableReader:
+    """Read selected columns and rows of large mumax3 table files.
+
+    Long drives write tables with millions of rows of which often only a few
+    columns or rows are needed. ``TableReader`` parses only the selected columns,
+    reads the last rows without parsing the rest of the file, selects rows in a
+    window of the independent variable, and iterates over the table in chunks so
+    that memory does not grow with the length of the table.
+
+    With ``cache=True``, a binary columnar copy of the table is written next to it
+    (directory ``<filename>.columns`` with one ``.npy`` file per column) the first
+    time it is needed. Afterwards, columns are loaded from the copy as memory maps
+    instead of parsing the text file. The copy is rewritten if the table file
+    changes.
+
+    Columns are renamed like in ``ubermagtable.Table.fromfile`` (e.g. ``E_total``
+    is renamed to ``E``).
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        Name of the table file.
+
+    cache : bool, optional
+
+        If ``True``, the binary columnar copy is used. Defaults to ``False``.
+
+    Examples
+    --------
+    1. Reading selected columns and rows.
+
+    >>> import mumax3c as mc
+    ...
+    >>> with open("table.txt", "w") as f:
+    ...     _ = f.write("# t (s)\\tmx ()\\tE_total (J)\\n")
+    ...     for i in range(10):
+    ...         _ = f.write(f"{i}e-12\\t0.{i}\\t-1e-20\\n")
+    >>> reader = mc.io.TableReader("table.txt")
+    >>> reader.columns
+    ['t', 'mx', 'E']
+    >>> len(reader)
+    10
+    >>> reader.read(columns=["mx"], tail=2).data["mx"].to_list()
+    [0.8, 0.9]
+    >>> reader.read(columns=["mx"], start=2e-12, stop=4e-12).data["mx"].to_list()
+    [0.2, 0.3, 0.4]
+    >>> [len(chunk) for chunk in reader.chunks(chunksize=4)]
+    [4, 4, 2]
+    >>> import os; os.remove("table.txt")
+
+    """
+
+    def __init__(self, filename, cache=False):
+        self.filename = pathlib.Path(filename)
+        self.cache = cache
+        with open(self.filename, encoding="utf-8") as f:
+            header = f.readline()
+        self._offset = len(header.encode("utf-8"))
+        self.columns = [
+            rename_column(column, mumax3_dict) for column in table_columns(header)
+        ]
+        self.units = dict(zip(self.columns, table_units(header)))
+
+    @property
+    def _cachedir(self):
+        return self.filename.with_name(f"{self.filename.name}.columns")
+
+    def __len__(self):
+        """Number of rows in the table."""
+        if (arrays := self._arrays()) is not None:
+            return len(arrays[0])
+        return self._rows()
+
+    def _rows(self):
+        """Number of lines after the header of the text table."""
+        with open(self.filename, "rb") as f:
+            f.seek(self._offset)
+            rows, last = 0, b"\n"
+            for block in iter(lambda: f.read(2**24), b""):
+                rows += block.count(b"\n")
+                last = block[-1:]
+        return rows + (last != b"\n")  # last row without a newline
+
+    def _indices(self, columns):
+        columns = self.columns if columns is None else list(columns)
+        if missing := [column for column in columns if column not in self.columns]:
+            msg = f"Columns {missing} are not in {str(self.filename)!r}."
+            raise ValueError(msg)
+        return columns, [self.columns.index(column) for column in columns]
+
+    def _parse(self, source, columns, chunksize=2**20):
+        """Parse the rows of the text table in chunks."""
+        columns, indices = self._indices(columns)
+        chunks = pd.read_csv(
+            source,
+            sep=r"\s+",
+            comment="#",
+            header=None,
+            names=self.columns,
+            usecols=indices,
+            dtype=float,
+            chunksize=chunksize,
+        )
+        for chunk in chunks:
+            yield chunk[columns]  # usecols does not preserve the order
+
+    @staticmethod
+    def _concat(chunks, columns):
+        chunks = list(chunks)
+        return pd.concat(chunks) if chunks else pd.DataFrame(columns=columns)
+
+    def _arrays(self, columns=None):
+        """Memory-mapped columns of the binary copy or ``None`` if not cached."""
+        if not self.cache:
+            return None
+        stat = self.filename.stat()
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        index = self._cachedir / "index.json"
+        try:
+            with open(index, encoding="utf-8") as f:
+                valid = json.load(f) == source
+        except (FileNotFoundError, json.JSONDecodeError):
+            valid = False
+
+        if not valid:
+            self._cachedir.mkdir(exist_ok=True)
+            index.unlink(missing_ok=True)
+            # The rows are counted first, so that the chunks are written directly
+            # to the columns instead of holding the whole table in memory.
+            rows = self._rows()
+            filenames = [self._cachedir / f"{i}.npy" for i in range(len(self.columns))]
+            arrays = [
+                np.lib.format.open_memmap(f, mode="w+", dtype=float, shape=(rows,))
+                for f in filenames
+            ]
+            start = 0
+            for chunk in self._parse(self.filename, None):
+                stop = start + len(chunk)
+                for array, values in zip(arrays, chunk.to_numpy().T):
+                    array[start:stop] = values
+                start = stop
+            for filename, array in zip(filenames, arrays):
+                array.flush()
+                if start < rows:  # blank lines are not rows
+                    np.save(filename.with_suffix(".tmp.npy"), array[:start])
+            del arrays
+            if start < rows:
+                for filename in filenames:
+                    os.replace(filename.with_suffix(".tmp.npy"), filename)
+            with open(index, "w", encoding="utf-8") as f:
+                json.dump(source, f)  # written last, marks the copy as complete
+
+        _, indices = self._indices(columns)
+        return [np.load(self._cachedir / f"{i}.npy", mmap_mode="r") for i in indices]
+
+    def _tail(self, rows):
+        """Bytes of the last ``rows`` rows of the text table."""
+        with open(self.filename, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            position, data = end, b""
+            while position > self._offset and data.count(b"\n") <= rows:
+                size = min(2**16, position - self._offset)
+                position -= size
+                f.seek(position)
+                data = f.read(size) + data
+        if position > self._offset or data.count(b"\n") > rows:
+            data = data.rsplit(b"\n", rows + 1 if data.endswith(b"\n") else rows)[1:]
+            data = b"\n".join(data)
+        return data
+
+    def chunks(self, columns=None, chunksize=100_000):
+        """Iterate over the table in chunks.
+
+        Parameters
+        ----------
+        columns : list, optional
+
+            Columns to read. Defaults to all columns.
+
+        chunksize : int, optional
+
+            Maximum number of rows per chunk. Defaults to ``100_000``.
+
+        Yields
+        ------
+        pandas.DataFrame
+
+            Consecutive rows of the table.
+
+        """
+        columns, _ = self._indices(columns)
+        if (arrays := self._arrays(columns)) is not None:
+            for start in range(0, len(arrays[0]), chunksize):
+                data = {
+                    c: a[start : start + chunksize] for c, a in zip(columns, arrays)
+                }
+                yield pd.DataFrame(
+                    data, index=range(start, start + len(data[columns[0]]))
+                )
+            return
+        yield from self._parse(self.filename, columns, chunksize)
+
+    def read(self, columns=None, tail=None, start=None, stop=None, x="t"):
+        """Read the table.
+
+        Parameters
+        ----------
+        columns : list, optional
+
+            Columns to read. The independent variable ``x`` is always included.
+            Defaults to all columns.
+
+        tail : int, optional
+
+            If given, only the last ``tail`` rows (of the rows in the window, if
+            ``start`` or ``stop`` are given) are read.
+
+        start, stop : float, optional
+
+            Only rows with ``start <= x <= stop`` are read.
+
+        x : str, optional
+
+            Independent variable. Defaults to ``"t"``.
+
+        Returns
+        -------
+        ubermagtable.Table
+
+            Table with the selected columns and rows.
+
+        Raises
+        ------
+        ValueError
+
+            If a column does not exist.
+
+        """
+        columns, _ = self._indices(columns)
+        if x is not None:
+            self._indices([x])
+            columns = [x, *(column for column in columns if column != x)]
+        window = start is not None or stop is not None
+        if window and x is None:
+            raise ValueError("Reading a window requires the independent variable x.")
+
+        def select(data):
+            if window:
+                values = data[x].to_numpy()
+                mask = np.ones(len(values), dtype=bool)
+                if start is not None:
+                    mask &= values >= start
+                if stop is not None:
+                    mask &= values <= stop
+                data = data[mask]
+            return data
+
+        if (arrays := self._arrays(columns)) is not None:
+            if tail is not None and not window:
+                arrays = [
+                    array[len(array) - min(tail, len(array)) :] for array in arrays
+                ]
+            data = select(pd.DataFrame(dict(zip(columns, map(np.array, arrays)))))
+        elif window:
+            data = self._concat(
+                map(select, self._parse(self.filename, columns)), columns
+            )
+        elif tail is not None:
+            data = self._concat(
+                self._parse(io.BytesIO(self._tail(tail)), columns), columns
+            )
+        else:
+            data = self._concat(self._parse(self.filename, columns), columns)
+
+        if tail is not None:
+            data = data.iloc[len(data) - min(tail, len(data)) :]
+        data = data.reset_index(drop=True)
+        units = {column: self.units[column] for column in columns}
+        return ut.Table(data, units=units, x=x)
+
+
+# Torque evaluations per attempted time step of the mumax3 solvers (setsolver
+# argument). Solvers with the first-same-as-last property reuse one evaluation.
+_evaluations_per_step = {1: 1, 2: 2, 3: 3, 4: 4, 5: 6, 6: 6}
+
+
+def parse_log(text):
+    """Extract solver and runtime statistics from mumax3 output.
+
+    ``text`` can be the content of ``log.txt`` in the mumax3 output directory, the
+    standard output of mumax3, or both. mumax3c adds the number of steps and torque
+    evaluations to the end of every mx3 file (``print("mumax3c: ...")``). mumax3
+    does not report rejected steps; they are estimated from the number of torque
+    evaluations per attempted step of the solver used in the script.
+
+    Parameters
+    ----------
+    text : str
+
+        mumax3 output.
+
+    Returns
+    -------
+    dict
+
+        Statistics found in the text. Possible keys are ``mumax3_version``,
+        ``device`` (GPU information line), ``solver`` (argument of the last
+        ``setsolver``), ``steps``, ``evaluations``, ``evaluations_per_step``,
+        ``rejected_steps`` (estimate), ``kernel`` (``"cached"`` or
+        ``"calculated"``), and ``kernel_init_time`` (in seconds, if reported by
+        mumax3).
+
+    Examples
+    --------
+    1. Parsing mumax3 output.
+
+    >>> import mumax3c as mc
+    ...
+    >>> stats = mc.io.parse_log('''//mumax 3.10 linux_amd64 go1.14 (gc)
+    ... //GPU info: NVIDIA A100(40536MB), CUDA Driver 11.4, cc=8.0
+    ... setsolver(5)
+    ... //mumax3c: step 100
+    ... //mumax3c: NEval 612
+    ... ''')
+    >>> stats["mumax3_version"], stats["steps"], stats["evaluations"]
+    ('3.10', 100, 612)
+    >>> stats["rejected_steps"]
+    2
+
+    """
+    stats = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if match := re.match(r"//\s*mumax\s+(\d\S*)", line):
+            stats["mumax3_version"] = match.group(1)
+        elif match := re.match(r"//\s*(?:GPU info|CUDA.*?):\s*(.*)", line):
+            stats["device"] = match.group(1).strip()
+        elif match := re.match(r"setsolver\s*\(\s*(-?\d+)\s*\)", line, re.IGNORECASE):
+            stats["solver"] = int(match.group(1))
+        elif match := re.search(r"mumax3c:\s*(\w+)\s+(\S+)", line):
+            key = {"step": "steps", "NEval": "evaluations"}.get(match.group(1))
+            with contextlib.suppress(ValueError):
+                stats[key] = int(float(match.group(2)))
+        elif "kernel" in line.lower() and line.startswith("//"):
+            stats["kernel"] = "cached" if "cache" in line.lower() else "calculated"
+            if match := re.search(r"(\d+(?:\.\d+)?)\s*(ms|s)\b", line):
+                time = float(match.group(1))
+                stats["kernel_init_time"] = (
+                    time / 1e3 if match.group(2) == "ms" else time
+                )
+    stats.pop(None, None)
+
+    if stats.get("steps") and "evaluations" in stats:
+        stats["evaluations_per_step"] = stats["evaluations"] / stats["steps"]
+        if (per_step := _evaluations_per_step.get(stats.get("solver"))) is not None:
+            attempted = round(stats["evaluations"] / per_step)
+            stats["rejected_steps"] = max(0, attempted - stats["steps"])
+    return stats
@@ -0,0 +1,294 @@
+"""Scheduling many drives as a single job array."""
+
+import contextlib
+import datetime
+import json
+import pathlib
+import shlex
+import subprocess as sp
+import sys
+
+import pandas as pd
+import ubermagtable as ut
+import ubermagutil as uu
+
+import mumax3c as mc
+
+# Environment variables with the array index of common job schedulers.
+index_variables = {
+    "slurm": "SLURM_ARRAY_TASK_ID",
+    "pbs": "PBS_ARRAY_INDEX",
+    "sge": "SGE_TASK_ID",
+    "lsf": "LSB_JOBINDEX",
+}
+
+# First array index of common job schedulers.
+first_indices = {"slurm": 0, "pbs": 1, "sge": 1, "lsf": 1}
+
+# Directives requesting a job array of common job schedulers; {first} and {last}
+# are the first and last array index.
+directives = {
+    "slurm": "#SBATCH --array={first}-{last}",
+    "pbs": "#PBS -J {first}-{last}",
+    "sge": "#$ -t {first}-{last}",
+    "lsf": '#BSUB -J "array[{first}-{last}]"',
+}
+
+
+def _array_script(header, directive, manifest, index_variable, first_index=0):
+    lines = header.rstrip("\n").splitlines() if header else []
+    # Scheduler directives must precede the first command of the script.
+    position = 1 if lines and lines[0].startswith("#!") else 0
+    while position < len(lines) and lines[position].startswith("#"):
+        position += 1
+    if directive:
+        lines.insert(position, directive)
+    # Line of the manifest with the drive directory of the array index.
+    line = f"${{{index_variable}}}"
+    if first_index != 1:
+        line = f"$(({line} + {1 - first_index}))"
+    lines += [
+        "",
+        f'cd "$(sed -n "{line}p" {shlex.quote(manifest)})" || exit 1',
+        "sh run.sh",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def schedule_array(
+    driver,
+    systems,
+    cmd,
+    header,
+    script_name="array.sh",
+    dirname=".",
+    append=True,
+    runner=None,
+    ovf_format="bin8",
+    verbose=1,
+    scheduler="slurm",
+    index_variable=None,
+    first_index=None,
+    directive=True,
+    **kwargs,
+):
+    """Schedule the drives of many systems as a single job array.
+
+    The input files of every drive are written to its drive directory, which also
+    contains a script ``run.sh`` running mumax3 and storing its exit status in
+    ``returncode.txt``. In ``dirname`` a single array job script ``script_name``,
+    the manifest ``<script>.manifest.txt`` (the drive directory of the ``i``-th
+    drive in line ``i + 1``, read by the job script) and
+    ``<script>.manifest.json`` (zero-based index, system name, drive number and
+    drive directory of all drives, used by ``mumax3c.jobs.collect``) are written.
+    The ``i``-th drive runs with the array index ``first_index + i``. Then
+    the array job script is submitted with ``cmd``.
+
+    Use ``Driver.schedule`` with a list of systems instead of calling this function
+    directly.
+
+    Parameters
+    ----------
+    driver : mumax3c.Driver
+
+        Driver used for all drives.
+
+    systems : list
+
+        Systems to drive or tuples ``(system, kwargs)`` with keyword arguments of
+        the individual drives, which update the common keyword arguments.
+
+    cmd : str
+
+        Submission command of the scheduler, e.g. ``"sbatch"``.
+
+    header : str
+
+        Filename of the submission header file or string with the header.
+
+    script_name : str, optional
+
+        Name of the array job script. Defaults to ``"array.sh"``.
+
+    scheduler : str, optional
+
+        Scheduler used to determine the environment variable with the array index,
+        the first array index and the job array directive: ``"slurm"`` (index from
+        0), ``"pbs"`` (PBS Pro), ``"sge"`` or ``"lsf"`` (index from 1). Defaults to
+        ``"slurm"``.
+
+    index_variable : str, optional
+
+        Environment variable with the array index. Overrides the variable
+        determined from ``scheduler``.
+
+    first_index : int, optional
+
+        First array index. Overrides the first index of ``scheduler``.
+
+    directive : str, bool, optional
+
+        Scheduler directive requesting the job array, inserted after the comments
+        at the beginning of the header. ``{first}``, ``{last}`` and ``{count}``
+        are replaced with the first and last array index and the number of drives.
+        Defaults to ``True``, the directive of ``scheduler`` (e.g.
+        ``"#SBATCH --array={first}-{last}"``); use ``None`` if the header already
+        contains it.
+
+    dirname, append, runner, ovf_format, verbose, kwargs
+
+        See ``Driver.schedule``.
+
+    Returns
+    -------
+    pathlib.Path
+
+        Name of the json manifest.
+
+    """
+    if index_variable is None:
+        index_variable = index_variables[scheduler]
+    if first_index is None:
+        first_index = first_indices[scheduler]
+    if directive is True:
+        directive = directives[scheduler]
+    entries = []
+    start_time = datetime.datetime.now()
+    for i, item in enumerate(systems):
+        system, drive_kwargs = item if isinstance(item, tuple) else (item, {})
+        drive_kwargs = {**kwargs, **drive_kwargs}
+        schedule_kwargs = drive_kwargs.copy()
+        driver.schedule_kwargs_setup(drive_kwargs)
+        driver._check_system(system)
+        workingdir = driver._setup_working_directory(
+            system=system, dirname=dirname, mode="drive", append=append
+        )
+        with uu.changedir(workingdir):
+            driver._write_input_files(
+                system=system, ovf_format=ovf_format, **drive_kwargs
+            )
+            commands = driver._schedule_commands(system=system, runner=runner)
+            with open("run.sh", "w", encoding="utf-8") as f:
+                f.write("\n".join(commands))
+                f.write("\necho $? > returncode.txt\n")
+            driver._write_info_json(system, start_time, **schedule_kwargs)
+        entries.append(
+            {
+                "index": i,
+                "system": system.name,
+                "drive_number": system.drive_number,
+                "dirname": str(pathlib.Path(workingdir).absolute()),
+                "x": driver._x,
+            }
+        )
+        system.drive_number += 1
+
+    if pathlib.Path(header).exists():
+        header = pathlib.Path(header).read_text(encoding="utf-8")
+    if directive:
+        directive = directive.format(
+            first=first_index,
+            last=first_index + len(entries) - 1,
+            count=len(entries),
+        )
+    stem = pathlib.Path(script_name).stem
+    with uu.changedir(dirname):
+        manifest = pathlib.Path(f"{stem}.manifest.txt").absolute()
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.writelines(f"{entry['dirname']}\n" for entry in entries)
+        with open(f"{stem}.manifest.json", "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        with open(script_name, "w", encoding="utf-8") as f:
+            f.write(
+                _array_script(
+                    header, directive, str(manifest), index_variable, first_index
+                )
+            )
+
+        if verbose >= 1:
+            print(f"Running '{cmd} {script_name}' in '{pathlib.Path().absolute()}'.")
+        res = sp.run([cmd, script_name], capture_output=sys.platform != "win32")
+        if res.returncode != 0:
+            msg = "Error during job schedule.\n"
+            msg += f"command: {cmd} {script_name}\n"
+            if sys.platform != "win32":
+                msg += f"stdout: {res.stdout.decode('utf-8', 'replace')}\n"
+                msg += f"stderr: {res.stderr.decode('utf-8', 'replace')}\n"
+            raise RuntimeError(msg)
+        return pathlib.Path(f"{stem}.manifest.json").absolute()
+
+
+def collect(manifest, systems=None, precision="float64"):
+    """Gather the results of a job array.
+
+    The status of every drive is determined from ``returncode.txt`` in its drive
+    directory: ``"pending"`` if the file does not exist (yet), ``"finished"`` if
+    mumax3 exited successfully and ``"failed"`` otherwise.
+
+    Parameters
+    ----------
+    manifest : str, pathlib.Path
+
+        json manifest written by ``Driver.schedule``.
+
+    systems : list, optional
+
+        Systems in the order in which they were scheduled. The final magnetisation
+        and the table of every finished drive are read into the corresponding
+        system. Defaults to ``None``.
+
+    precision : str, optional
+
+        Floating-point precision of the magnetisation read into the systems.
+        Defaults to ``"float64"``.
+
+    Returns
+    -------
+    pandas.DataFrame
+
+        One row per array index with the system name, drive number, drive
+        directory, status and return code of the drive.
+
+    Examples
+    --------
+    1. Scheduling many systems and collecting the results.
+
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> systems = [mm.examples.macrospin() for _ in range(3)]
+    >>> td = mc.TimeDriver()
+    >>> # manifest = td.schedule(systems, "sbatch", "header.sh", t=1e-9, n=100)
+    >>> # mc.jobs.collect(manifest, systems)
+
+    """
+    mc.io._check_precision(precision)
+    with open(manifest, encoding="utf-8") as f:
+        entries = json.load(f)
+    if systems is not None and len(systems) != len(entries):
+        msg = f"Cannot collect {len(entries)} drives into {len(systems)} systems."
+        raise ValueError(msg)
+
+    rows = []
+    for entry in entries:
+        drivedir = pathlib.Path(entry["dirname"])
+        returncode = None
+        with contextlib.suppress(FileNotFoundError):
+            text = (drivedir / "returncode.txt").read_text(encoding="utf-8").strip()
+            returncode = int(text) if text else -1
+        status = {None: "pending", 0: "finished"}.get(returncode, "failed")
+        rows.append({**entry, "status": status, "returncode": returncode})
+
+        if systems is not None and status == "finished":
+            system = systems[entry["index"]]
+            outdir = drivedir / f"{entry['system']}.out"
+            norm = system.m.norm
+            field = mc.io.read_field(mc.io.snapshots(outdir)[-1], precision=precision)
+            system.m.dtype = field.dtype
+            system.m.array = field.array
+            system.m.norm = norm
+            system.table = ut.Table.fromfile(str(outdir / "table.txt"), x=entry["x"])
+
+    columns = ["index", "system", "drive_number", "dirname", "status", "returncode"]
+    return pd.DataFrame(rows, columns=columns).set_index("index")
@@ -1,4 +1,7 @@
 from .mumax3 import ExeMumax3Runner as ExeMumax3Runner
 from .mumax3 import Mumax3Runner as Mumax3Runner
 from .mumax3 import Runner as Runner
+from .mumax3 import cache_dir as cache_dir
 from .mumax3 import overhead as overhead
+from .pool import Mumax3RunnerPool as Mumax3RunnerPool
+from .progress import ProgressMonitor as ProgressMonitor
@@ -1,5 +1,8 @@
 import abc
+import contextlib
+import json
 import logging
+import os
 import pathlib
 import shutil
 import subprocess as sp
@@ -11,8 +14,29 @@ import ubermagutil as uu
 
 import mumax3c as mc
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
 log = logging.getLogger("mumax3c")
 
+PROBE_TIMEOUT = 60  # seconds
+
+
+def cache_dir():
+    """Directory of the mumax3c cache shared by all processes of the user.
+
+    The directory is ``$MUMAX3C_CACHE_DIR`` if set, otherwise ``mumax3c`` in
+    ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+
+    """
+    if "MUMAX3C_CACHE_DIR" in os.environ:
+        return pathlib.Path(os.environ["MUMAX3C_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")
+    return pathlib.Path(base, "mumax3c")
+
 
 class Mumax3Runner(mm.ExternalRunner):
     """Abstract class for running mumax3."""
@@ -26,30 +50,56 @@ class Mumax3Runner(mm.ExternalRunner):
     def _call(self, argstr, need_stderr=False, dry_run=False):
         """This method should be implemented in subclass."""
 
-    @property
-    def status(self):
-        """Run a macrospin example for 1 ps through mumax3c and print the mumax3
-        status.
+    def probe(self):
+        """Cheap check of the mumax3 installation without running a simulation.
+
+        Runners that can query the mumax3 executable return a dictionary with the
+        keys ``available``, ``executable``, ``version`` and ``device``. The base
+        class cannot probe and returns ``None``, in which case ``check`` falls back
+        to the deep check.
+
+        """
+        return None
+
+    def check(self, deep=False):
+        """Check that mumax3 can be used with this runner and print the status.
+
+        By default the cheap (and cached) ``probe`` is used. With ``deep=True`` or if
+        the runner cannot be probed, a macrospin example is driven for 1 ps through
+        mumax3c.
+
+        Parameters
+        ----------
+        deep : bool, optional
+
+            If ``True``, run a full simulation. Defaults to ``False``.
 
         Returns
         -------
         int
 
-            If ``0``, the mumax3 is found and running. Otherwise, ``1`` is
-            returned.
+            If ``0``, the mumax3 is found (and running for ``deep=True``).
+            Otherwise, ``1`` is returned.
 
         Examples
         --------
-        1. Checking the mumax3 status.
+        1. Checking the mumax3 status with a simulation.
 
         >>> import mumax3c as mc
         ...
-        >>> mc.runner.runner.status
+        >>> mc.runner.runner.check(deep=True)
         Running mumax3...
         mumax3 found and running.
         0
 
         """
+        if not deep and (info := self.probe()) is not None:
+            if info["available"]:
+                print(f"mumax3 found ({info['version']}, {info['device']}).")
+                return 0
+            print("Cannot find mumax3.")
+            return 1
+
         system = mm.examples.macrospin()
         try:
             td = mc.TimeDriver()
@@ -60,6 +110,31 @@ class Mumax3Runner(mm.ExternalRunner):
             print("Cannot find mumax3.")
             return 1
 
+    @property
+    def status(self):
+        """Check the mumax3 status using the cheap probe and print it.
+
+        For a check running a simulation refer to ``check``.
+
+        Returns
+        -------
+        int
+
+            If ``0``, the mumax3 is found. Otherwise, ``1`` is returned.
+
+        Examples
+        --------
+        1. Checking the mumax3 status.
+
+        >>> import mumax3c as mc
+        ...
+        >>> mc.runner.runner.status
+        mumax3 found (...).
+        0
+
+        """
+        return self.check()
+
 
 @uu.inherit_docs
 class ExeMumax3Runner(Mumax3Runner):
@@ -86,6 +161,113 @@ class ExeMumax3Runner(Mumax3Runner):
         else:
             return sp.run(cmd, stdout=sp.PIPE, stderr=sp.PIPE)
 
+    def probe(self):
+        """Query version and device of the mumax3 executable.
+
+        The result of a successful probe is cached on disk (see ``cache_dir``) and
+        shared between processes. The cache entry is invalidated if the path or the
+        modification time of the executable changes.
+
+        Returns
+        -------
+        dict
+
+            Probe result with keys ``available``, ``executable``, ``version`` and
+            ``device``.
+
+        """
+        executable = shutil.which(self.mumax3_exe[-1])
+        if executable is None:
+            return {
+                "available": False,
+                "executable": None,
+                "version": None,
+                "device": None,
+            }
+        executable = str(pathlib.Path(executable).resolve())
+        key = " ".join([*self.mumax3_exe[:-1], executable])
+        mtime = os.stat(executable).st_mtime_ns
+
+        cachefile = cache_dir() / "probe.json"
+        entry = _read_cache(cachefile).get(key)
+        if isinstance(entry, dict) and entry.get("mtime") == mtime:
+            log.debug("Returning cached probe of %s.", key)
+            return entry["probe"]
+
+        try:
+            res = sp.run(
+                [*self.mumax3_exe, "-version"],
+                stdout=sp.PIPE,
+                stderr=sp.PIPE,
+                timeout=PROBE_TIMEOUT,
+            )
+        except (OSError, sp.TimeoutExpired):
+            returncode, output = 1, ""
+        else:
+            returncode = res.returncode
+            output = (res.stdout + res.stderr).decode("utf-8", "replace")
+        stats = mc.io.parse_log(output)
+        probe = {
+            "available": returncode == 0,
+            "executable": executable,
+            "version": stats.get("mumax3_version"),
+            "device": stats.get("device"),
+        }
+        if probe["available"]:
+            cachefile.parent.mkdir(parents=True, exist_ok=True)
+            # Other processes may have added entries since the cache was read.
+            with _file_lock(cachefile.with_suffix(".lock")):
+                cache = _read_cache(cachefile)
+                cache[key] = {"mtime": mtime, "probe": probe}
+                tmpfile = cachefile.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmpfile, "w", encoding="utf-8") as f:
+                    json.dump(cache, f)
+                os.replace(tmpfile, cachefile)  # readers never see partial files
+        return probe
+
+
+def _read_cache(cachefile):
+    """Content of a json cache file; missing or corrupt files are empty."""
+    try:
+        with open(cachefile, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _try_lock(fd):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:  # pragma: no cover
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def _file_lock(lockfile, poll_interval=0.01):
+    """Hold an exclusive lock on ``lockfile``, shared between processes."""
+    fd = os.open(lockfile, os.O_RDWR | os.O_CREAT)
+    try:
+        while not _try_lock(fd):
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
 
 class Runner:
     """Control the default runner.
@@ -109,12 +291,19 @@ class Runner:
         The name or path of the executable ``optirun`` command. Defaults to
         ``optirun``.
 
+    devices : int, iterable, optional
+
+        Devices available for running mumax3. If set, ``autoselect_runner`` returns
+        a ``Mumax3RunnerPool``, which assigns a free device to each run. Defaults to
+        ``None``.
+
     """
 
     def __init__(self):
         self.cache_runner = True
         self.mumax3_exe = "mumax3"
         self.optirun_exe = "optirun"
+        self.devices = None
         self._runner = None
 
     @property
@@ -127,7 +316,7 @@ class Runner:
 
         This property also allows to set a specific ``Mumax3Runner``. Before
         setting, a new runner is first checked to be functional by calling
-        ``runner.status``.
+        ``runner.status``, which uses the cached ``probe`` of the runner.
 
         Examples
         --------
@@ -156,7 +345,8 @@ class Runner:
 
         The method tries to find a suitable runner by checking the availability of
         ``optirun`` and ``mumax3`` in this order. If no runner can be found an
-        ``EnvironmentError`` is raised.
+        ``EnvironmentError`` is raised. If ``devices`` is set, a
+        ``Mumax3RunnerPool`` using these devices is selected.
 
         Raises
         ------
@@ -178,11 +368,13 @@ class Runner:
         """
         log.debug(
             "Starting autoselect_runner: cache_runner=%(cache_runner)s, "
-            "mumax3_exe=%(mumax3_exe)s, optirun_exe=%(optirun_exe)s, ",
+            "mumax3_exe=%(mumax3_exe)s, optirun_exe=%(optirun_exe)s, "
+            "devices=%(devices)s",
             {
                 "cache_runner": self.cache_runner,
                 "mumax3_exe": self.mumax3_exe,
                 "optirun_exe": self.optirun_exe,
+                "devices": self.devices,
             },
         )
 
@@ -203,7 +395,10 @@ class Runner:
         )
         if mumax3_exe:
             cmd.append(self.mumax3_exe)
-            self._runner = ExeMumax3Runner(cmd)
+            if self.devices is None:
+                self._runner = ExeMumax3Runner(cmd)
+            else:
+                self._runner = mc.mumax3.Mumax3RunnerPool(cmd, devices=self.devices)
         else:
             msg = (
                 "Mumax3 cannot be found. Mumax3 does not come automatically with"
@@ -0,0 +1,203 @@
+import collections
+import contextlib
+import logging
+import os
+import pathlib
+import subprocess as sp
+import tempfile
+import threading
+import time
+
+import ubermagutil as uu
+
+from .mumax3 import ExeMumax3Runner, _try_lock, _unlock
+
+log = logging.getLogger("mumax3c")
+
+
+@uu.inherit_docs
+class Mumax3RunnerPool(ExeMumax3Runner):
+    """mumax3 runner distributing runs over multiple devices.
+
+    Every call to mumax3 is assigned a free slot on one of the ``devices``. If all
+    slots are busy, the call waits until a slot becomes available. Slots are
+    protected by lock files in ``lockdir`` so that concurrent processes (e.g.
+    multiple notebooks on the same node) sharing the same ``lockdir`` do not run on
+    the same device at the same time. Locks are released automatically if a process
+    terminates.
+
+    Parameters
+    ----------
+    mumax3_exe : str, list
+
+        Name or path of the mumax3 executable. Defaults to ``mumax3``.
+
+    devices : int, iterable
+
+        Devices to use. An integer ``n`` is interpreted as ``range(n)``. Defaults to
+        ``1``.
+
+    jobs_per_device : int, optional
+
+        Number of concurrent mumax3 runs allowed on each device. Defaults to ``1``.
+
+    method : str, optional
+
+        How the device is passed to mumax3. For ``"flag"`` the device is passed using
+        mumax3's ``-gpu`` flag, for ``"env"`` the environment variable
+        ``CUDA_VISIBLE_DEVICES`` is set for the mumax3 process. Defaults to
+        ``"flag"``.
+
+    lockdir : str, pathlib.Path, optional
+
+        Directory for the lock files. Defaults to ``mumax3c-devices`` in the
+        temporary directory of the system.
+
+    poll_interval : numbers.Real, optional
+
+        Time in seconds between checks for a free slot if all slots are busy.
+        Defaults to ``0.1``.
+
+    Examples
+    --------
+    1. Using two devices.
+
+    >>> import mumax3c as mc
+    ...
+    >>> pool = mc.mumax3.Mumax3RunnerPool(devices=2)
+    >>> pool._call("test.mx3", dry_run=True)
+    'mumax3 test.mx3'
+
+    """
+
+    def __init__(
+        self,
+        mumax3_exe="mumax3",
+        devices=1,
+        jobs_per_device=1,
+        method="flag",
+        lockdir=None,
+        poll_interval=0.1,
+    ):
+        super().__init__(mumax3_exe)
+        if isinstance(devices, int):
+            devices = range(devices)
+        self.devices = list(devices)
+        if not self.devices:
+            raise ValueError("At least one device is required.")
+        if jobs_per_device < 1:
+            raise ValueError(f"Cannot use {jobs_per_device=}.")
+        self.jobs_per_device = jobs_per_device
+        if method not in ("flag", "env"):
+            raise ValueError(f"Invalid {method=}; must be 'flag' or 'env'.")
+        self.method = method
+        if lockdir is None:
+            lockdir = pathlib.Path(tempfile.gettempdir()) / "mumax3c-devices"
+        self.lockdir = pathlib.Path(lockdir)
+        self.poll_interval = poll_interval
+        self._start_time = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._stats = collections.defaultdict(
+            lambda: {"jobs": 0, "busy_time": 0.0, "wait_time": 0.0}
+        )
+
+    @property
+    def slots(self):
+        """All ``(device, slot)`` pairs in the order in which they are assigned."""
+        return [
+            (device, slot)
+            for slot in range(self.jobs_per_device)
+            for device in self.devices
+        ]
+
+    @contextlib.contextmanager
+    def device(self, timeout=None):
+        """Reserve a device slot.
+
+        The context manager waits until a slot is free and yields the device.
+
+        Parameters
+        ----------
+        timeout : numbers.Real, optional
+
+            Maximum time to wait for a free slot in seconds. If ``None``, wait
+            indefinitely. Defaults to ``None``.
+
+        Raises
+        ------
+        TimeoutError
+
+            If no slot became available within ``timeout``.
+
+        """
+        self.lockdir.mkdir(parents=True, exist_ok=True)
+        wait_start = time.monotonic()
+        while True:
+            for device, slot in self.slots:
+                lockfile = self.lockdir / f"device-{device}-slot-{slot}.lock"
+                fd = os.open(lockfile, os.O_RDWR | os.O_CREAT)
+                if _try_lock(fd):
+                    break
+                os.close(fd)
+            else:
+                waited = time.monotonic() - wait_start
+                if timeout is not None and waited > timeout:
+                    raise TimeoutError(
+                        f"No free device slot after {waited:.1f} s; all devices"
+                        f" {self.devices} are busy."
+                    )
+                time.sleep(self.poll_interval)
+                continue
+            break
+
+        busy_start = time.monotonic()
+        log.debug("Acquired slot %s on device %s.", slot, device)
+        try:
+            yield device
+        finally:
+            _unlock(fd)
+            os.close(fd)
+            busy_end = time.monotonic()
+            with self._stats_lock:
+                stats = self._stats[device]
+                stats["jobs"] += 1
+                stats["busy_time"] += busy_end - busy_start
+                stats["wait_time"] += busy_start - wait_start
+            log.debug("Released slot %s on device %s.", slot, device)
+
+    @property
+    def stats(self):
+        """Per-device utilisation statistics of this pool.
+
+        Returns
+        -------
+        dict
+
+            For each device, the number of completed ``jobs``, the total
+            ``busy_time`` and ``wait_time`` in seconds, and the ``utilisation``, i.e.
+            the fraction of time since the creation of the pool that the device has
+            been busy (can exceed 1 for ``jobs_per_device > 1``).
+
+        """
+        elapsed = time.monotonic() - self._start_time
+        with self._stats_lock:
+            return {
+                device: {
+                    **self._stats[device],
+                    "utilisation": self._stats[device]["busy_time"] / elapsed,
+                }
+                for device in self.devices
+            }
+
+    def _call(self, argstr, need_stderr=False, dry_run=False, timeout=None, **kwargs):
+        if dry_run:
+            return super()._call(argstr, need_stderr=need_stderr, dry_run=True)
+        with self.device(timeout=timeout) as device:
+            cmd = list(self.mumax3_exe)
+            env = None
+            if self.method == "flag":
+                cmd += ["-gpu", str(device)]
+            else:
+                env = {**os.environ, "CUDA_VISIBLE_DEVICES": str(device)}
+            cmd.append(argstr)
+            return sp.run(cmd, stdout=sp.PIPE, stderr=sp.PIPE, env=env)
@@ -0,0 +1,174 @@
+import datetime
+import logging
+import threading
+import time
+
+from tqdm.auto import tqdm
+
+import mumax3c as mc
+
+log = logging.getLogger("mumax3c")
+
+
+class ProgressMonitor(threading.Thread):
+    """Live progress of a mumax3 run obtained by tailing its table file.
+
+    The monitor reads the rows appended to the mumax3 ``table.txt`` file every
+    ``interval`` seconds, starting from a saved offset so that no row is read
+    twice. After new rows have been read, ``metrics`` is updated and every callback
+    is called with it. The metrics are:
+
+    - ``rows``: number of table rows written so far,
+    - ``t``: simulated time in seconds,
+    - ``step``: number of solver steps (only if the table contains ``step``),
+    - ``dt``: current time step in seconds,
+    - ``maxtorque``: current maximum torque in T,
+    - ``elapsed``: wall time since the start of the monitor in seconds,
+    - ``rate``: simulated time per wall-second since the previous update,
+    - ``steps_per_second``: solver steps per wall-second since the previous update
+      (only if the table contains ``step``).
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        Name of the table file written by mumax3.
+
+    callbacks : callable, iterable, optional
+
+        Callable or iterable of callables that are called (from the monitor thread)
+        with a copy of ``metrics`` whenever new rows are available. Exceptions
+        raised in callbacks are logged and do not stop the monitor.
+
+    total : int, optional
+
+        Expected number of table rows. Used for the progress bar.
+
+    bar : bool, optional
+
+        If ``True``, a progress bar is displayed. Defaults to ``False``.
+
+    offset : int, optional
+
+        Position in bytes from which reading the table starts. Defaults to ``0``.
+
+    interval : numbers.Real, optional
+
+        Time in seconds between reads of the table. Defaults to ``INTERVAL``.
+
+    desc : str, optional
+
+        Description shown in the progress bar. Defaults to ``"Running mumax3"``.
+
+    Examples
+    --------
+    1. Monitoring a run.
+
+    >>> import mumax3c as mc
+    ...
+    >>> monitor = mc.mumax3.ProgressMonitor("system.out/table.txt", callbacks=print)
+    >>> monitor.start()
+    >>> # run mumax3
+    >>> monitor.terminate()
+    >>> monitor.metrics
+    {}
+
+    """
+
+    INTERVAL = 1
+
+    def __init__(
+        self,
+        filename,
+        callbacks=None,
+        total=None,
+        bar=False,
+        offset=0,
+        interval=None,
+        desc="Running mumax3",
+    ):
+        super().__init__(daemon=True)
+        if callbacks is None:
+            callbacks = []
+        elif callable(callbacks):
+            callbacks = [callbacks]
+        self.callbacks = list(callbacks)
+        self.tail = mc.io.TableTail(filename, offset=offset)
+        self.interval = self.INTERVAL if interval is None else interval
+        self.metrics = {}
+        self.desc = desc
+        self._bar = (
+            tqdm(
+                total=total,
+                desc=desc,
+                bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} rows written [{elapsed}]",
+            )
+            if bar
+            else None
+        )
+        self._terminate = threading.Event()
+        self._start = None
+        self._previous_time = None
+
+    @property
+    def offset(self):
+        """Position in the table file up to which rows have been read."""
+        return self.tail.offset
+
+    def run(self):
+        """Read the table once per interval and close when terminating."""
+        self._start = self._previous_time = time.monotonic()
+        while not self._terminate.wait(self.interval):
+            self.update()
+        self.update()
+        if self._bar is not None:
+            self._bar.close()
+
+    def start(self):
+        self._started_at = datetime.datetime.now()
+        super().start()
+
+    def terminate(self):
+        """Stop the monitor after reading the remaining rows."""
+        self._terminate.set()
+        self.join()
+        if self._bar is not None:
+            print(
+                f"{self.desc}[{self._started_at.isoformat(timespec='seconds')}]"
+                f" took {self.metrics.get('elapsed', 0):0.1f} s"
+            )
+
+    def update(self):
+        """Read new table rows, update ``metrics`` and call the callbacks."""
+        rows = self.tail.read()
+        now = time.monotonic()
+        if self._start is None:
+            self._start = self._previous_time = now
+        if len(rows) == 0:
+            return
+        last = dict(zip(self.tail.columns, rows[-1]))
+        columns = {column.lower(): column for column in self.tail.columns}
+        metrics = {
+            "rows": self.metrics.get("rows", 0) + len(rows),
+            "elapsed": now - self._start,
+        }
+        for name in ["t", "step", "dt", "maxtorque"]:
+            if name in columns:
+                metrics[name] = last[columns[name]]
+
+        wall = now - self._previous_time
+        for name, rate in [("t", "rate"), ("step", "steps_per_second")]:
+            if name in metrics and wall > 0:
+                metrics[rate] = (metrics[name] - self.metrics.get(name, 0)) / wall
+        self._previous_time = now
+        self.metrics = metrics
+
+        if self._bar is not None:
+            self._bar.n = metrics["rows"]
+            self._bar.set_postfix(t=f"{metrics.get('t', 0):.3g} s", refresh=False)
+            self._bar.refresh()
+        for callback in self.callbacks:
+            try:
+                callback(dict(metrics))
+            except Exception:
+                log.exception("Progress callback %s failed.", callback)
@@ -0,0 +1,302 @@
+"""Packing of many small systems into a single mumax3 grid.
+
+Driving many small, independent systems one after the other is dominated by the
+overhead of writing input files and launching mumax3, and small grids use only a
+fraction of a GPU. ``pack`` places the systems as tiles in one large grid, separated
+by vacuum cells (``Ms = 0``, mumax3 region 255), so that all of them are driven in a
+single run. The average magnetisation of every mumax3 region of a tile is added to
+the table of the packed system and, after every drive of the packed system,
+``Packing.unpack`` copies the final magnetisation and the average magnetisation of
+every tile back to the original systems.
+
+"""
+
+import math
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pandas as pd
+import ubermagtable as ut
+
+import mumax3c as mc
+
+
+class Packing:
+    """Systems packed as tiles into a single system.
+
+    Use ``mumax3c.packing.pack`` to create a packing.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        Packed system, which is driven instead of the individual systems.
+
+    systems : list
+
+        Original systems.
+
+    slices : list
+
+        Slices of the tiles of the original systems in the packed mesh.
+
+    """
+
+    def __init__(self, system, systems, slices):
+        self.system = system
+        self.systems = systems
+        self.slices = slices
+        # Drivers unpack the results after every drive of the packed system.
+        system.packing = self
+
+    def __len__(self):
+        return len(self.systems)
+
+    def __repr__(self):
+        return f"Packing(tiles={len(self)}, n={tuple(self.system.m.mesh.n.tolist())})"
+
+    def unpack(self, region_relator, region_ms):
+        """Copy the results of the last drive of the packed system to the systems.
+
+        The magnetisation of every system is set to its tile of the final
+        magnetisation of the packed system. The table of every system contains the
+        average normalised magnetisation ``mx``, ``my`` and ``mz`` of the tile,
+        computed from the averages of its mumax3 regions in the table of the packed
+        system (columns ``m<component>_tile<i>``). Energies are not available per
+        tile.
+
+        Drivers call this method after reading the results of a drive of the packed
+        system.
+
+        Parameters
+        ----------
+        region_relator : dict
+
+            mumax3 regions of every tile.
+
+        region_ms : dict
+
+            Saturation magnetisation of every mumax3 region.
+
+        """
+        packed = self.system
+        x = packed.table.x
+        data = packed.table.data
+        for i, (system, slices) in enumerate(zip(self.systems, self.slices)):
+            norm = system.m.norm
+            tile = f"tile{i}"
+            regions = region_relator[tile]
+            # Regions are weighted by their number of cells.
+            weights = [
+                np.isclose(norm.array, region_ms[region]).sum() for region in regions
+            ]
+            average = pd.DataFrame({x: data[x]})
+            for component in "xyz":
+                if len(regions) == 1:
+                    columns = [f"m{component}_{tile}"]
+                else:
+                    columns = [f"m{component}_{tile}_{region}" for region in regions]
+                average[f"m{component}"] = np.average(
+                    data[columns].to_numpy(), axis=1, weights=weights
+                )
+            system.m.array = packed.m.orientation.array[slices]
+            system.m.norm = norm
+            system.table = ut.Table(
+                average,
+                units={x: packed.table.units[x], "mx": "", "my": "", "mz": ""},
+                x=x,
+            )
+
+
+def _equal(values):
+    return all(np.array_equal(value, values[0]) for value in values[1:])
+
+
+def _combine(terms, tiles):
+    """Combine the terms of all tiles into one term with per-tile parameters."""
+    attributes = {}
+    for attr in terms[0]._allowed_attributes:
+        values = [vars(term)[attr] for term in terms if attr in vars(term)]
+        if not values:
+            continue
+        if len(values) != len(terms):
+            msg = f"Attribute {attr!r} of {terms[0].name} is not set for all systems."
+            raise ValueError(msg)
+        if any(isinstance(value, (dict, df.Field)) for value in values):
+            msg = (
+                "Only spatially uniform parameters can be packed; "
+                f"{terms[0].name}.{attr} is not uniform."
+            )
+            raise ValueError(msg)
+        if _equal(values):
+            attributes[attr] = values[0]
+        else:
+            attributes[attr] = dict(zip(tiles, values))
+            if isinstance(terms[0], mm.Zeeman):
+                attributes[attr]["default"] = (0, 0, 0)  # vacuum
+    return terms[0].__class__(**attributes)
+
+
+def pack(systems, spacing=None, demag=True, name="packed"):
+    """Pack many small systems as tiles into one system.
+
+    The systems are arranged on a two-dimensional grid of tiles in the xy plane,
+    separated by ``spacing`` vacuum cells. All systems must have the same number of
+    cells, the same cell size, the same energy and dynamics terms (the parameter
+    values can differ), the same temperature and no periodic boundary conditions.
+    The shape of the magnetic material can differ between the systems (cells with
+    ``Ms = 0``).
+
+    Parameter values that differ between the systems are set per tile: every tile
+    is a subregion ``tile<i>`` and every combination of tile and saturation
+    magnetisation value becomes one mumax3 region. Since mumax3 supports 256
+    regions (one is reserved for the vacuum), at most 255 tiles with uniform
+    saturation magnetisation can be packed. Only spatially uniform parameters are
+    supported.
+
+    Exchange does not couple the tiles because of the vacuum between them. The
+    demagnetisation field does: the stray field of a tile decays with the third
+    power of the distance, so that with the default spacing of one tile size the
+    coupling is weak but not zero. The spacing should be increased until the
+    results do not change anymore or, if the demagnetisation energy is not
+    relevant, the ``Demag`` term should be removed with ``demag=False``.
+
+    Parameters
+    ----------
+    systems : list
+
+        Systems to be packed.
+
+    spacing : int, optional
+
+        Number of vacuum cells between neighbouring tiles. Defaults to the size of
+        a tile (the larger of the number of cells in x and y) if the systems contain
+        a ``Demag`` term and to ``1`` otherwise.
+
+    demag : bool, optional
+
+        If ``False``, ``Demag`` terms are removed from the packed system. Defaults
+        to ``True``.
+
+    name : str, optional
+
+        Name of the packed system. Defaults to ``"packed"``.
+
+    Returns
+    -------
+    mumax3c.packing.Packing
+
+        Packing with the packed system.
+
+    Raises
+    ------
+    ValueError
+
+        If the systems cannot be packed.
+
+    Examples
+    --------
+    1. Relaxing many small elements with different anisotropies in one run.
+
+    >>> import discretisedfield as df
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(32e-9, 32e-9, 2e-9), n=(32, 32, 1))
+    >>> systems = []
+    >>> for i in range(16):
+    ...     system = mm.System(name=f"element{i}")
+    ...     system.energy = mm.Exchange(A=1e-11) + mm.UniaxialAnisotropy(
+    ...         K=1e4 * (i + 1), u=(0, 0, 1)
+    ...     )
+    ...     system.m = df.Field(mesh, nvdim=3, value=(0, 0.1, 1), norm=8e5)
+    ...     systems.append(system)
+    >>> packing = mc.packing.pack(systems)
+    >>> packing
+    Packing(tiles=16, n=(131, 131, 1))
+    >>> # mc.MinDriver().drive(packing.system)
+    >>> # packing.systems[0].table.data
+
+    """
+    systems = list(systems)
+    if not systems:
+        raise ValueError("Cannot pack without systems.")
+    first = systems[0]
+    mesh = first.m.mesh
+    for system in systems:
+        if system.m.mesh.bc:
+            raise ValueError(
+                "Systems with periodic boundary conditions cannot be packed."
+            )
+        if tuple(system.m.mesh.n) != tuple(mesh.n) or not np.allclose(
+            system.m.mesh.cell, mesh.cell
+        ):
+            raise ValueError(
+                "All systems must have the same number of cells and cell size."
+            )
+        if system.T != first.T:
+            raise ValueError("All systems must have the same temperature.")
+        if repr(system.dynamics) != repr(first.dynamics):
+            raise ValueError("All systems must have the same dynamics.")
+        if [t.__class__ for t in system.energy] != [t.__class__ for t in first.energy]:
+            raise ValueError("All systems must have the same energy terms.")
+
+    has_demag = mm.Demag() in first.energy and demag
+    nx, ny, nz = (int(i) for i in mesh.n)
+    if spacing is None:
+        spacing = max(nx, ny) if has_demag else 1
+    if not isinstance(spacing, int) or spacing < 1:
+        msg = f"Cannot pack with {spacing=}."
+        raise ValueError(msg)
+
+    columns = math.ceil(math.sqrt(len(systems)))
+    rows = math.ceil(len(systems) / columns)
+    n = (columns * (nx + spacing) - spacing, rows * (ny + spacing) - spacing, nz)
+    cell = np.asarray(mesh.cell)
+
+    slices, subregions, tiles = [], {}, []
+    for i in range(len(systems)):
+        x, y = (i % columns) * (nx + spacing), (i // columns) * (ny + spacing)
+        slices.append((slice(x, x + nx), slice(y, y + ny), slice(0, nz)))
+        tiles.append(f"tile{i}")
+        subregions[tiles[-1]] = df.Region(
+            p1=cell * (x, y, 0), p2=cell * (x + nx, y + ny, nz)
+        )
+
+    packed_mesh = df.Mesh(
+        p1=(0, 0, 0), p2=cell * n, cell=mesh.cell, subregions=subregions
+    )
+    array = np.zeros((*n, 3))
+    for system, tile in zip(systems, slices):
+        array[tile] = system.m.array
+
+    regions = 1 + sum(
+        len(
+            mc.scripts.util.unique_with_accuracy(
+                system.m.norm.array[system.m.norm.array > 0]
+            )
+        )
+        for system in systems
+    )
+    if regions > 256:
+        msg = (
+            f"Packing the systems requires {regions} mumax3 regions (one per tile and"
+            " saturation magnetisation value and one for the vacuum), but mumax3"
+            " allows at most 256 regions."
+        )
+        raise ValueError(msg)
+
+    terms = []
+    for i, term in enumerate(first.energy):
+        if isinstance(term, mm.Demag):
+            if has_demag:
+                terms.append(mm.Demag())
+            continue
+        terms.append(_combine([list(system.energy)[i] for system in systems], tiles))
+
+    packed = mm.System(name=name, T=first.T)
+    packed.energy = mm.Energy(terms=terms)
+    packed.dynamics = first.dynamics
+    packed.m = df.Field(packed_mesh, nvdim=3, value=array)
+    return Packing(packed, systems, slices)
@@ -1,4 +1,6 @@
 import numbers
+import pathlib
+import weakref
 
 import discretisedfield as df
 import micromagneticmodel as mm
@@ -7,11 +9,125 @@ import numpy as np
 import mumax3c as mc
 
 
+def time_loop_script(t, n, snapshots=True, indent=""):
+    """Run for time ``t`` saving the table (and magnetisation) ``n`` times."""
+    mx3 = f"for snap_counter:=0; snap_counter<{n}; snap_counter++{{\n"
+    mx3 += f"    run({t / n})\n"
+    if snapshots:
+        mx3 += "    save(m_full)\n"
+    mx3 += "    tablesave()\n"
+    mx3 += "}\n"
+    return "".join(f"{indent}{line}\n" for line in mx3.splitlines())
+
+
+def ensemble_script(driver, system, realizations, seed, snapshots=True, **kwargs):
+    """Run all realizations of an ensemble drive sequentially.
+
+    Every realization starts from the initial magnetisation at ``t = 0`` with its
+    own thermal seed ``seed + realization``. The m_full snapshots are numbered
+    consecutively over all realizations; without snapshots only the final
+    magnetisation of every realization is saved.
+
+    """
+    m0_path = mc.scripts.magnetisation.m0_path(
+        mc.scripts.magnetisation._unchanged_source(system),
+        abspath=kwargs.get("abspath", True),
+    )
+
+    mx3 = "// Ensemble\n"
+    mx3 += f"for realization:=0; realization<{realizations}; realization++{{\n"
+    mx3 += f'    m.LoadFile("{m0_path}")\n'
+    mx3 += "    t = 0\n"
+    mx3 += f"    ThermSeed({seed} + realization)\n"
+    mx3 += time_loop_script(kwargs["t"], kwargs["n"], snapshots, indent="    ")
+    if not snapshots:
+        mx3 += "    save(m_full)\n"
+    mx3 += "}\n\n"
+    return mx3
+
+
+def fmr_script(driver, system, t, n, snapshots=1, excitation=None, **kwargs):
+    """Excite the system and save the table ``n`` times at a fixed interval.
+
+    The magnetisation is saved ``snapshots`` times; the average magnetisation of
+    every mumax3 region belonging to a subregion is added to the table.
+
+    """
+    mx3 = "// FMR\n"
+    if excitation is not None:
+        # mumax3c sets the Zeeman field with B_ext.add, the uniform part is free.
+        H, pulse = driver._excitation(excitation, t, n)
+        B = np.multiply(H, mm.consts.mu0)
+        mx3 += "B_ext = vector({}, {}, {})\n".format(*(f"{b} * {pulse}" for b in B))
+    if getattr(system, "packing", None) is None:  # added by driver_script
+        mx3 += _region_averages(system)
+    mx3 += f"for snapshot:=0; snapshot<{snapshots}; snapshot++{{\n"
+    mx3 += f"    for sample:=0; sample<{n // snapshots}; sample++{{\n"
+    mx3 += f"        run({t / n})\n"
+    mx3 += "        tablesave()\n"
+    mx3 += "    }\n"
+    mx3 += "    save(m_full)\n"
+    mx3 += "}\n\n"
+    return mx3
+
+
+def _region_averages(system):
+    """Add the average magnetisation of every region of a subregion to the table."""
+    mx3 = ""
+    for name, regions in system.region_relator.items():
+        for region in regions if name else []:
+            mx3 += f"tableadd(m.region({region}))\n"
+    return mx3
+
+
 def driver_script(driver, system, compute=None, ovf_format="bin4", **kwargs):
     mx3 = "tableadd(E_total)\n"
     mx3 += "tableadd(dt)\n"
     mx3 += "tableadd(maxtorque)\n"
+    if kwargs.get("progress"):
+        mx3 += 'TableAddVar(step, "step", "")\n'
+    if getattr(system, "packing", None) is not None:
+        # Split into the tables of the tiles by Packing.unpack.
+        mx3 += _region_averages(system)
+
+    if isinstance(driver, mc.PipelineDriver):
+        mx3 += "\n"
+        start = 0  # simulation time at the beginning of the stage
+        for i, (stage, stage_kwargs) in enumerate(driver._stages):
+            mx3 += f"// Stage {i}: {stage.__class__.__name__}\n"
+            if system.T > 0 and not isinstance(stage, mc.TimeDriver):
+                mx3 += "Temp = 0\n"  # set by previous time stages
+            if system.dynamics.get(type=mm.ZhangLi):
+                # Set by previous time stages.
+                mx3 += "J = vector(0, 0, 0)\n"
+                mx3 += "J.RemoveExtraTerms()\n"
+            stage_kwargs = {**kwargs, **stage_kwargs}
+            mx3 += stage_script(
+                stage,
+                system,
+                ovf_format=ovf_format,
+                start=start,
+                **stage_kwargs,
+            )
+            if isinstance(stage, mc.TimeDriver):
+                start += stage_kwargs["t"]
+    else:
+        mx3 += stage_script(driver, system, ovf_format=ovf_format, **kwargs)
+
+    # Solver statistics parsed by mumax3c.io.parse_log after the run.
+    mx3 += 'print("mumax3c: step", step)\n'
+    mx3 += 'print("mumax3c: NEval", NEval)\n'
+
+    return mx3
 
+
+def stage_script(driver, system, ovf_format="bin4", start=0, **kwargs):
+    """Script of a single minimisation, relaxation or time evolution.
+
+    ``start`` is the simulation time at the beginning of the stage.
+
+    """
+    mx3 = ""
     if isinstance(driver, mc.MinDriver):
         for attr, value in driver:
             if attr != "evolver":
@@ -58,56 +174,149 @@ def driver_script(driver, system, compute=None, ovf_format="bin4", **kwargs):
 
         if system.dynamics.get(type=mm.ZhangLi):
             (zh_li_term,) = system.dynamics.get(type=mm.ZhangLi)
-            if isinstance(zh_li_term.u, df.Field) and zh_li_term.u.nvdim == 3:
-                u = zh_li_term.u
-            elif isinstance(zh_li_term.u, df.Field) and zh_li_term.u.nvdim == 1:
-                zero_field = df.Field(
-                    mesh=system.m.mesh,
-                    nvdim=1,
-                    value=0.0,
-                )
-                u = zh_li_term.u << zero_field << zero_field
-            elif isinstance(zh_li_term.u, numbers.Real):
-                u = df.Field(
-                    mesh=system.m.mesh,
-                    nvdim=3,
-                    value=(zh_li_term.u, 0.0, 0.0),
+            with mc.telemetry.phase("zhang_li"):
+                mx3 += zhang_li_script(
+                    zh_li_term,
+                    system,
+                    t=start + kwargs["t"],
+                    ovf_format=ovf_format,
+                    abspath=kwargs.get("abspath", True),
                 )
-            elif isinstance(zh_li_term.u, dict):
-                if isinstance(list(zh_li_term.u.values())[0], numbers.Real):
-                    u_values = {
-                        key: (value, 0.0, 0.0) for key, value in zh_li_term.u.items()
-                    }
-                else:
-                    u_values = zh_li_term.u
-                u = df.Field(
-                    mesh=system.m.mesh,
-                    nvdim=3,
-                    value=u_values,
-                )
-            else:  # array_like
-                u = df.Field(mesh=system.m.mesh, nvdim=3, value=zh_li_term.u)
 
-            mu_B = mm.consts.e * mm.consts.hbar / (2.0 * mm.consts.me)
+        mx3 += mc.evolvers.convert(getattr(driver, "evolver", None))._script()
+        for attr, value in driver:
+            if attr != "evolver":
+                mx3 += f"{attr} = {value}\n"
+        mx3 += "\n"
 
-            j = -np.multiply(
-                u * 2 * (1 + zh_li_term.beta**2) * mm.consts.e / (mm.consts.g * mu_B),
-                system.m.norm,
-            )
-            j.to_file("j.ovf", representation=ovf_format)
-            mx3 += f"Xi = {zh_li_term.beta}\n"
-            mx3 += "Pol = 1\n"  # Current polarization is 1.
-            mx3 += 'J.add(LoadFile("j.ovf"), 1)\n'  # 1 means constant in time.
+        t, n = kwargs["t"], kwargs["n"]
+
+        if isinstance(driver, mc.FMRDriver):
+            mx3 += fmr_script(driver, system, **kwargs)
+        elif isinstance(driver, mc.EnsembleDriver):
+            mx3 += ensemble_script(driver, system, **kwargs)
+        else:
+            mx3 += time_loop_script(t, n)
+            mx3 += "\n"
 
-        mx3 += "setsolver(5)\n"
-        mx3 += "fixDt = 0\n\n"
+    return mx3
 
-        t, n = kwargs["t"], kwargs["n"]
 
-        mx3 += f"for snap_counter:=0; snap_counter<{n}; snap_counter++{{\n"
-        mx3 += f"    run({t / n})\n"
-        mx3 += "    save(m_full)\n"
-        mx3 += "    tablesave()\n"
-        mx3 += "}"
+def zhang_li_script(term, system, t, ovf_format="bin4", abspath=True):
+    """Zhang-Li parameters and the time-dependent current density.
 
+    The current density is ``J(r, t) = j(r) f(t)`` with the time dependence ``f``
+    of ``term.func`` (see ``mumax3c.timedependence.expression``; callables are
+    sampled up to the simulation time ``t``). A uniform or subregion-wise drift
+    velocity ``u`` is set for every mumax3 region without an input file. A field
+    ``u`` is written to ``j.ovf``, which later stages and drives reuse as long as
+    ``u`` and the saturation magnetisation are unchanged (see ``current_file``).
+
+    """
+    attributes = vars(term)  # unset attributes are typesystem descriptors
+    f = mc.timedependence.expression(attributes.get("func"), attributes.get("dt"), t)
+    mx3 = f"Xi = {term.beta}\n"
+    mx3 += "Pol = 1\n"  # Current polarization is 1.
+    if isinstance(term.u, df.Field):
+        j_path = current_file(term, system, ovf_format=ovf_format, abspath=abspath)
+        mx3 += f'J.add(LoadFile("{j_path.as_posix()}"), {f})\n'  # / required
+        return mx3
+
+    u = dict(term.u) if isinstance(term.u, dict) else {"default": term.u}
+    j = {}
+    for name, regions in system.region_relator.items():
+        if (value := u.get(name, u.get("default"))) is not None:
+            for region in regions:
+                j[region] = (
+                    np.multiply(_velocity(value), _current_factor(term))
+                    * system.region_ms[region]
+                    + 0.0  # no negative zeros in the script
+                ).tolist()
+    values = {tuple(value) for value in j.values()}
+    if len(values) == 1 and len(j) == len(system.region_ms):
+        mx3 += "J = vector({}, {}, {})\n".format(
+            *(_times(v, f) for v in j.popitem()[1])
+        )
+    else:
+        for region, value in j.items():
+            mx3 += "J.setregion({}, vector({}, {}, {}))\n".format(
+                region, *(_times(v, f) for v in value)
+            )
     return mx3
+
+
+def _velocity(u):
+    """Drift velocity vector; scalars are in x direction."""
+    return (u, 0.0, 0.0) if isinstance(u, numbers.Real) else u
+
+
+def _current_factor(term):
+    """Current density per drift velocity and saturation magnetisation."""
+    mu_B = mm.consts.e * mm.consts.hbar / (2.0 * mm.consts.me)
+    return -2 * (1 + term.beta**2) * mm.consts.e / (mm.consts.g * mu_B)
+
+
+def _times(value, f):
+    return f"{value}" if f == "1" else f"{value} * ({f})"
+
+
+def zhang_li_current(term, system, ms=None):
+    """Current density of a Zhang-Li term with a drift velocity field ``u``.
+
+    ``ms`` is the saturation magnetisation array (see ``_saturation``) if it has
+    already been computed. The current density is computed in the array of the
+    returned field to avoid full-grid temporaries.
+
+    """
+    u = term.u.array
+    if ms is None:
+        ms = _saturation(system.m)
+    j = df.Field(system.m.mesh, nvdim=3)
+    array = j.array[..., : u.shape[-1]]  # a scalar field is in x direction
+    np.multiply(u, ms, out=array)
+    array *= _current_factor(term)
+    return j
+
+
+def _saturation(m):
+    """Norm of the field ``m`` with a single scalar temporary (``m.norm.array``)."""
+    ms = np.einsum("...i,...i->...", m.array, m.array)[..., np.newaxis]
+    return np.sqrt(ms, out=ms)
+
+
+def current_file(term, system, ovf_format="bin4", abspath=True):
+    """Path of the current density of ``term`` written to ``j.ovf``.
+
+    The file written by a previous stage or drive is reused as long as it exists
+    and ``term.u`` is neither replaced nor modified and the saturation
+    magnetisation is unchanged. Modifications are detected with checksums of the
+    arrays (as for the magnetisation, see
+    ``mumax3c.scripts.magnetisation.track_source``). With ``abspath=False`` only
+    a file in the current directory is reused and the relative path is returned.
+
+    """
+    checksum = mc.scripts.magnetisation._checksum
+    ms = _saturation(system.m)
+    # The norm of the magnetisation read after a drive differs from the saturation
+    # magnetisation in the last bits, so single precision is compared.
+    ms_checksum = checksum(ms.astype(np.float32))
+    source = (id(term.u), term.u.mesh, checksum(term.u.array), ms_checksum, ovf_format)
+    try:
+        *previous, array, j_path = term._current_source
+    except AttributeError:
+        pass
+    else:
+        if (
+            previous == list(source)
+            and array() is term.u.array
+            and j_path.exists()
+            and (abspath or j_path.parent == pathlib.Path.cwd())
+        ):
+            return j_path if abspath else pathlib.Path(j_path.name)
+
+    j_path = pathlib.Path("j.ovf")
+    j = zhang_li_current(term, system, ms=ms)
+    del ms  # not required while writing
+    mc.scripts.util.write_field(j, j_path, ovf_format=ovf_format)
+    term._current_source = (*source, weakref.ref(term.u.array), j_path.absolute())
+    return j_path.absolute() if abspath else j_path
@@ -23,10 +23,10 @@ def energy_script(system, ovf_format, abspath):
 
     if zeeman_terms := system.energy.get(type=mm.Zeeman):
         for term in zeeman_terms:
-            if isinstance(term.H, (tuple, list, dict, np.ndarray)):
-                H_field = df.Field(mesh=system.m.mesh, nvdim=3, value=term.H)
-                mx3 += zeeman_script(mm.Zeeman(H=H_field), system, ovf_format, abspath)
-            else:
+            with mc.telemetry.phase("zeeman"):
+                if isinstance(term.H, (tuple, list, dict, np.ndarray)):
+                    H_field = df.Field(mesh=system.m.mesh, nvdim=3, value=term.H)
+                    term = mm.Zeeman(H=H_field)
                 mx3 += zeeman_script(term, system, ovf_format, abspath)
 
         mx3 += "tableadd(E_Zeeman)\n"
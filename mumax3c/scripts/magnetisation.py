@@ -1,14 +1,83 @@
+import os
 import pathlib
+import weakref
+import zlib
+
+import numpy as np
 
 import mumax3c as mc
 
 
 def magnetisation_script(system, ovf_format="bin4", abspath=True):
-    system.m.orientation.to_file("m0.omf", representation=ovf_format)
-    m0_path = pathlib.Path("m0.omf")
-    if abspath:
-        m0_path = m0_path.absolute().as_posix()  # '/' as path separator required
+    if (source := _unchanged_source(system)) is None:
+        mc.scripts.util.write_field(
+            system.m.orientation, "m0.omf", ovf_format=ovf_format
+        )
+    else:
+        # Continue from the output of the previous drive without writing m0.omf.
+        mc.telemetry.record(m0=str(source))
     mx3 = "// Magnetisation\n"
-    mx3 += f'm.LoadFile("{m0_path}")\n'
-    mx3 += mc.scripts.mumax3_regions(system, ovf_format=ovf_format, abspath=abspath)
+    mx3 += f'm.LoadFile("{m0_path(source, abspath)}")\n'
+    with mc.telemetry.phase("regions"):
+        mx3 += mc.scripts.mumax3_regions(system, ovf_format=ovf_format, abspath=abspath)
     return mx3
+
+
+def m0_path(source=None, abspath=True):
+    """Path of the initial magnetisation in the mx3 file.
+
+    ``source`` is the output file of the previous drive if ``system.m`` is
+    unchanged since it was read (see ``track_source``) and ``None`` if the
+    magnetisation is written to ``m0.omf``. An mx3 file loading the output of a
+    previous drive depends on the directory of that drive: it cannot be run
+    anymore once the directory is deleted or, with ``abspath=False``, moved.
+    Relative paths are relative to the current working directory.
+
+    """
+    path = pathlib.Path("m0.omf") if source is None else source
+    path = path.absolute() if abspath else pathlib.Path(os.path.relpath(path))
+    return path.as_posix()  # '/' as path separator required
+
+
+def _checksum(array):
+    return zlib.crc32(np.ascontiguousarray(array).data)
+
+
+def track_source(system, filename):
+    """Remember that ``system.m`` is the magnetisation in ``filename``.
+
+    As long as ``system.m`` is not replaced or modified, the next drive loads the
+    magnetisation directly from ``filename`` instead of normalising ``system.m``
+    and writing it to ``m0.omf``. Modifications are detected with a checksum of
+    the magnetisation array.
+
+    """
+    system._m_source = (
+        id(system.m),
+        weakref.ref(system.m.array),
+        system.m.mesh,
+        _checksum(system.m.array),
+        pathlib.Path(filename).absolute(),
+    )
+
+
+def untrack_source(system):
+    """Write ``system.m`` to ``m0.omf`` in the next drive (see ``track_source``)."""
+    vars(system).pop("_m_source", None)
+
+
+def _unchanged_source(system):
+    """File containing ``system.m`` if it is unchanged since it was read."""
+    try:
+        field_id, array, mesh, checksum, filename = system._m_source
+    except AttributeError:
+        return None
+    if (
+        field_id != id(system.m)
+        or array() is not system.m.array
+        or mesh != system.m.mesh
+        or not filename.exists()
+        or checksum != _checksum(system.m.array)
+    ):
+        return None
+    return filename
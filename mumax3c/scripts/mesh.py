@@ -1,16 +1,214 @@
-# import mumax3c as mc
+import contextlib
+import warnings
+
+import discretisedfield as df
+import numpy as np
+
+import mumax3c as mc
+
+
+def pbc_repetitions(mesh):
+    """Number of periodic images in x, y and z passed to mumax3's ``SetPBC``."""
+    # should be generalised in the future
+    # Need to figure out the way of setting up the repetitions.
+    return tuple(int(dim in mesh.bc) for dim in "xyz")
 
 
 def mesh_script(system):
     mx3 = "// Mesh\n"
     if any(i in system.m.mesh.bc for i in "xyz"):  # are there PBC?
-        repetitions = [0, 0, 0]  # should be generalised in the future
-        for direction in system.m.mesh.bc:
-            # Need to figure out the way of setting up the repetitions.
-            repetitions[system.m.mesh.region._dim2index(direction)] = 1
+        repetitions = pbc_repetitions(system.m.mesh)
         mx3 += "SetPBC({}, {}, {})\n".format(*repetitions)
     mx3 += "SetGridSize({}, {}, {})\n".format(*system.m.mesh.n)
     mx3 += "SetCellSize({}, {}, {})\n\n".format(*system.m.mesh.cell)
     # mx3 += mc.scripts.set_subregions(system)
 
     return mx3
+
+
+def fft_friendly(n, primes=(2, 3, 5, 7)):
+    """Smallest number of cells ``>= n`` without prime factors other than ``primes``.
+
+    The FFTs of the demagnetisation convolution in mumax3 are fastest for grid sizes
+    with small prime factors.
+
+    Examples
+    --------
+    >>> import mumax3c as mc
+    ...
+    >>> mc.scripts.mesh.fft_friendly(97)
+    98
+    >>> mc.scripts.mesh.fft_friendly(128)
+    128
+
+    """
+    while True:
+        remainder = n
+        for prime in primes:
+            while remainder % prime == 0:
+                remainder //= prime
+        if remainder == 1:
+            return n
+        n += 1
+
+
+class MeshMapping:
+    """Mapping between the mesh of a system and the optimised mesh driven by mumax3.
+
+    The cells ``slices`` of the original mesh are the first cells of the optimised
+    mesh, the remaining cells of the optimised mesh are vacuum. Use
+    ``optimise_mesh`` to create the mapping.
+
+    """
+
+    def __init__(self, mesh, optimised, slices):
+        self.mesh = mesh
+        self.optimised = optimised
+        self.slices = slices
+
+    def __repr__(self):
+        n = tuple(self.mesh.n.tolist())
+        return f"MeshMapping(n={n}, optimised_n={tuple(self.optimised.n.tolist())})"
+
+    @property
+    def _kept(self):
+        """Slices of the optimised mesh containing the cells of the original mesh."""
+        return tuple(slice(0, s.stop - s.start) for s in self.slices)
+
+    def to_optimised(self, field):
+        """Crop and pad ``field`` to the optimised mesh; padded cells are zero."""
+        array = np.zeros((*self.optimised.n, field.nvdim), dtype=field.array.dtype)
+        array[self._kept] = field.array[self.slices]
+        return df.Field(
+            self.optimised, nvdim=field.nvdim, value=array, dtype=array.dtype
+        )
+
+    def to_original(self, field):
+        """Map ``field`` back to the original mesh; cropped cells are zero."""
+        array = np.zeros((*self.mesh.n, field.nvdim), dtype=field.array.dtype)
+        array[self.slices] = field.array[self._kept]
+        return df.Field(self.mesh, nvdim=field.nvdim, value=array, dtype=array.dtype)
+
+    def to_original_table(self, table):
+        """Rescale the average magnetisation in ``table`` to the original mesh.
+
+        mumax3 averages the magnetisation over all cells, including vacuum cells in
+        which it is zero. The averages are therefore rescaled with the ratio of the
+        number of cells in both meshes.
+
+        """
+        factor = np.prod(self.optimised.n) / np.prod(self.mesh.n)
+        for column in ["mx", "my", "mz"]:
+            if column in table.data.columns:
+                table.data[column] *= factor
+        return table
+
+
+def optimise_mesh(system, primes=(2, 3, 5, 7)):
+    """Crop vacuum margins and pad the mesh of a system to FFT-friendly sizes.
+
+    In directions without periodic boundary conditions, all-vacuum (``Ms=0``)
+    margins of the mesh are cropped and the number of cells is increased to the next
+    number without prime factors other than ``primes`` (see ``fft_friendly``) by
+    appending vacuum cells. Cells in subregions are never cropped. Periodic
+    directions cannot be changed without changing the simulated system; a warning
+    recommends a better number of cells instead.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        System to optimise.
+
+    primes : tuple, optional
+
+        Allowed prime factors of the number of cells. Defaults to ``(2, 3, 5, 7)``.
+
+    Returns
+    -------
+    mumax3c.scripts.mesh.MeshMapping
+
+        Mapping between the original and the optimised mesh.
+
+    Examples
+    --------
+    1. Cropping and padding a mesh.
+
+    >>> import discretisedfield as df
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(101e-9, 40e-9, 1e-9), cell=(1e-9, 1e-9, 1e-9))
+    >>> system = mm.System(name="system")
+    >>> system.m = df.Field(
+    ...     mesh, nvdim=3, value=(0, 0, 1), norm=lambda p: 8e5 if p[0] > 4e-9 else 0
+    ... )
+    >>> mc.scripts.mesh.optimise_mesh(system)
+    MeshMapping(n=(101, 40, 1), optimised_n=(98, 40, 1))
+
+    """
+    mesh = system.m.mesh
+    magnetic = system.m.norm.array[..., 0] != 0
+    for region in mesh.subregions.values():
+        magnetic[mesh.region2slices(region)] = True
+
+    slices, n = [], []
+    for axis, dim in enumerate(mesh.region.dims):
+        cells = int(mesh.n[axis])
+        if dim in mesh.bc:
+            if (friendly := fft_friendly(cells, primes)) != cells:
+                warnings.warn(
+                    f"The {cells} cells in the periodic direction {dim} have large"
+                    " prime factors, which slows down the demagnetisation"
+                    f" calculation. Consider using {friendly} cells.",
+                    stacklevel=2,
+                )
+            slices.append(slice(0, cells))
+            n.append(cells)
+            continue
+        other = tuple(i for i in range(magnetic.ndim) if i != axis)
+        (indices,) = np.nonzero(np.any(magnetic, axis=other))
+        start, stop = (indices[0], indices[-1] + 1) if len(indices) else (0, cells)
+        slices.append(slice(int(start), int(stop)))
+        n.append(fft_friendly(int(stop - start), primes))
+
+    pmin = mesh.region.pmin + mesh.cell * [s.start for s in slices]
+    optimised = df.Mesh(
+        p1=pmin,
+        p2=pmin + mesh.cell * n,
+        n=n,
+        bc=mesh.bc,
+        subregions=mesh.subregions,
+    )
+    mc.telemetry.record(optimised_mesh_n=n)
+    return MeshMapping(mesh, optimised, tuple(slices))
+
+
+@contextlib.contextmanager
+def optimised_system(system, mapping):
+    """Temporarily replace all fields of ``system`` with fields on the optimised mesh.
+
+    The magnetisation and all field-valued parameters of energy and dynamics terms
+    are mapped with ``mapping`` and restored on exit. With ``mapping=None`` the
+    system is not modified.
+
+    """
+    if mapping is None:
+        yield system
+        return
+    m = system.m
+    parameters = [
+        (term, name, value)
+        for term in [*system.energy, *system.dynamics]
+        for name, value in vars(term).items()
+        if isinstance(value, df.Field)
+    ]
+    try:
+        system.m = mapping.to_optimised(m)
+        for term, name, value in parameters:
+            setattr(term, name, mapping.to_optimised(value))
+        yield system
+    finally:
+        system.m = m
+        for term, name, value in parameters:
+            setattr(term, name, value)
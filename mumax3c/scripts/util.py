@@ -1,10 +1,133 @@
+import concurrent.futures
 import contextlib
+import contextvars
+import fnmatch
 import itertools
 import numbers
 import pathlib
 
 import discretisedfield as df
 import numpy as np
+import scipy.ndimage
+
+import mumax3c as mc
+
+_writer = contextvars.ContextVar("writer", default=None)
+
+
+def write_field(field, filename, ovf_format="bin4"):
+    """Write an input field to an OVF file and record it in the drive telemetry.
+
+    Inside ``concurrent_writes`` the file is written in a worker thread and this
+    function returns immediately.
+
+    """
+    if (writer := _writer.get()) is not None:
+        writer.submit(field, filename, ovf_format)
+        return
+    _write_field(field, filename, ovf_format)
+    mc.telemetry.written(filename)
+
+
+def _write_field(field, filename, ovf_format):
+    with mc.telemetry.phase("write_ovf"):
+        field.to_file(str(filename), representation=ovf_format)
+
+
+class _ConcurrentWriter:
+    """Thread pool writing input fields while the script is generated."""
+
+    def __init__(self, max_workers):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mumax3c-writer"
+        )
+        self._writes = []  # (filename, future)
+
+    def submit(self, field, filename, ovf_format):
+        # Absolute path: the working directory can change before the write.
+        path = pathlib.Path(filename).absolute()
+        # Every write runs in a copy of the current context, so that it records
+        # to the active telemetry.
+        context = contextvars.copy_context()
+        future = self._executor.submit(
+            context.run, _write_field, field, path, ovf_format
+        )
+        self._writes.append((filename, future))
+
+    def filenames(self, pattern):
+        """Names of the files being written that match ``pattern``."""
+        return {
+            pathlib.Path(filename).name
+            for filename, _ in self._writes
+            if fnmatch.fnmatch(pathlib.Path(filename).name, pattern)
+        }
+
+    def join(self, cancel=False):
+        """Wait for all writes and raise the first error, if any."""
+        with mc.telemetry.phase("write_wait"):
+            self._executor.shutdown(wait=True, cancel_futures=cancel)
+        if cancel:
+            return
+        for _, future in self._writes:
+            future.result()
+        for filename, _ in self._writes:
+            mc.telemetry.written(filename)
+
+
+@contextlib.contextmanager
+def concurrent_writes(max_workers=4):
+    """Write input fields concurrently inside the context.
+
+    Inside the context, ``write_field`` submits the writes to a pool of
+    ``max_workers`` threads, so that the script is generated while the files are
+    written. When leaving the context, all writes are joined and the first error
+    of a write is raised. If the context is left with an exception, pending writes
+    are cancelled. With ``max_workers=0`` the files are written sequentially.
+
+    Examples
+    --------
+    1. Writing two fields concurrently.
+
+    >>> import os
+    >>> import tempfile
+    >>> import discretisedfield as df
+    >>> import mumax3c as mc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 2e-9), n=(2, 2, 2))
+    >>> field = df.Field(mesh, nvdim=3, value=(0, 0, 1))
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     with mc.scripts.util.concurrent_writes():
+    ...         for name in ["a.ovf", "b.ovf"]:
+    ...             mc.scripts.util.write_field(field, os.path.join(tmpdir, name))
+    ...     sorted(os.listdir(tmpdir))
+    ['a.ovf', 'b.ovf']
+
+    """
+    if not max_workers:
+        yield
+        return
+    writer = _ConcurrentWriter(max_workers)
+    token = _writer.set(writer)
+    try:
+        yield
+    except BaseException:
+        writer.join(cancel=True)
+        raise
+    finally:
+        _writer.reset(token)
+    writer.join()
+
+
+def _input_files(pattern):
+    """Names of the input files in the working directory matching ``pattern``.
+
+    Includes the files that are still being written inside ``concurrent_writes``.
+
+    """
+    names = {path.name for path in pathlib.Path(".").glob(pattern)}
+    if (writer := _writer.get()) is not None:
+        names |= writer.filenames(pattern)
+    return sorted(names)
 
 
 def _identify_subregions(system):
@@ -20,13 +143,17 @@ def _identify_subregions(system):
     return subregion_indices, subregion_dict
 
 
-def mumax3_regions(system, ovf_format="bin4", abspath=True):
+def mumax3_regions(system, ovf_format="bin4", abspath=True, shapes=True):
     """Convert ubermag subregions and changing Ms values into mumax3 regions.
 
     In this method, 'region' refers to mumax3, 'subregion refers to ubermag.
 
-    If ``abspath=True`` use an absolute path for the regions omf file otherwise just the
-    filename.
+    If ``shapes=True`` and all regions but one are boxes, the regions are defined with
+    ``DefRegion`` and mumax3 shapes (see ``region_shapes``). Otherwise, the regions
+    are written to an omf file. If ``abspath=True`` use an absolute path for the
+    regions omf file otherwise just the filename. The mumax3 regions of every
+    subregion and their Ms values are stored in ``system.region_relator`` and
+    ``system.region_ms``.
 
     """
     mx3 = ""
@@ -47,6 +174,7 @@ def mumax3_regions(system, ovf_format="bin4", abspath=True):
     region_relator = dict.fromkeys(sr_dict.values())
     for key in region_relator:
         region_relator[key] = []
+    region_ms = {}
     unique_index = -1
 
     for sr_index, sr_name in sr_dict.items():
@@ -59,6 +187,7 @@ def mumax3_regions(system, ovf_format="bin4", abspath=True):
                 unique_index
             )
             region_relator[sr_name].append(unique_index)
+            region_ms[unique_index] = float(ms)
 
     if unique_index > max_index:
         raise ValueError(
@@ -70,17 +199,68 @@ def mumax3_regions(system, ovf_format="bin4", abspath=True):
             f" {unique_index} mumax3 regions."
         )
 
+    system.region_relator = region_relator
+    system.region_ms = region_ms
+    # The vacuum region 255 is counted as well.
+    mc.telemetry.record(regions=unique_index + 1 + int(max_index == 254))
+    if shapes:
+        definitions = region_shapes(region_indices, system.m.mesh.cell)
+        if definitions is not None:
+            return mx3 + f"\n{definitions}\n"
     region_path = pathlib.Path("mumax3_regions.omf")
-    df.Field(system.m.mesh, nvdim=1, value=region_indices).to_file(
-        str(region_path), representation=ovf_format
+    write_field(
+        df.Field(system.m.mesh, nvdim=1, value=region_indices),
+        region_path,
+        ovf_format=ovf_format,
     )
-    system.region_relator = region_relator
     if abspath:
         region_path = region_path.absolute().as_posix()  # / as path separator required
     mx3 += f'\nregions.LoadFile("{region_path}")\n\n'
     return mx3
 
 
+def region_shapes(region_indices, cell):
+    """Define mumax3 regions with ``DefRegion`` and cuboids where possible.
+
+    Every region except for at most one, the background, has to consist of all cells
+    in a box. The background, or the largest box if all regions are boxes, is assigned
+    to the whole simulation with ``universe()`` and the other regions are defined with
+    translated cuboids in the mumax3 coordinate system, which is centred on the
+    simulation. The cuboids do not overlap, so that the order of the definitions does
+    not matter. Returns ``None`` if the regions cannot be defined this way.
+
+    """
+    indices = np.asarray(region_indices).reshape(np.shape(region_indices)[:3])
+    indices = indices.astype(int)
+    # Slices of the bounding box for each region index (shifted by one for index 0).
+    objects = scipy.ndimage.find_objects(indices + 1)
+    boxes, background = {}, []
+    for index in np.unique(indices).tolist():
+        slices = objects[index]
+        if np.all(indices[slices] == index):
+            boxes[index] = slices
+        else:
+            background.append(index)
+    if len(background) > 1:
+        return None
+    if not background:
+        background.append(max(boxes, key=lambda i: indices[boxes[i]].size))
+    background = background[0]
+    boxes.pop(background, None)
+
+    # DefRegion(0, ...) is not required because 0 is the default region in mumax3.
+    mx3 = f"DefRegion({background}, universe())\n" if background != 0 else ""
+    for index, slices in boxes.items():
+        size, centre = [], []
+        for s, c, n in zip(slices, cell, indices.shape):
+            size.append((s.stop - s.start) * c)
+            centre.append((s.start + s.stop - n) * c / 2)
+        mx3 += "DefRegion({}, cuboid({}, {}, {}).transl({}, {}, {}))\n".format(
+            index, *size, *centre
+        )
+    return mx3
+
+
 def unique_with_accuracy(array, accuracy=14):
     """Find unique float values with accuracy post-decimal digits.
 
@@ -139,16 +319,16 @@ def set_parameter(parameter, name, system, ovf_format="bin4", abspath=True):
                         )
 
     elif isinstance(parameter, df.Field) and name == "B_ext":
-        if file_list := list(pathlib.Path(".").glob("B_ext*.ovf")):
+        if file_list := _input_files("B_ext*.ovf"):
             num_ovf = len(file_list)
             b_ext_path = pathlib.Path(f"B_ext_{num_ovf}.ovf")
-            parameter.to_file(b_ext_path, representation=ovf_format)
+            write_field(parameter, b_ext_path, ovf_format=ovf_format)
             if abspath:
                 b_ext_path = b_ext_path.absolute().as_posix()  # / as separator required
             mx3 += f'B_ext.add(LoadFile("{b_ext_path}"), 1)\n'
         else:
             b_ext_path = pathlib.Path("B_ext.ovf")
-            parameter.to_file("B_ext.ovf", representation=ovf_format)
+            write_field(parameter, b_ext_path, ovf_format=ovf_format)
             if abspath:
                 b_ext_path = b_ext_path.absolute().as_posix()  # / as separator required
             mx3 += f'B_ext.add(LoadFile("{b_ext_path}"), 1)\n'  # 1: constant in time
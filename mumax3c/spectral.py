@@ -0,0 +1,316 @@
+"""Streaming spectral analysis of time drives.
+
+Ferromagnetic resonance and ringdown simulations produce long series of
+magnetisation snapshots. The analysis in this module consumes the snapshots one at
+a time, so that the memory required is bounded by the size of the grid (times the
+number of selected frequencies) instead of the length of the time series.
+
+"""
+
+import pathlib
+import re
+
+import discretisedfield as df
+import numpy as np
+import pandas as pd
+
+import mumax3c as mc
+
+# Tables and file names store times with a limited number of significant digits
+# (mumax3 writes single precision), so the times are only required to lie on the
+# equidistant grid within a fraction of the interval plus the print precision.
+_interval_rtol = 1e-3
+_print_rtol = 1e-6
+
+
+def _interval(times):
+    """Sampling interval of (up to print precision) equidistant times."""
+    times = np.asarray(times, dtype=float)
+    if len(times) < 2:
+        raise ValueError("At least two samples are required.")
+    interval = (times[-1] - times[0]) / (len(times) - 1)
+    grid = times[0] + interval * np.arange(len(times))
+    tolerance = _interval_rtol * abs(interval) + _print_rtol * np.abs(times).max()
+    if interval <= 0 or np.abs(times - grid).max() > tolerance:
+        raise ValueError("The samples are not equidistant in time.")
+    return float(interval)
+
+
+def _spectrum(values, times, columns):
+    """Single-sided amplitude spectrum of the columns of ``values``."""
+    values = np.asarray(values).reshape(len(times), -1)
+    values = values - values.mean(axis=0)
+    amplitudes = 2 * np.abs(np.fft.rfft(values, axis=0)) / len(times)
+    return pd.DataFrame(
+        amplitudes,
+        columns=columns,
+        index=pd.Index(np.fft.rfftfreq(len(times), _interval(times)), name="f"),
+    )
+
+
+class SpectralAnalysis:
+    """Spectral analysis accumulating snapshots one at a time.
+
+    For every added snapshot, the magnetisation is averaged over every region and
+    stored (three numbers per region and snapshot), and its discrete Fourier
+    transform at the selected ``frequencies`` is accumulated for every cell. The
+    mean over time (e.g. the equilibrium magnetisation) is removed from the
+    spectra and mode maps. No window is applied and the snapshots have to be
+    equidistant in time.
+
+    Parameters
+    ----------
+    mesh : discretisedfield.Mesh
+
+        Mesh of the snapshots.
+
+    frequencies : array_like, optional
+
+        Frequencies in Hz at which the mode maps (Fourier amplitudes of every
+        cell) are computed. Each frequency requires memory for one complex vector
+        field. Defaults to no mode maps.
+
+    regions : dict, optional
+
+        Regions (``discretisedfield.Region``) over which the magnetisation is
+        averaged. Defaults to the whole mesh (``"total"``) and all subregions of
+        ``mesh``.
+
+    Examples
+    --------
+    1. Spectrum of a precessing macrospin.
+
+    >>> import discretisedfield as df
+    >>> import numpy as np
+    >>> import mumax3c as mc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 2e-9), n=(2, 2, 2))
+    >>> analysis = mc.spectral.SpectralAnalysis(mesh, frequencies=[5e9])
+    >>> for t in np.arange(200) * 1e-11:
+    ...     value = (0.1 * np.cos(2 * np.pi * 5e9 * t), 0, 1)
+    ...     analysis.add(t, df.Field(mesh, nvdim=3, value=value))
+    >>> spectrum = analysis.spectrum()
+    >>> print(f"{spectrum['mx'].idxmax():.3g} Hz")
+    5e+09 Hz
+    >>> round(float(analysis.modes[5e9].abs.array.max()), 3)
+    0.1
+
+    """
+
+    def __init__(self, mesh, frequencies=(), regions=None):
+        self.mesh = mesh
+        self.frequencies = np.asarray(frequencies, dtype=float).reshape(-1)
+        if regions is None:
+            regions = {"total": mesh.region, **mesh.subregions}
+        self.regions = regions
+        self._masks = None
+        self._times = []
+        self._averages = []
+        self._sum = np.zeros((*mesh.n, 3))
+        self._phases = np.zeros(len(self.frequencies), dtype=np.complex128)
+        self._modes = np.zeros((len(self.frequencies), *mesh.n, 3), dtype=np.complex128)
+
+    def __len__(self):
+        return len(self._times)
+
+    def __repr__(self):
+        return (
+            f"SpectralAnalysis(snapshots={len(self)}, regions={list(self.regions)},"
+            f" frequencies={self.frequencies.tolist()})"
+        )
+
+    def _setup(self, array):
+        # Regions are averaged over magnetic cells only (vacuum cells are zero).
+        magnetic = np.linalg.norm(array, axis=-1) > 0
+        self._masks = {}
+        for name, region in self.regions.items():
+            mask = np.zeros(magnetic.shape, dtype=bool)
+            mask[self.mesh.region2slices(region)] = True
+            self._masks[name] = mask & magnetic
+
+    def add(self, t, m):
+        """Add the snapshot ``m`` (field or array) at time ``t``."""
+        array = np.asarray(getattr(m, "array", m))
+        if array.shape != (*self.mesh.n, 3):
+            msg = f"Cannot add a snapshot with shape {array.shape} to {self!r}."
+            raise ValueError(msg)
+        if self._masks is None:
+            self._setup(array)
+        self._averages.append(
+            [
+                array[mask].mean(axis=0) if mask.any() else np.zeros(3)
+                for mask in self._masks.values()
+            ]
+        )
+        self._sum += array
+        phases = np.exp(-2j * np.pi * self.frequencies * t)
+        self._phases += phases
+        for modes, phase in zip(self._modes, phases):
+            modes += phase * array
+        self._times.append(t)
+
+    @property
+    def dt(self):
+        """Sampling interval in seconds."""
+        return _interval(self._times)
+
+    def spectrum(self):
+        """Single-sided amplitude spectrum of the region-averaged magnetisation.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+            Amplitude of ``mx``, ``my`` and ``mz`` for every region (columns
+            ``<component>`` for ``"total"`` and ``<component>_<region>``
+            otherwise) at the frequencies (index ``f`` in Hz) of the discrete
+            Fourier transform.
+
+        """
+        columns = [
+            f"m{component}" if name == "total" else f"m{component}_{name}"
+            for name in self._masks
+            for component in "xyz"
+        ]
+        return _spectrum(self._averages, self._times, columns)
+
+    @property
+    def modes(self):
+        """Complex Fourier amplitudes of every cell at the selected frequencies.
+
+        Dictionary mapping every frequency to a complex vector field with the
+        (single-sided) amplitude of the magnetisation in every cell; use ``.abs``
+        and ``.phase`` for the amplitude and phase maps.
+
+        """
+        mean = self._sum / len(self)
+        return {
+            frequency: df.Field(
+                self.mesh, nvdim=3, value=2 * (modes - phase * mean) / len(self)
+            )
+            for frequency, modes, phase in zip(
+                self.frequencies.tolist(), self._modes, self._phases
+            )
+        }
+
+
+def analyse(
+    dirname=".",
+    frequencies=(),
+    regions=None,
+    times=None,
+    precision="float32",
+):
+    """Analyse the magnetisation snapshots of a time drive.
+
+    The snapshots are read and added to a ``SpectralAnalysis`` one at a time. The
+    time of every snapshot is taken from the table (snapshot ``i`` belongs to row
+    ``i``, as written by ``TimeDriver``).
+
+    Parameters
+    ----------
+    dirname : str, pathlib.Path, optional
+
+        Drive directory or mumax3 output directory. Defaults to the current
+        working directory.
+
+    times : array_like, optional
+
+        Times of the snapshots, if they do not correspond to the rows of the table.
+
+    precision : str, optional
+
+        Floating-point precision in which the snapshots are read. Defaults to
+        ``"float32"``.
+
+    frequencies, regions
+
+        See ``SpectralAnalysis``.
+
+    Returns
+    -------
+    mumax3c.spectral.SpectralAnalysis
+
+        Analysis of all snapshots.
+
+    Examples
+    --------
+    1. Mode maps of a ringdown.
+
+    >>> import mumax3c as mc
+    ...
+    >>> # analysis = mc.spectral.analyse("system/drive-0", frequencies=[8e9, 1.2e10])
+    >>> # analysis.spectrum()
+    >>> # analysis.modes[8e9].abs
+
+    """
+    dirname = pathlib.Path(dirname)
+    outdir = dirname if dirname.suffix == ".out" else next(dirname.glob("*.out"), None)
+    if outdir is None:
+        msg = f"No mumax3 output directory in {str(dirname)!r}."
+        raise FileNotFoundError(msg)
+    files = mc.io.snapshots(outdir)
+    if times is None:
+        table = mc.io.TableReader(outdir / "table.txt").read(columns=["t"])
+        times = table.data["t"].to_numpy()[: len(files)]
+    if len(times) != len(files):
+        msg = f"Found {len(files)} snapshots but {len(times)} times."
+        raise ValueError(msg)
+
+    analysis = None
+    for t, filename in zip(times, files):
+        field = mc.io.read_field(filename, precision=precision)
+        if analysis is None:
+            analysis = SpectralAnalysis(field.mesh, frequencies, regions=regions)
+        analysis.add(t, field)
+        mc.telemetry.read(filename)
+    return analysis
+
+
+def table_spectrum(table, columns=None):
+    """Single-sided amplitude spectrum of the columns of a table.
+
+    The rows of the table have to be equidistant in the independent variable
+    (e.g. the table of ``FMRDriver``) and the mean is removed from every column.
+
+    Parameters
+    ----------
+    table : ubermagtable.Table
+
+        Table with equidistant rows.
+
+    columns : list, optional
+
+        Columns to transform. Defaults to all magnetisation columns (``mx``,
+        ``my``, ``mz`` and the region columns ``m<component>_<region>``).
+
+    Returns
+    -------
+    pandas.DataFrame
+
+        Amplitudes of the columns at the frequencies (index ``f`` in Hz) of the
+        discrete Fourier transform.
+
+    Examples
+    --------
+    1. Spectrum of a table.
+
+    >>> import numpy as np
+    >>> import pandas as pd
+    >>> import ubermagtable as ut
+    >>> import mumax3c as mc
+    ...
+    >>> t = np.arange(100) * 1e-11
+    >>> data = pd.DataFrame({"t": t, "mx": np.sin(2 * np.pi * 1e10 * t), "E": t})
+    >>> table = ut.Table(data, units={"t": "s", "mx": "", "E": "J"}, x="t")
+    >>> spectrum = mc.spectral.table_spectrum(table)
+    >>> list(spectrum.columns)
+    ['mx']
+    >>> print(f"{spectrum['mx'].idxmax():.3g} Hz")
+    1e+10 Hz
+
+    """
+    data = table.data
+    if columns is None:
+        columns = [c for c in data.columns if re.fullmatch(r"m[xyz](_.+)?", c)]
+    return _spectrum(data[columns].to_numpy(), data[table.x].to_numpy(), columns)
@@ -0,0 +1,279 @@
+"""Per-drive telemetry.
+
+During a drive, mumax3c records how long the individual phases take, which files
+are written and read, the size of the mesh, the number of mumax3 regions, and the
+exit status of mumax3. The data is written to ``telemetry.json`` in the drive
+directory and can be aggregated over many drives and systems with ``collect``.
+Optionally, the peak memory allocated by Python in every phase is recorded as well
+(see ``track_memory``).
+
+"""
+
+import contextlib
+import contextvars
+import json
+import pathlib
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FILENAME = "telemetry.json"
+
+_current = contextvars.ContextVar("telemetry", default=None)
+
+
+class Telemetry:
+    """Telemetry of a single drive.
+
+    Phases are timed with ``phase``; timing the same phase multiple times adds up
+    the durations. With ``memory=True``, the memory allocated by Python (including
+    numpy arrays) is traced with ``tracemalloc`` while phases are running, and for
+    every phase the peak and the net allocated memory relative to the start of
+    the phase and the maximum resident set size of the process so far are stored
+    in bytes in ``memory``. Tracing slows down allocations, so it is disabled by
+    default. Additional scalar data is stored with ``record``. Functions in
+    this module (``phase``, ``record``, ``written``, ``read``) record to the
+    telemetry that is currently active (see ``activate``) and do nothing if there
+    is none. Phases can run concurrently in several threads (e.g. ``write_ovf``
+    while writing input files concurrently); their durations add up and the
+    traced memory includes the allocations of all threads.
+
+    Examples
+    --------
+    1. Recording telemetry.
+
+    >>> import mumax3c as mc
+    ...
+    >>> telemetry = mc.telemetry.Telemetry()
+    >>> with telemetry.activate(), mc.telemetry.phase("script"):
+    ...     mc.telemetry.record(cells=8)
+    >>> telemetry.data
+    {'cells': 8}
+    >>> list(telemetry.phases)
+    ['script']
+
+    """
+
+    def __init__(self, memory=False):
+        self.phases = {}
+        self.data = {}
+        self.files_written = {}
+        self.files_read = {}
+        self.memory = {} if memory else None
+        self._open_phases = []  # [name, memory at start, peak] of running phases
+        self._tracing = False
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this telemetry the current one inside the context."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the code inside the context as phase ``name``."""
+        if self.memory is not None:
+            with self._lock:
+                open_phase = self._start_memory(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + duration
+                if self.memory is not None:
+                    self._stop_memory(open_phase)
+
+    def _start_memory(self, name):
+        if not self._open_phases and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak is reset for the new phase; running phases keep their peak.
+        for phase in self._open_phases:
+            phase[2] = max(phase[2], peak)
+        tracemalloc.reset_peak()
+        open_phase = [name, current, current]
+        self._open_phases.append(open_phase)
+        return open_phase
+
+    def _stop_memory(self, open_phase):
+        current, peak = tracemalloc.get_traced_memory()
+        # Phases in other threads do not necessarily stop in reverse order.
+        self._open_phases = [p for p in self._open_phases if p is not open_phase]
+        name, start, phase_peak = open_phase
+        phase_peak = max(phase_peak, peak)
+        for phase in self._open_phases:
+            phase[2] = max(phase[2], phase_peak)
+        memory = self.memory.setdefault(name, {"peak": 0, "allocated": 0})
+        memory["peak"] = max(memory["peak"], phase_peak - start)
+        memory["allocated"] += current - start
+        if resource is not None:
+            # kilobytes on Linux, bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            memory["max_rss"] = max_rss * (1 if sys.platform == "darwin" else 1024)
+        if not self._open_phases and self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def record(self, **kwargs):
+        """Store additional data."""
+        self.data.update(kwargs)
+
+    def written(self, filename):
+        """Store the size of a file written by mumax3c."""
+        self.files_written[str(filename)] = pathlib.Path(filename).stat().st_size
+
+    def read(self, filename):
+        """Store the size of a file read by mumax3c."""
+        self.files_read[str(filename)] = pathlib.Path(filename).stat().st_size
+
+    def to_dict(self):
+        """Telemetry as a json-serialisable dictionary."""
+        data = {
+            **self.data,
+            "phases": self.phases,
+            "files_written": self.files_written,
+            "files_read": self.files_read,
+            "bytes_written": sum(self.files_written.values()),
+            "bytes_read": sum(self.files_read.values()),
+        }
+        if self.memory is not None:
+            data["memory"] = self.memory
+        return data
+
+    def write(self, dirname="."):
+        """Write the telemetry to ``telemetry.json`` in ``dirname``."""
+        with open(pathlib.Path(dirname, FILENAME), "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+
+def current():
+    """Return the active telemetry or ``None``."""
+    return _current.get()
+
+
+def phase(name):
+    """Time a phase in the active telemetry."""
+    if (telemetry := current()) is None:
+        return contextlib.nullcontext()
+    return telemetry.phase(name)
+
+
+@contextlib.contextmanager
+def track_memory(name="total"):
+    """Trace the memory allocated by Python inside the context.
+
+    The code inside the context is recorded as phase ``name`` of a new telemetry
+    with memory tracing (see ``Telemetry``), which is returned. All phases
+    recorded by mumax3c inside the context (e.g. ``regions`` or ``write_ovf``) are
+    traced as well. To trace the phases of drives, use ``memory=True`` in
+    ``drive`` instead.
+
+    Examples
+    --------
+    1. Tracing the memory of writing the input files.
+
+    >>> import micromagneticmodel as mm
+    >>> import mumax3c as mc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> with mc.telemetry.track_memory() as telemetry:
+    ...     with mc.telemetry.phase("regions"):
+    ...         mx3 = mc.scripts.mumax3_regions(system)
+    >>> sorted(telemetry.memory)
+    ['regions', 'total']
+    >>> telemetry.memory["total"]["peak"] > 0
+    True
+
+    """
+    telemetry = Telemetry(memory=True)
+    with telemetry.activate(), telemetry.phase(name):
+        yield telemetry
+
+
+def record(**kwargs):
+    """Store additional data in the active telemetry."""
+    if (telemetry := current()) is not None:
+        telemetry.record(**kwargs)
+
+
+def written(filename):
+    """Store the size of a written file in the active telemetry."""
+    if (telemetry := current()) is not None:
+        telemetry.written(filename)
+
+
+def read(filename):
+    """Store the size of a read file in the active telemetry."""
+    if (telemetry := current()) is not None:
+        telemetry.read(filename)
+
+
+def collect(dirname="."):
+    """Aggregate the telemetry of all drives of all systems in ``dirname``.
+
+    Parameters
+    ----------
+    dirname : str, pathlib.Path, optional
+
+        Base directory of the simulations (the ``dirname`` passed to ``drive``) or
+        directory of a single system. Defaults to the current working directory.
+
+    Returns
+    -------
+    pandas.DataFrame
+
+        One row per drive with the system name, drive number, driver, mesh size,
+        number of regions, exit status, bytes written and read, and one column
+        ``<phase>_time`` with the duration in seconds for every phase (and
+        ``<phase>_peak_memory`` in bytes for drives with ``memory=True``). Rows
+        are sorted by system name and drive number.
+
+    Examples
+    --------
+    1. Aggregating telemetry.
+
+    >>> import mumax3c as mc
+    ...
+    >>> table = mc.telemetry.collect("no_simulations_in_this_directory")
+    >>> len(table)
+    0
+
+    """
+    dirname = pathlib.Path(dirname)
+    files = sorted(dirname.glob(f"*/drive-*/{FILENAME}"))
+    files += sorted(dirname.glob(f"drive-*/{FILENAME}"))
+    rows = []
+    for filename in files:
+        with open(filename, encoding="utf-8") as f:
+            telemetry = json.load(f)
+        row = {"dirname": str(filename.parent)}
+        for key, value in telemetry.items():
+            if key == "phases":
+                row.update({f"{name}_time": time for name, time in value.items()})
+            elif key == "memory":
+                row.update(
+                    {f"{name}_peak_memory": mem["peak"] for name, mem in value.items()}
+                )
+            elif not isinstance(value, (dict, list)):
+                row[key] = value
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    if {"system", "drive_number"}.issubset(table.columns):
+        table = table.sort_values(["system", "drive_number"], ignore_index=True)
+    return table
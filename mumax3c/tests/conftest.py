@@ -1,3 +1,9 @@
+import math
+import pathlib
+import re
+import shutil
+import subprocess as sp
+
 import pytest
 
 import mumax3c as mc
@@ -54,7 +60,6 @@ missing_in_mumax3c = [
     "TestSlonczewski.test_single_values",
     "TestSlonczewski.test_single_values_finite_temperature",
     "TestSlonczewski.test_dict_values",
-    "TestZhangLi.test_time_func_scalar_u",
     "test_multiple_drives_compute",
     "TestPrecession.test_scalar",
     "TestDMI.test_scalar",
@@ -80,3 +85,91 @@ def skip_unsupported_or_missing(request):
         pytest.skip("Not supported by mumax3.")
     elif requesting_test_function in missing_in_mumax3c:
         pytest.xfail("Currently not implemented in mumax3c.")
+
+
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(tmp_path, monkeypatch):
+    """Write drive directories and input files to a temporary directory.
+
+    The working directory is restored after the test, also if the test changes
+    it with ``os.chdir``.
+
+    """
+    monkeypatch.chdir(tmp_path)
+
+
+class FakeMumax3Runner(mc.mumax3.Mumax3Runner):
+    """Runner imitating the output of mumax3 without running a simulation.
+
+    The initial magnetisation is written as ``m_full`` snapshot for every
+    ``save(m_full)`` and a table row for every ``tablesave()`` executed by the mx3
+    script. The time in the table is the iteration of the loops in ps, restarting
+    from zero in every iteration of an outer loop that resets ``t = 0``.
+
+    """
+
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.calls = []
+
+    @staticmethod
+    def _saves(mx3):
+        """Times of the table rows and number of snapshots saved by the script."""
+        loops, rows, snapshots = [1], [], 0
+        reset = False  # the time is reset in every iteration of an outer loop
+        for line in mx3.splitlines():
+            line = line.strip()
+            if match := re.match(r"for .*<(\d+);", line):
+                loops.append(int(match.group(1)))
+            elif line == "}":
+                loops.pop()
+            elif line == "t = 0":
+                reset = True
+            elif line == "tablesave()" and reset:
+                rows += list(range(loops[-1])) * math.prod(loops[:-1])
+            elif line == "tablesave()":
+                rows += list(range(math.prod(loops)))
+            elif line == "save(m_full)":
+                snapshots += math.prod(loops)
+        return rows, snapshots
+
+    def _call(self, argstr, need_stderr=False, dry_run=False):
+        if dry_run:
+            return f"mumax3 {argstr}"
+        self.calls.append(argstr)
+        with open(argstr, encoding="utf-8") as f:
+            mx3 = f.read()
+        outdir = pathlib.Path(argstr.removesuffix(".mx3") + ".out")
+        outdir.mkdir(exist_ok=True)
+        m0 = re.search(r'm.LoadFile\("(.*)"\)', mx3).group(1)
+        rows, snapshots = self._saves(mx3)
+        regions = re.findall(r"tableadd\(m.region\((\d+)\)\)", mx3)
+        for i in range(snapshots):
+            shutil.copy(m0, outdir / f"m_full{i:06d}.ovf")
+        with open(outdir / "table.txt", "w", encoding="utf-8") as f:
+            f.write("# t (s)\tmx ()\tmy ()\tmz ()\tE_total (J)\tdt (s)\tmaxTorque (T)")
+            f.writelines(f"\tm.region{r}{c} ()" for r in regions for c in "xyz")
+            f.write("\n")
+            for i, t in enumerate(rows):
+                torque = 0.001 * (i + 1)
+                f.write(f"{t}e-12\t0\t0\t1\t-1e-20\t1e-14\t{torque:g}")
+                f.write("\t0\t0\t1" * len(regions) + "\n")
+        with open(outdir / "log.txt", "w", encoding="utf-8") as f:
+            # mumax3 echoes the script and writes printed output as comments
+            values = {"step": 10 * len(rows), "NEval": 70 * len(rows)}
+            for line in mx3.splitlines():
+                if match := re.match(r'print\("(.*)", (\w+)\)', line):
+                    line = f"//{match.group(1)} {values[match.group(2)]}"
+                f.write(f"{line}\n")
+        stdout = b"//mumax 3.10 fake\n//GPU info: Fake GPU(1024MB), cc=7.5\n"
+        return sp.CompletedProcess(
+            args=["mumax3", argstr],
+            returncode=self.returncode,
+            stdout=stdout,
+            stderr=b"",
+        )
+
+
+@pytest.fixture
+def fake_runner():
+    return FakeMumax3Runner()
@@ -0,0 +1,94 @@
+import json
+
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    return mm.examples.macrospin()
+
+
+def test_export(system, fake_runner, tmp_path):
+    h5py = pytest.importorskip("h5py")
+    td = mc.TimeDriver()
+    td.drive(system, t=5e-12, n=5, dirname=tmp_path, runner=fake_runner)
+    drivedir = tmp_path / system.name / "drive-0"
+    outdir = drivedir / f"{system.name}.out"
+
+    filename = mc.export(drivedir)
+    assert filename == drivedir / f"{system.name}.h5"
+    assert len(mc.io.snapshots(outdir)) == 5
+    with h5py.File(filename, "r") as f:
+        m = f["m"]
+        assert m.shape == (5, 1, 1, 1, 3)
+        assert m.chunks == (1, 1, 1, 1, 3)
+        assert m.dtype == np.float32
+        assert m.attrs["n"].tolist() == [1, 1, 1]
+        assert np.allclose(m[-1], system.m.orientation.array)
+        assert np.allclose(f["table/t"][:], system.table.data["t"])
+        assert json.loads(f["table"].attrs["units"])["t"] == "s"
+        info = json.loads(f.attrs["info"])
+        assert info["n"] == 5
+        assert info["region_relator"] == {"": [0]}  # whole mesh in region 0
+
+    with pytest.raises(ValueError):
+        mc.export(drivedir, filename=tmp_path / "m.npy")
+    with pytest.raises(FileNotFoundError):
+        mc.export(tmp_path)
+
+
+def test_drive_export(system, fake_runner, tmp_path):
+    h5py = pytest.importorskip("h5py")
+    td = mc.TimeDriver()
+    td.drive(
+        system,
+        t=5e-12,
+        n=5,
+        dirname=tmp_path,
+        runner=fake_runner,
+        export=dict(filename="m.hdf5", precision="float64", delete=True),
+    )
+    drivedir = tmp_path / system.name / "drive-0"
+    assert mc.io.snapshots(drivedir / f"{system.name}.out") == []
+    with h5py.File(drivedir / "m.hdf5", "r") as f:
+        assert f["m"].shape == (5, 1, 1, 1, 3)
+        assert f["m"].dtype == np.float64
+
+    with open(drivedir / "telemetry.json", encoding="utf-8") as f:
+        assert "export" in json.load(f)["phases"]
+
+
+@pytest.mark.parametrize("module, suffix", [("h5py", ".h5"), ("zarr", ".zarr")])
+def test_export_delete(system, fake_runner, tmp_path, monkeypatch, module, suffix):
+    pytest.importorskip(module)
+    td = mc.TimeDriver()
+    td.drive(system, t=5e-12, n=5, dirname=tmp_path, runner=fake_runner)
+    drivedir = tmp_path / system.name / "drive-0"
+    outdir = drivedir / f"{system.name}.out"
+    filename = drivedir / f"m{suffix}"
+
+    # snapshots are kept if the verification fails
+    checksum = mc.archive._checksum
+    with monkeypatch.context() as m:
+        calls = []
+        m.setattr(
+            mc.archive,
+            "_checksum",
+            lambda array: calls.append(1) or checksum(array) + str(len(calls) > 5),
+        )
+        with pytest.raises(RuntimeError, match="Verification of snapshot 0"):
+            mc.export(drivedir, filename=filename, delete=True)
+    assert len(mc.io.snapshots(outdir)) == 5
+
+    assert mc.export(drivedir, filename=filename, delete=True) == filename
+    assert mc.io.snapshots(outdir) == []
+    group, _ = mc.archive._open(filename)
+    group = group(str(filename), mode="r")
+    with mc.archive._closing(group):
+        assert group["m"].shape == (5, 1, 1, 1, 3)
+        assert np.allclose(group["m"][-1], system.m.orientation.array)
+        assert np.allclose(group["table/t"][:], system.table.data["t"])
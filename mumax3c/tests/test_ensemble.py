@@ -0,0 +1,109 @@
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+import ubermagtable as ut
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    system = mm.examples.macrospin()
+    system.T = 300
+    return system
+
+
+def test_script(system, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ed = mc.EnsembleDriver(evolver=mc.HeunEvolver(FixDt=1e-14))
+    mx3 = mc.scripts.driver_script(
+        ed, system, t=1e-10, n=5, realizations=3, seed=10, abspath=False
+    )
+    assert "setsolver(2)\n" in mx3
+    assert "for realization:=0; realization<3; realization++{\n" in mx3
+    assert '    m.LoadFile("m0.omf")\n' in mx3
+    assert "    t = 0\n" in mx3
+    assert "    ThermSeed(10 + realization)\n" in mx3
+    assert "        save(m_full)\n" in mx3
+    assert mx3.count("run(") == 1
+
+    mx3 = mc.scripts.driver_script(
+        ed, system, t=1e-10, n=5, realizations=3, seed=10, snapshots=False
+    )
+    assert "        save(m_full)" not in mx3
+    assert "    save(m_full)\n" in mx3
+
+
+def test_time_driver_script(system):
+    mx3 = mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-10, n=5)
+    assert "realization" not in mx3
+    assert "for snap_counter:=0; snap_counter<5; snap_counter++{\n" in mx3
+
+
+def test_invalid_arguments(system):
+    ed = mc.EnsembleDriver()
+    for realizations in [0, -1, 1.5]:
+        with pytest.raises(ValueError):
+            ed.drive(system, t=1e-12, n=1, realizations=realizations)
+    with pytest.raises(ValueError, match="realizations=None"):
+        ed.drive(system, t=1e-12, n=1)
+    with pytest.raises(ValueError):
+        ed.drive(system, t=1e-12, n=1, realizations=2, seed=0.5)
+
+    system.T = 0
+    with pytest.raises(RuntimeError):
+        ed.drive(system, t=1e-12, n=1, realizations=2)
+
+
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_drive(system, fake_runner, tmp_path, snapshots):
+    ed = mc.EnsembleDriver()
+    ed.drive(
+        system,
+        dirname=tmp_path,
+        t=3e-12,
+        n=3,
+        realizations=4,
+        snapshots=snapshots,
+        aggregate=True,
+        runner=fake_runner,
+    )
+    assert len(fake_runner.calls) == 1
+
+    outdir = tmp_path / system.name / "drive-0" / f"{system.name}.out"
+    for i in range(4):
+        table = ut.Table.fromfile(str(outdir / f"table_{i:06d}.txt"), x="t")
+        assert len(table.data) == 3
+
+    ensemble = system.ensemble
+    assert len(ensemble) == ensemble.realizations == 4
+    assert ensemble.m.shape == (4, 1, 1, 1, 3)
+    assert len(ensemble.data) == 12
+    assert list(ensemble.data["realization"].unique()) == [0, 1, 2, 3]
+    assert len(system.table.data) == 3
+    assert np.allclose(system.table.data["t"], [0, 1e-12, 2e-12])
+
+    mean = ensemble.mean
+    assert np.allclose(mean.data["t"], [0, 1e-12, 2e-12])
+    assert np.allclose(mean.data["maxtorque"], [0.0055, 0.0065, 0.0075])
+    assert np.allclose(ensemble.variance.data["mz"], 0)
+    assert np.allclose(ensemble.m_mean.array, system.m.orientation.array)
+    assert np.allclose(ensemble.m_variance.array, 0)
+
+    for filename in ["table_mean.txt", "table_variance.txt"]:
+        assert (outdir / filename).exists()
+    mean = ut.Table.fromfile(str(outdir / "table_mean.txt"), x="t")
+    assert np.allclose(mean.data["mx"], ensemble.mean.data["mx"])
+    for filename in ["m_mean.ovf", "m_variance.ovf"]:
+        assert (outdir / filename).exists()
+
+    loaded = mc.Ensemble.fromdir(outdir.parent)
+    assert len(loaded) == 4
+    assert np.allclose(loaded.m, ensemble.m)
+
+
+def test_estimate(system):
+    time = mc.estimate(system, mc.TimeDriver(), t=1e-10, n=5)
+    ensemble = mc.estimate(system, mc.EnsembleDriver(), t=1e-10, n=5, realizations=8)
+    assert ensemble["steps"] == 8 * time["steps"]
+    assert ensemble["output_bytes"] == 8 * time["output_bytes"]
@@ -0,0 +1,93 @@
+import json
+import math
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import mumax3c as mc
+
+
+def make_system(bc="", T=0):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(100e-9, 50e-9, 2e-9), n=(50, 25, 1), bc=bc)
+    system = mm.System(name="estimate", T=T)
+    system.energy = mm.Exchange(A=1e-12) + mm.Zeeman(H=(0, 0, 1e5))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=1)
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0.1, 1), norm=8e5)
+    return system
+
+
+def test_fft_grid():
+    assert mc.estimate(make_system(), mc.MinDriver())["fft_grid"] == (100, 50, 1)
+    report = mc.estimate(make_system(bc="xy"), mc.MinDriver())
+    assert report["fft_grid"] == (50, 25, 1)
+
+
+def test_pbc_repetitions():
+    reports = {}
+    for bc in ["", "x", "xy"]:
+        system = make_system(bc=bc)
+        system.energy += mm.Demag()
+        short = mc.estimate(system, mc.TimeDriver(FixDt=1e-13), t=1e-13, n=1)
+        long = mc.estimate(system, mc.TimeDriver(FixDt=1e-13), t=2e-13, n=1)
+        # The kernel is computed once, before the first step.
+        kernel_cells = math.prod(n // 2 + 1 for n in short["fft_grid"])
+        reports[bc] = (short, (2 * short["cost"] - long["cost"]) / kernel_cells)
+    assert reports[""][0]["pbc_repetitions"] == (0, 0, 0)
+    assert reports["xy"][0]["pbc_repetitions"] == (1, 1, 0)
+    # Periodic images: 3 with PBC in x and 9 in x and y.
+    assert reports["x"][1] == pytest.approx(3 * reports[""][1])
+    assert reports["xy"][1] == pytest.approx(9 * reports[""][1])
+    assert reports["x"][0]["device_memory"] < reports[""][0]["device_memory"]
+
+
+def test_device_memory():
+    system = make_system()
+    baseline = mc.estimate(system, mc.MinDriver())
+    assert baseline["cells"] == 1250
+
+    system.energy += mm.Demag()
+    demag = mc.estimate(system, mc.MinDriver())
+    assert demag["device_memory"] > baseline["device_memory"]
+    assert demag["cost"] > baseline["cost"]
+
+    thermal = mc.estimate(make_system(T=300), mc.MinDriver())
+    assert thermal["device_memory"] > baseline["device_memory"]
+
+    assert mc.estimate(system, mc.MinDriver(), device_memory=10**9)["fits_device"]
+    assert not mc.estimate(system, mc.MinDriver(), device_memory=10)["fits_device"]
+    assert "fits_device" not in baseline
+
+
+def test_time_drive():
+    system = make_system()
+    short = mc.estimate(system, mc.TimeDriver(), t=1e-10, n=10)
+    long = mc.estimate(system, mc.TimeDriver(), t=1e-9, n=100)
+    assert short["solver"] == 5
+    assert long["steps"] == 10 * short["steps"]
+    assert long["cost"] > short["cost"]
+    assert long["output_bytes"] > 9 * short["output_bytes"]
+    assert long["input_bytes"] == short["input_bytes"]
+
+    fixed = mc.estimate(system, mc.TimeDriver(FixDt=1e-12), t=1e-10, n=10)
+    assert fixed["steps"] == 100
+
+
+def test_calibration(fake_runner, tmp_path):
+    system = make_system()
+    report = mc.estimate(system, mc.TimeDriver(), dirname=tmp_path, t=1e-12, n=2)
+    assert report["runtime"] is None
+    assert report["calibration_drives"] == 0
+
+    td = mc.TimeDriver()
+    for _ in range(2):
+        td.drive(system, dirname=tmp_path, t=1e-12, n=2, runner=fake_runner)
+
+    with open(tmp_path / system.name / "drive-0" / "telemetry.json") as f:
+        telemetry = json.load(f)
+    assert telemetry["estimated_cost"] == report["cost"]
+    assert telemetry["estimated_device_memory"] == report["device_memory"]
+
+    report = mc.estimate(system, mc.TimeDriver(), dirname=tmp_path, t=1e-12, n=2)
+    assert report["calibration_drives"] == 2
+    assert report["runtime"] > 0
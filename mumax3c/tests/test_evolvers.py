@@ -0,0 +1,103 @@
+import micromagneticmodel as mm
+import pytest
+
+import mumax3c as mc
+
+
+class RungeKuttaEvolver(mm.Evolver):
+    """Evolver of another calculator."""
+
+    _allowed_attributes = ["method", "start_dm", "MaxErr"]
+
+
+class CGEvolver(mm.Evolver):
+    _allowed_attributes = []
+
+
+def script(**kwargs):
+    system = mm.examples.macrospin()
+    return mc.scripts.driver_script(mc.TimeDriver(**kwargs), system, t=1e-9, n=10)
+
+
+@pytest.mark.parametrize(
+    "evolver, solver",
+    [
+        (None, 5),
+        (mc.EulerEvolver(), 1),
+        (mc.HeunEvolver(), 2),
+        (mc.RungeKuttaEvolver(method="rk23"), 3),
+        (mc.RungeKuttaEvolver(method="rk4"), 4),
+        (mc.RungeKuttaEvolver(method="rkf54s"), 5),
+        (mc.RungeKuttaEvolver(method="rkf56"), 6),
+        (mc.BackwardEulerEvolver(FixDt=1e-13), -1),
+        ("rk23", 3),
+        (RungeKuttaEvolver(method="rk4", start_dm=0.01), 4),
+    ],
+)
+def test_solver(evolver, solver):
+    mx3 = script() if evolver is None else script(evolver=evolver)
+    assert f"setsolver({solver})\n" in mx3
+    assert mx3.count("setsolver") == 1
+    assert "start_dm" not in mx3
+
+
+def test_time_step_control():
+    mx3 = script(evolver=mc.HeunEvolver(FixDt=1e-14))
+    assert "FixDt = 1e-14\n" in mx3
+    assert "fixDt = 0" not in mx3
+
+    mx3 = script(evolver=mc.RungeKuttaEvolver(MaxErr=1e-6), MinDt=1e-15)
+    assert "fixDt = 0\n" in mx3
+    assert "MaxErr = 1e-06\n" in mx3
+    assert "MinDt = 1e-15\n" in mx3
+    assert mx3.index("setsolver") < mx3.index("MaxErr") < mx3.index("run(")
+
+    evolver = mc.evolvers.convert(RungeKuttaEvolver(method="rk23", MaxErr=1e-4))
+    assert isinstance(evolver, mc.RungeKuttaEvolver)
+    assert evolver.MaxErr == 1e-4
+
+
+def test_invalid_evolver():
+    system = mm.examples.macrospin()
+    for evolver in [CGEvolver(), "cg", 5]:
+        with pytest.raises(TypeError):
+            mc.TimeDriver(evolver=evolver).drive(system, t=1e-12, n=1)
+    with pytest.raises(ValueError):
+        mc.TimeDriver(evolver=mc.BackwardEulerEvolver()).drive(system, t=1e-12, n=1)
+    with pytest.raises(ValueError):
+        mc.TimeDriver(evolver=mc.RungeKuttaEvolver(method="rk9")).drive(
+            system, t=1e-12, n=1
+        )
+
+
+def test_estimate_solver():
+    system = mm.examples.macrospin()
+    evolver = mc.EulerEvolver(FixDt=1e-12)
+    report = mc.estimate(system, mc.TimeDriver(evolver=evolver), t=1e-10, n=1)
+    assert report["solver"] == 1
+    assert report["steps"] == 100
+
+
+def test_benchmark(fake_runner, tmp_path):
+    system = mm.examples.macrospin()
+    initial = system.m.array.copy()
+    evolvers = [
+        mc.RungeKuttaEvolver(method=method, MaxErr=max_err)
+        for method in ["rk23", "rkf54"]
+        for max_err in [1e-3, 1e-5]
+    ]
+    table = mc.evolvers.benchmark(
+        system, evolvers, t=1e-12, n=3, dirname=tmp_path, runner=fake_runner
+    )
+
+    assert len(table) == 5
+    assert list(table["solver"]) == [6, 3, 3, 5, 5]
+    assert table["evolver"][1] == "RungeKuttaEvolver(MaxErr=0.001, method='rk23')"
+    assert (table["run_time"] >= 0).all()
+    assert (table["steps"] == 30).all()
+    assert (table["evaluations"] == 210).all()
+    # the fake runner does not change the magnetisation
+    assert (table["error"] == 0).all()
+    assert (table["table_error"] == 0).all()
+    assert (system.m.array == initial).all()
+    assert len(list((tmp_path / system.name).glob("drive-*"))) == 5
@@ -0,0 +1,78 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    subregions = {
+        "left": df.Region(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9)),
+        "right": df.Region(p1=(5e-9, 0, 0), p2=(10e-9, 5e-9, 5e-9)),
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), n=(2, 1, 1), subregions=subregions
+    )
+    system = mm.System(name="fmr")
+    system.energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.01)
+    system.m = df.Field(
+        mesh, nvdim=3, value=(0, 0, 1), norm={"left": 8e5, "right": 8e5}
+    )
+    return system
+
+
+def test_fmr_drive(system, fake_runner, tmp_path):
+    fd = mc.FMRDriver()
+    excitation = dict(H=(1e3, 0, 0), frequency=1e11)
+    fd.drive(
+        system,
+        t=1e-10,
+        n=100,
+        snapshots=4,
+        excitation=excitation,
+        dirname=tmp_path,
+        runner=fake_runner,
+    )
+    drivedir = tmp_path / system.name / "drive-0"
+    mx3 = (drivedir / f"{system.name}.mx3").read_text(encoding="utf-8")
+    mu0 = mm.consts.mu0
+    assert f"B_ext = vector({1e3 * mu0} * sinc(2 * pi * {1e11} * (t - 2e-11))" in mx3
+    assert "tableadd(m.region(0))\ntableadd(m.region(1))\n" in mx3
+    assert "run(1e-12)" in mx3
+
+    outdir = drivedir / f"{system.name}.out"
+    assert len(mc.io.snapshots(outdir)) == 4
+    assert len(system.table.data) == 100
+    assert {"mx_left", "mz_right"} <= set(system.table.data.columns)
+    assert system.table.units["mz_left"] == ""
+    assert len(system.spectrum) == 51
+    assert list(system.spectrum.columns[:3]) == ["mx", "my", "mz"]
+    assert "mx_left" in system.spectrum.columns
+    assert (outdir / "spectrum.txt").exists()
+
+
+def test_fmr_checkargs():
+    fd = mc.FMRDriver()
+    fd._checkargs(t=1e-9, n=100, excitation=dict(H=(1, 0, 0), shape="rect"))
+    with pytest.raises(ValueError):
+        fd._checkargs(t=1e-9, n=100, snapshots=3)
+    with pytest.raises(ValueError):
+        fd._checkargs(t=1e-9, n=100, excitation=dict(H=1))
+    with pytest.raises(ValueError):
+        fd._checkargs(t=1e-9, n=100, excitation=dict(H=(1, 0, 0), shape="square"))
+    with pytest.raises(ValueError):
+        fd._checkargs(t=1e-9, n=100, excitation=dict(H=(1, 0, 0), frequency=1, w=2))
+
+
+def test_excitation():
+    H, pulse = mc.FMRDriver._excitation(
+        dict(H=(0, 1, 0), shape="gaussian", width=1e-12), t=1e-9, n=100
+    )
+    assert H == (0, 1, 0)
+    assert pulse == "exp(-pow((t - 5e-12) / 1e-12, 2) / 2)"
+    _, pulse = mc.FMRDriver._excitation(
+        dict(H=(0, 1, 0), shape="rect", width=2e-11), 1e-9, 100
+    )
+    assert pulse == "heaviside(t - 0) * heaviside(0 + 2e-11 - t)"
@@ -0,0 +1,55 @@
+import re
+import subprocess as sp
+import sys
+
+import pytest
+
+import mumax3c as mc
+
+# Cumulative time of ``import mumax3c`` without interpreter start-up; see
+# benchmarks/import_time.py. Currently around 20 ms.
+IMPORT_BUDGET = 0.25  # seconds
+
+HEAVY_MODULES = [
+    "discretisedfield",
+    "micromagneticmodel",
+    "pandas",
+    "pytest",
+    "ubermagtable",
+]
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, mumax3c; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    res = sp.run([sys.executable, "-c", code], stdout=sp.PIPE, check=True)
+    assert res.stdout.decode().split() == []
+
+
+def test_import_time():
+    times = []
+    for _ in range(3):
+        res = sp.run(
+            [sys.executable, "-X", "importtime", "-c", "import mumax3c"],
+            stderr=sp.PIPE,
+            check=True,
+        )
+        (match,) = re.findall(
+            r"import time:\s*\d+ \|\s*(\d+) \| mumax3c$",
+            res.stderr.decode(),
+            flags=re.MULTILINE,
+        )
+        times.append(int(match) * 1e-6)
+    assert min(times) < IMPORT_BUDGET
+
+
+def test_lazy_attributes():
+    assert isinstance(mc.runner, mc.mumax3.Runner)
+    assert mc.runner is mc.runner
+    assert callable(mc.estimate)
+    assert mc.TimeDriver is mc.drivers.TimeDriver
+    assert "TimeDriver" in dir(mc)
+    with pytest.raises(AttributeError, match="does_not_exist"):
+        getattr(mc, "does_not_exist")  # noqa: B009
@@ -0,0 +1,194 @@
+import json
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pandas as pd
+import pytest
+import ubermagtable as ut
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def field():
+    subregions = {
+        "r1": df.Region(p1=(0, 0, 0), p2=(10e-9, 5e-9, 2e-9)),
+        "r2": df.Region(p1=(0, 5e-9, 0), p2=(10e-9, 10e-9, 2e-9)),
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(10e-9, 10e-9, 2e-9), n=(10, 10, 2), subregions=subregions
+    )
+
+    def value_fun(pos):
+        x, y, z = pos
+        return (np.sin(x * 1e9), np.cos(y * 1e9), 1.0)
+
+    return df.Field(mesh, nvdim=3, value=value_fun, norm={"r1": 8e5, "r2": 3.8e5})
+
+
+@pytest.mark.parametrize("representation", ["bin4", "bin8", "txt"])
+def test_read_field_float32(field, representation, tmp_path):
+    filename = tmp_path / "m_full000000.ovf"
+    field.to_file(filename, representation=representation)
+
+    field32 = mc.io.read_field(filename, precision="float32")
+    field64 = mc.io.read_field(filename, precision="float64")
+
+    assert field32.array.dtype == np.float32
+    assert field64.array.dtype == np.float64
+    assert field32.mesh == field.mesh
+    assert field32.nvdim == field64.nvdim == 3
+    assert field32.vdims == field64.vdims
+
+    assert np.allclose(field32.norm.array, field64.norm.array, rtol=1e-6)
+    assert np.allclose(field32.mean(), field64.mean(), rtol=1e-6)
+    for subregion in field.mesh.subregions:
+        assert np.allclose(
+            field32[subregion].mean(), field64[subregion].mean(), rtol=1e-6
+        )
+
+
+def test_read_field_invalid_precision(field, tmp_path):
+    filename = tmp_path / "m.ovf"
+    field.to_file(filename)
+    with pytest.raises(ValueError):
+        mc.io.read_field(filename, precision="float16")
+
+
+def test_read_data_float32(field, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = mm.System(name="float32")
+    system.m = field
+    norm = system.m.norm.array
+
+    (tmp_path / "float32.out").mkdir()
+    # mumax3 writes single-precision m_full files with slightly changed norm
+    (field * 0.999).to_file("float32.out/m_full000000.ovf", representation="bin4")
+    with open("float32.out/table.txt", "w", encoding="utf-8") as f:
+        f.write("# t (s)\tmx ()\tmy ()\tmz ()\tE_total (J)\n")
+        f.write("1e-12\t0.1\t0.2\t0.9\t-1e-20\n")
+
+    td = mc.TimeDriver()
+    td.drive_kwargs_setup(dict(t=1e-12, n=1, precision="float32"))
+    td._read_data(system)
+
+    assert system.m.array.dtype == np.float32
+    assert np.allclose(system.m.norm.array, norm, rtol=1e-6)
+    assert np.allclose(system.m.mean(), field.mean(), rtol=1e-6)
+
+    td.drive_kwargs_setup(dict(t=1e-12, n=1))
+    td._read_data(system)
+    assert system.m.array.dtype == np.float64
+    assert np.allclose(system.m.norm.array, norm)
+
+
+def test_parse_log():
+    assert mc.io.parse_log("") == {}
+
+    stats = mc.io.parse_log(
+        "//mumax 3.10 linux_amd64 go1.14 (gc)\n"
+        "//GPU info: NVIDIA GeForce RTX 2080 Ti(11019MB), cc=7.5\n"
+        "//Calculating demag kernel took 1.5 s\n"
+        "setsolver(3)\n"
+        "//mumax3c: step 10\n"
+        "//mumax3c: NEval 36\n"
+    )
+    assert stats["mumax3_version"] == "3.10"
+    assert stats["device"] == "NVIDIA GeForce RTX 2080 Ti(11019MB), cc=7.5"
+    assert stats["kernel"] == "calculated"
+    assert stats["kernel_init_time"] == 1.5
+    assert stats["solver"] == 3
+    assert stats["steps"] == 10
+    assert stats["evaluations"] == 36
+    assert stats["evaluations_per_step"] == 3.6
+    assert stats["rejected_steps"] == 2
+
+    stats = mc.io.parse_log(
+        "//Using cached kernel: /tmp/mumax3kernel/64_64_1\n"
+        "//mumax3c: step 0\n"
+        "//mumax3c: NEval &{NEval}\n"  # not a number
+    )
+    assert stats == {"kernel": "cached", "steps": 0}
+
+
+def test_solver_stats(fake_runner, tmp_path):
+    system = mm.examples.macrospin()
+    mc.TimeDriver().drive(system, dirname=tmp_path, t=1e-12, n=2, runner=fake_runner)
+
+    drive_dir = tmp_path / system.name / "drive-0"
+    with open(drive_dir / "info.json") as f:
+        stats = json.load(f)["solver_stats"]
+    assert stats["mumax3_version"] == "3.10"
+    assert stats["device"] == "Fake GPU(1024MB), cc=7.5"
+    assert stats["solver"] == 5
+    assert stats["steps"] == 20
+    assert stats["evaluations"] == 140
+    assert stats["rejected_steps"] == 3
+
+    with open(drive_dir / "telemetry.json") as f:
+        assert json.load(f)["steps"] == 20
+
+
+@pytest.fixture
+def table(tmp_path):
+    filename = tmp_path / "table.txt"
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("# t (s)\tmx ()\tmy ()\tmz ()\tE_total (J)\tmaxTorque (T)\n")
+        for i in range(1000):
+            f.write(f"{i}e-12\t{i / 1000}\t0\t1\t-1e-20\t{i}e-3\n")
+    return filename
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_table_reader(table, cache):
+    full = ut.Table.fromfile(str(table), x="t")
+    reader = mc.io.TableReader(table, cache=cache)
+    assert reader.columns == list(full.data.columns)
+    assert reader.units == full.units
+    assert len(reader) == 1000
+    assert (table.parent / "table.txt.columns").exists() == cache
+
+    assert np.allclose(reader.read().data, full.data)
+    data = reader.read(columns=["E", "mx"]).data
+    assert list(data.columns) == ["t", "E", "mx"]
+    assert np.allclose(data["mx"], full.data["mx"])
+
+    for tail in [0, 1, 999, 1000, 2000]:
+        data = reader.read(columns=["mx"], tail=tail).data
+        assert np.allclose(data, full.data[["t", "mx"]].iloc[1000 - min(tail, 1000) :])
+
+    data = reader.read(start=10e-12, stop=19.5e-12).data
+    assert np.allclose(data["t"], np.arange(10, 20) * 1e-12)
+    data = reader.read(start=10e-12, stop=19.5e-12, tail=3).data
+    assert np.allclose(data["t"], [17e-12, 18e-12, 19e-12])
+    assert len(reader.read(start=1).data) == 0
+
+    chunks = list(reader.chunks(columns=["maxtorque"], chunksize=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert list(chunks[0].columns) == ["maxtorque"]
+    assert np.allclose(pd.concat(chunks)["maxtorque"], full.data["maxtorque"])
+
+    with pytest.raises(ValueError):
+        reader.read(columns=["does_not_exist"])
+
+
+def test_table_reader_cache_update(table):
+    assert len(mc.io.TableReader(table, cache=True)) == 1000
+    with open(table, "a", encoding="utf-8") as f:
+        f.write("1e-9\t1\t0\t0\t-1e-20\t1\n")
+    reader = mc.io.TableReader(table, cache=True)
+    assert len(reader) == 1001
+    assert np.isclose(reader.read(tail=1).data["mx"].iloc[0], 1)
+
+
+def test_table_reader_cache_rows(tmp_path):
+    # Tables without rows, with blank lines and without a final newline.
+    header = "# t (s)\tmx ()\n"
+    for body, rows in [("", 0), ("0\t1\n\n1e-12\t0.5\n", 2), ("0\t1\n1e-12\t0.5", 2)]:
+        filename = tmp_path / "table.txt"
+        filename.write_text(header + body, encoding="utf-8")
+        reader = mc.io.TableReader(filename, cache=True)
+        assert len(reader) == rows
+        assert np.allclose(reader.read().data["mx"], [1, 0.5][:rows])
+        assert not list(filename.parent.glob("table.txt.columns/*.tmp.npy"))
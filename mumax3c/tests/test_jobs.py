@@ -0,0 +1,159 @@
+import json
+import sys
+import textwrap
+
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+# Imitates mumax3 for time drives without importing mumax3c; system0 fails.
+FAKE_MUMAX3 = textwrap.dedent(
+    """\
+    #!{python}
+    import os
+    import re
+    import shutil
+    import sys
+
+    with open(sys.argv[1]) as f:
+        mx3 = f.read()
+    outdir = sys.argv[1].removesuffix(".mx3") + ".out"
+    os.makedirs(outdir, exist_ok=True)
+    m0 = re.search(r'm.LoadFile\\("(.*)"\\)', mx3).group(1)
+    n = int(re.search(r"snap_counter<(\\d+)", mx3).group(1))
+    with open(os.path.join(outdir, "table.txt"), "w") as f:
+        f.write("# t (s)\\tmx ()\\tmy ()\\tmz ()\\n")
+        for i in range(n):
+            shutil.copy(m0, os.path.join(outdir, f"m_full{{i:06d}}.ovf"))
+            f.write(f"{{i}}e-12\\t0\\t0\\t1\\n")
+    sys.exit(int("system0" in sys.argv[1]))
+    """
+)
+
+# Stand-in scheduler running all array indices of the script sequentially.
+FAKE_SCHEDULER = textwrap.dedent(
+    """\
+    #!{python}
+    import os
+    import re
+    import subprocess
+    import sys
+
+    with open(sys.argv[1]) as f:
+        first, last = map(int, re.search({pattern!r}, f.read()).groups())
+    for i in range(first, last + 1):
+        env = {{**os.environ, "{variable}": str(i)}}
+        subprocess.run(["sh", sys.argv[1]], env=env, check=True)
+    """
+)
+
+
+def make_exe(path, content, **kwargs):
+    path.write_text(content.format(python=sys.executable, **kwargs), encoding="utf-8")
+    path.chmod(0o755)
+    return path
+
+
+def make_systems():
+    systems = []
+    for i in range(3):
+        macrospin = mm.examples.macrospin()
+        system = mm.System(name=f"system{i}")
+        system.energy = macrospin.energy
+        system.dynamics = macrospin.dynamics
+        system.m = macrospin.m
+        systems.append(system)
+    return systems
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires executable scripts")
+def test_schedule_array(tmp_path, capsys):
+    mumax3 = make_exe(tmp_path / "mumax3", FAKE_MUMAX3)
+    sbatch = make_exe(
+        tmp_path / "sbatch",
+        FAKE_SCHEDULER,
+        pattern=r"--array=(\d+)-(\d+)",
+        variable="SLURM_ARRAY_TASK_ID",
+    )
+    systems = make_systems()
+
+    td = mc.TimeDriver()
+    manifest = td.schedule(
+        [*systems[:2], (systems[2], dict(n=3))],
+        str(sbatch),
+        "#!/bin/bash\n#SBATCH --time=1:00:00\nmodule load mumax3\n",
+        dirname=tmp_path / "runs",
+        runner=mc.mumax3.ExeMumax3Runner(str(mumax3)),
+        t=5e-12,
+        n=5,
+    )
+    assert "Running" in capsys.readouterr().out
+    assert manifest == tmp_path / "runs" / "array.manifest.json"
+
+    script = (tmp_path / "runs" / "array.sh").read_text(encoding="utf-8")
+    assert script.startswith(
+        "#!/bin/bash\n#SBATCH --time=1:00:00\n#SBATCH --array=0-2\nmodule load mumax3\n"
+    )
+    assert "$((${SLURM_ARRAY_TASK_ID} + 1))" in script
+    with open(manifest, encoding="utf-8") as f:
+        entries = json.load(f)
+    assert [entry["index"] for entry in entries] == [0, 1, 2]
+    lines = (tmp_path / "runs" / "array.manifest.txt").read_text().splitlines()
+    assert lines == [entry["dirname"] for entry in entries]
+    assert all(system.drive_number == 1 for system in systems)
+
+    status = mc.jobs.collect(manifest, systems)
+    assert list(status["status"]) == ["failed", "finished", "finished"]
+    assert list(status["system"]) == ["system0", "system1", "system2"]
+    assert not hasattr(systems[0], "table")
+    assert len(systems[1].table.data) == 5
+    assert len(systems[2].table.data) == 3
+    assert np.allclose(systems[1].m.norm.array, systems[0].m.norm.array)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires executable scripts")
+@pytest.mark.parametrize(
+    "scheduler, directive, pattern",
+    [
+        ("pbs", "#PBS -J 1-3", r"-J (\d+)-(\d+)"),
+        ("sge", "#$ -t 1-3", r"-t (\d+)-(\d+)"),
+        ("lsf", '#BSUB -J "array[1-3]"', r"array\[(\d+)-(\d+)\]"),
+    ],
+)
+def test_schedule_array_one_based(tmp_path, scheduler, directive, pattern):
+    mumax3 = make_exe(tmp_path / "mumax3", FAKE_MUMAX3)
+    variable = mc.jobs.index_variables[scheduler]
+    submit = make_exe(
+        tmp_path / "submit", FAKE_SCHEDULER, pattern=pattern, variable=variable
+    )
+    systems = make_systems()
+    manifest = mc.TimeDriver().schedule(
+        systems,
+        str(submit),
+        "#!/bin/bash\n",
+        dirname=tmp_path / "runs",
+        runner=mc.mumax3.ExeMumax3Runner(str(mumax3)),
+        scheduler=scheduler,
+        verbose=0,
+        t=5e-12,
+        n=5,
+    )
+    script = (tmp_path / "runs" / "array.sh").read_text(encoding="utf-8")
+    assert script.startswith(f"#!/bin/bash\n{directive}\n")
+    assert f'sed -n "${{{variable}}}p"' in script
+
+    # every drive ran once, the first one included
+    status = mc.jobs.collect(manifest, systems)
+    assert list(status["status"]) == ["failed", "finished", "finished"]
+
+
+def test_collect_pending(tmp_path):
+    manifest = tmp_path / "array.manifest.json"
+    entry = {"index": 0, "system": "s", "drive_number": 0, "x": "t"}
+    with open(manifest, "w", encoding="utf-8") as f:
+        json.dump([{**entry, "dirname": str(tmp_path)}], f)
+    assert list(mc.jobs.collect(manifest)["status"]) == ["pending"]
+    with pytest.raises(ValueError):
+        mc.jobs.collect(manifest, systems=[])
@@ -0,0 +1,68 @@
+import micromagneticmodel as mm
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    return mm.examples.macrospin()
+
+
+def loadfile(mx3file):
+    with open(mx3file, encoding="utf-8") as f:
+        return next(line for line in f if line.startswith("m.LoadFile"))
+
+
+def test_chaining(system, fake_runner, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    td = mc.TimeDriver()
+    kwargs = dict(t=5e-12, n=5, dirname=tmp_path, runner=fake_runner)
+    td.drive(system, **kwargs)
+    td.drive(system, **kwargs)
+    drivedirs = [tmp_path / system.name / f"drive-{i}" for i in range(4)]
+    previous = drivedirs[0] / f"{system.name}.out" / "m_full000004.ovf"
+
+    # unchanged magnetisation: loaded from the output of the previous drive
+    assert not (drivedirs[1] / "m0.omf").exists()
+    assert loadfile(drivedirs[1] / f"{system.name}.mx3") == (
+        f'm.LoadFile("{previous.absolute().as_posix()}")\n'
+    )
+
+    # modified magnetisation: written to m0.omf
+    system.m.array[..., 0] += 0.1
+    td.drive(system, **kwargs)
+    assert (drivedirs[2] / "m0.omf").exists()
+
+    # replaced magnetisation
+    td.drive(system, **kwargs)
+    system.m = system.m.orientation
+    mx3 = mc.scripts.magnetisation_script(system, abspath=False)
+    assert 'm.LoadFile("m0.omf")' in mx3
+
+
+def test_chaining_relative(system, fake_runner, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    td = mc.TimeDriver()
+    td.drive(system, t=5e-12, n=5, runner=fake_runner, abspath=False)
+    ed = mc.EnsembleDriver()
+    system.T = 10
+    ed.drive(system, t=5e-12, n=5, realizations=2, runner=fake_runner, abspath=False)
+
+    mx3file = tmp_path / system.name / "drive-1" / f"{system.name}.mx3"
+    path = f"../drive-0/{system.name}.out/m_full000004.ovf"
+    assert loadfile(mx3file) == f'm.LoadFile("{path}")\n'
+    assert mx3file.read_text(encoding="utf-8").count(path) == 2  # ensemble reset
+    assert len(system.ensemble) == 2
+
+
+def test_deleted_source(system, fake_runner, tmp_path):
+    td = mc.TimeDriver()
+    kwargs = dict(t=5e-12, n=5, dirname=tmp_path, runner=fake_runner)
+    td.drive(system, **kwargs)
+    for filename in mc.io.snapshots(
+        tmp_path / system.name / "drive-0" / f"{system.name}.out"
+    ):
+        filename.unlink()
+    td.drive(system, **kwargs)
+    assert (tmp_path / system.name / "drive-1" / "m0.omf").exists()
@@ -0,0 +1,66 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(23e-9, 11e-9, 2e-9), cell=(1e-9, 1e-9, 1e-9))
+    system = mm.System(name="cropped")
+    system.energy = mm.Exchange(A=1e-11) + mm.Demag() + mm.Zeeman(H=(0, 0, 1e5))
+    system.dynamics = mm.Precession(gamma0=2.211e5) + mm.Damping(alpha=0.5)
+
+    def norm(point):
+        x, y, _ = point
+        return 8e5 if 3e-9 < x < 20e-9 and y < 8e-9 else 0
+
+    system.m = df.Field(mesh, nvdim=3, value=(0, 1, 1), norm=norm, valid="norm")
+    return system
+
+
+def test_fft_friendly():
+    assert [mc.scripts.mesh.fft_friendly(n) for n in [1, 11, 13, 17, 97]] == [
+        1,
+        12,
+        14,
+        18,
+        98,
+    ]
+    assert mc.scripts.mesh.fft_friendly(9, primes=(2,)) == 16
+
+
+def test_optimise_mesh(system):
+    mapping = mc.scripts.mesh.optimise_mesh(system)
+    assert mapping.slices == (slice(3, 20), slice(0, 8), slice(0, 2))
+    assert tuple(mapping.optimised.n) == (18, 8, 2)
+    assert np.allclose(mapping.optimised.region.pmin, (3e-9, 0, 0))
+
+    optimised = mapping.to_optimised(system.m)
+    assert np.allclose(optimised.array[17], 0)  # padding
+    restored = mapping.to_original(optimised)
+    assert np.allclose(restored.array, system.m.array)
+
+    # subregions are kept and periodic directions are not changed
+    system.m.mesh.subregions = {"r": df.Region(p1=(0, 0, 0), p2=(1e-9, 11e-9, 2e-9))}
+    system.m.mesh.bc = "y"
+    with pytest.warns(UserWarning, match="Consider using 12 cells"):
+        mapping = mc.scripts.mesh.optimise_mesh(system)
+    assert mapping.slices == (slice(0, 20), slice(0, 11), slice(0, 2))
+    assert tuple(mapping.optimised.n) == (20, 11, 2)
+
+
+def test_drive_optimised_mesh(system, fake_runner, tmp_path):
+    m = system.m.array.copy()
+    mc.TimeDriver().drive(
+        system, t=5e-12, n=5, dirname=tmp_path, runner=fake_runner, optimise_mesh=True
+    )
+    mx3 = (tmp_path / system.name / "drive-0" / f"{system.name}.mx3").read_text()
+    assert "SetGridSize(18, 8, 2)" in mx3
+
+    assert system.m.mesh.n.tolist() == [23, 11, 2]
+    assert np.allclose(system.m.array, m)
+    # average magnetisation of the (zero-padded) optimised mesh rescaled
+    assert np.allclose(system.table.data["mz"], 18 * 8 * 2 / (23 * 11 * 2))
@@ -0,0 +1,129 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+def make_system(i, n=(4, 3, 1), Ms=8e5):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=np.multiply(n, 1e-9), n=n)
+    system = mm.System(name=f"element{i}")
+    system.energy = (
+        mm.Exchange(A=1e-11)
+        + mm.UniaxialAnisotropy(K=1e4 * (i + 1), u=(0, 0, 1))
+        + mm.Zeeman(H=(0, 0, 1e5 * i))
+    )
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.5)
+    system.m = df.Field(mesh, nvdim=3, value=(i, 1, 1), norm=Ms)
+    return system
+
+
+def test_pack(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    systems = [make_system(i) for i in range(5)]
+    packing = mc.packing.pack(systems)
+    assert len(packing) == 5
+    system = packing.system
+    # 3 x 2 tiles of 4 x 3 cells separated by one vacuum cell
+    assert tuple(system.m.mesh.n) == (14, 7, 1)
+    assert sorted(system.m.mesh.subregions) == [f"tile{i}" for i in range(5)]
+    assert np.allclose(system.m.norm.array[4, ...], 0)
+    assert np.allclose(system.m.norm.array[10:, 4:], 0)
+
+    for original, slices in zip(systems, packing.slices):
+        assert np.allclose(system.m.array[slices], original.m.array)
+    assert system.energy.exchange.A == 1e-11
+    assert {
+        f"tile{i}": 1e4 * (i + 1) for i in range(5)
+    } == system.energy.uniaxialanisotropy.K
+
+    mx3 = mc.scripts.system_script(system, ovf_format="bin4")
+    assert "Ku1.setregion(0, 10000.0)" in mx3
+    assert "Ku1.setregion(4, 50000.0)" in mx3
+
+
+def test_demag_spacing():
+    systems = [make_system(i) for i in range(2)]
+    for system in systems:
+        system.energy += mm.Demag()
+    assert tuple(mc.packing.pack(systems).system.m.mesh.n) == (12, 3, 1)
+    assert tuple(mc.packing.pack(systems, spacing=2).system.m.mesh.n) == (10, 3, 1)
+
+    packing = mc.packing.pack(systems, demag=False)
+    assert tuple(packing.system.m.mesh.n) == (9, 3, 1)
+    assert mm.Demag() not in packing.system.energy
+
+
+def test_empty_energy():
+    systems = [make_system(i) for i in range(2)]
+    for system in systems:
+        system.energy = mm.Demag()
+    packing = mc.packing.pack(systems, demag=False)
+    assert len(packing.system.energy) == 0
+
+    for system in systems:
+        system.energy = mm.Energy()
+    packing = mc.packing.pack(systems)
+    assert len(packing.system.energy) == 0
+    assert "Msat" in mc.scripts.system_script(packing.system, ovf_format="bin4")
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        mc.packing.pack([])
+    with pytest.raises(ValueError):
+        mc.packing.pack([make_system(0), make_system(1, n=(4, 4, 1))])
+    with pytest.raises(ValueError):
+        mc.packing.pack([make_system(0)], spacing=0)
+
+    system = make_system(1)
+    system.energy.exchange.A = {"default": 1e-11}
+    with pytest.raises(ValueError):
+        mc.packing.pack([make_system(0), system])
+
+    system = make_system(1)
+    system.dynamics.damping.alpha = 0.1
+    with pytest.raises(ValueError):
+        mc.packing.pack([make_system(0), system])
+
+    # region budget: one region per tile and Ms value and one for the vacuum
+    with pytest.raises(ValueError):
+        mc.packing.pack([make_system(0, n=(1, 1, 1), Ms=i + 1) for i in range(256)])
+
+
+def test_unpack(fake_runner, tmp_path):
+    systems = [make_system(i) for i in range(3)]
+    for system in systems:
+        system.m.array[0, 0, 0] = 0  # vacuum
+    norm = systems[2].m.norm.array
+    norm[2:] *= 2  # two Ms values in the tile
+    systems[2].m.norm = norm
+    packing = mc.packing.pack(systems)
+    td = mc.TimeDriver()
+    td.drive(packing.system, t=3e-12, n=3, dirname=tmp_path, runner=fake_runner)
+    assert len(fake_runner.calls) == 1
+    mx3 = (tmp_path / "packed" / "drive-0" / "packed.mx3").read_text()
+    for region in range(4):
+        assert f"tableadd(m.region({region}))" in mx3
+    assert {"mx_tile0", "mz_tile1", "mz_tile2_2", "mz_tile2_3"} <= set(
+        packing.system.table.data.columns
+    )
+
+    for system in systems:
+        assert np.isclose(system.m.norm.array[1, 0, 0, 0], 8e5)
+        assert np.isclose(system.m.norm.array[0, 0, 0, 0], 0)
+        assert len(system.table.data) == 3
+        assert system.table.x == "t"
+        assert system.table.units["t"] == "s"
+        assert np.allclose(system.table.data["t"], [0, 1e-12, 2e-12])
+        assert np.allclose(system.table.data[["mx", "my", "mz"]], [0, 0, 1])
+
+
+def test_unpack_min(fake_runner, tmp_path):
+    systems = [make_system(i) for i in range(2)]
+    packing = mc.packing.pack(systems)
+    mc.MinDriver().drive(packing.system, dirname=tmp_path, runner=fake_runner)
+    for system in systems:
+        assert len(system.table.data) == 1
+        assert system.table.x == packing.system.table.x
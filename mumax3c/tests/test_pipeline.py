@@ -0,0 +1,94 @@
+import json
+
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def pipeline():
+    return mc.PipelineDriver(
+        stages=[
+            mc.RelaxDriver(RelaxTorqueThreshold=1e-3),
+            mc.MinDriver(MinimizerStop=1e-6),
+            (
+                mc.TimeDriver(evolver=mc.RungeKuttaEvolver(method="rk23")),
+                dict(t=3e-12, n=3),
+            ),
+        ]
+    )
+
+
+def test_script(pipeline):
+    system = mm.examples.macrospin()
+    mx3 = mc.scripts.driver_script(pipeline, system)
+    assert mx3.count("tableadd(E_total)") == 1
+    assert mx3.count("print(") == 2
+    assert (
+        mx3.index("// Stage 0: RelaxDriver")
+        < mx3.index("RelaxTorqueThreshold = 0.001")
+        < mx3.index("relax()")
+        < mx3.index("// Stage 1: MinDriver")
+        < mx3.index("MinimizerStop = 1e-06")
+        < mx3.index("minimize()")
+        < mx3.index("// Stage 2: TimeDriver")
+        < mx3.index("setsolver(3)")
+        < mx3.index("run(1e-12)")
+    )
+    assert "Temp" not in mx3
+
+    system.T = 10
+    mx3 = mc.scripts.driver_script(pipeline, system)
+    assert mx3.count("Temp = 0\n") == 2
+    assert mx3.index("Temp = 0") < mx3.index("minimize()") < mx3.index("Temp = 10")
+
+
+def test_invalid_stages():
+    system = mm.examples.macrospin()
+    with pytest.raises(ValueError):
+        mc.PipelineDriver().drive(system)
+    with pytest.raises(ValueError):
+        mc.PipelineDriver(stages=[(mc.TimeDriver(), dict(t=-1, n=1))]).drive(system)
+    with pytest.raises(TypeError):
+        mc.PipelineDriver(stages=[mc.PipelineDriver(stages=[])]).drive(system)
+
+
+def test_drive(pipeline, fake_runner, tmp_path):
+    system = mm.examples.macrospin()
+    pipeline.drive(system, dirname=tmp_path, runner=fake_runner)
+    assert len(fake_runner.calls) == 1
+
+    drivedir = tmp_path / system.name / "drive-0"
+    outdir = drivedir / f"{system.name}.out"
+    assert len(mc.io.snapshots(outdir)) == 5
+    for i in range(3):
+        assert (outdir / f"table_stage{i}.txt").exists()
+
+    assert [type(stage.driver) for stage in system.stages] == [
+        mc.RelaxDriver,
+        mc.MinDriver,
+        mc.TimeDriver,
+    ]
+    assert [len(stage.table.data) for stage in system.stages] == [1, 1, 3]
+    assert np.allclose(system.stages[1].table.data["maxtorque"], 0.002)
+    assert np.allclose(system.stages[2].table.data["t"], [0, 1e-12, 2e-12])
+    for stage in system.stages:
+        assert np.allclose(stage.m.norm.array, system.m.norm.array)
+    assert system.table is system.stages[-1].table
+    assert system.drive_number == 1
+
+    with open(drivedir / "info.json", encoding="utf-8") as f:
+        info = json.load(f)
+    assert info["stages"][2]["t"] == 3e-12
+    assert info["stages"][0]["driver"].startswith("RelaxDriver(")
+
+
+def test_estimate(pipeline):
+    system = mm.examples.macrospin()
+    report = mc.estimate(system, pipeline)
+    time = mc.estimate(system, pipeline.stages[2][0], t=3e-12, n=3)
+    assert report["solver"] == [3, 0, 3]
+    assert report["cost"] > time["cost"]
+    assert report["output_bytes"] > time["output_bytes"]
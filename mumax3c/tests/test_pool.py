@@ -0,0 +1,113 @@
+import concurrent.futures
+import json
+import sys
+import textwrap
+
+import pytest
+
+import mumax3c as mc
+
+FAKE_MUMAX3 = textwrap.dedent(
+    """\
+    import json
+    import os
+    import sys
+    import time
+
+    start = time.time()
+    time.sleep(0.2)
+    with open(sys.argv[-1], "a", encoding="utf-8") as f:
+        record = {
+            "args": sys.argv[1:-1],
+            "env": os.environ.get("CUDA_VISIBLE_DEVICES"),
+            "start": start,
+            "end": time.time(),
+        }
+        f.write(json.dumps(record) + "\\n")
+    """
+)
+
+
+@pytest.fixture
+def fake_mumax3(tmp_path):
+    exe = tmp_path / "fake_mumax3.py"
+    exe.write_text(FAKE_MUMAX3, encoding="utf-8")
+    return [sys.executable, str(exe)]
+
+
+def read_records(logfile):
+    with open(logfile, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def overlap(r1, r2):
+    return r1["start"] < r2["end"] and r2["start"] < r1["end"]
+
+
+@pytest.mark.parametrize("method", ["flag", "env"])
+def test_pool_scheduling(fake_mumax3, tmp_path, method):
+    pool = mc.mumax3.Mumax3RunnerPool(
+        fake_mumax3, devices=[0, 1], method=method, lockdir=tmp_path / "locks"
+    )
+    logfile = str(tmp_path / "log.jsonl")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: pool.call(logfile), range(5)))
+    assert all(res.returncode == 0 for res in results)
+
+    records = read_records(logfile)
+    assert len(records) == 5
+    if method == "flag":
+        devices = [int(r["args"][1]) for r in records]
+        assert all(r["args"][0] == "-gpu" for r in records)
+    else:
+        devices = [int(r["env"]) for r in records]
+    assert set(devices) == {0, 1}
+
+    # jobs on the same device never run concurrently
+    for i, r1 in enumerate(records):
+        for r2, device in zip(records[i + 1 :], devices[i + 1 :]):
+            if device == devices[i]:
+                assert not overlap(r1, r2)
+
+    stats = pool.stats
+    assert sum(s["jobs"] for s in stats.values()) == 5
+    assert all(s["busy_time"] > 0 for s in stats.values())
+    assert sum(s["wait_time"] for s in stats.values()) > 0  # 5 jobs, 2 slots
+    assert all(0 < s["utilisation"] <= 1 for s in stats.values())
+
+
+def test_pool_shared_between_pools(fake_mumax3, tmp_path):
+    # Two pools (e.g. in different notebooks) sharing a lockdir share the device.
+    pools = [
+        mc.mumax3.Mumax3RunnerPool(fake_mumax3, devices=1, lockdir=tmp_path)
+        for _ in range(2)
+    ]
+    logfile = str(tmp_path / "log.jsonl")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda pool: pool.call(logfile), pools))
+    r1, r2 = read_records(logfile)
+    assert not overlap(r1, r2)
+
+
+def test_pool_timeout(fake_mumax3, tmp_path):
+    pool = mc.mumax3.Mumax3RunnerPool(fake_mumax3, devices=1, lockdir=tmp_path)
+    with pool.device() as device:
+        assert device == 0
+        with pytest.raises(TimeoutError), pool.device(timeout=0.2):
+            pass
+    with pool.device(timeout=0.2) as device:
+        assert device == 0
+
+
+def test_pool_arguments(fake_mumax3):
+    pool = mc.mumax3.Mumax3RunnerPool(fake_mumax3, devices=3, jobs_per_device=2)
+    assert pool.devices == [0, 1, 2]
+    assert len(pool.slots) == 6
+    assert pool._call("test.mx3", dry_run=True).endswith("fake_mumax3.py test.mx3")
+
+    with pytest.raises(ValueError):
+        mc.mumax3.Mumax3RunnerPool(fake_mumax3, devices=[])
+    with pytest.raises(ValueError):
+        mc.mumax3.Mumax3RunnerPool(fake_mumax3, jobs_per_device=0)
+    with pytest.raises(ValueError):
+        mc.mumax3.Mumax3RunnerPool(fake_mumax3, method="mps")
@@ -0,0 +1,124 @@
+import datetime
+import json
+import subprocess as sp
+import time
+
+import micromagneticmodel as mm
+import numpy as np
+
+import mumax3c as mc
+
+HEADER = "# t (s)\tmx ()\tmy ()\tmz ()\tE_total (J)\tdt (s)\tmaxTorque (T)\tstep ()\n"
+
+
+def row(i):
+    return f"{i}e-12\t0.1\t0.2\t0.9\t-1e-20\t1e-14\t0.0{i}\t{10 * i}\n"
+
+
+def test_table_tail(tmp_path):
+    filename = tmp_path / "table.txt"
+    tail = mc.io.TableTail(filename)
+    assert tail.read().size == 0  # file does not exist yet
+
+    filename.write_text(HEADER[:10], encoding="utf-8")
+    assert tail.read().size == 0  # incomplete header
+    assert tail.columns is None
+
+    filename.write_text(HEADER + row(1) + row(2)[:5], encoding="utf-8")
+    rows = tail.read()
+    assert tail.columns == [
+        "t",
+        "mx",
+        "my",
+        "mz",
+        "E_total",
+        "dt",
+        "maxTorque",
+        "step",
+    ]
+    assert rows.shape == (1, 8)
+    assert np.isclose(rows[0, 0], 1e-12)
+
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(row(2)[5:] + row(3))
+    rows = tail.read()
+    assert rows.shape == (2, 8)
+    assert np.allclose(rows[:, -1], [20, 30])
+    assert tail.read().shape == (0, 8)
+
+    # continue from a saved offset
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(row(4))
+    new_tail = mc.io.TableTail(filename, offset=tail.offset)
+    rows = new_tail.read()
+    assert rows.shape == (1, 8)
+    assert np.isclose(rows[0, 0], 4e-12)
+
+
+def test_progress_monitor(tmp_path):
+    filename = tmp_path / "table.txt"
+    received = []
+
+    def failing_callback(metrics):
+        raise RuntimeError("callback errors must not stop the monitor")
+
+    monitor = mc.mumax3.ProgressMonitor(
+        filename, callbacks=[received.append, failing_callback], interval=0.01
+    )
+    monitor.start()
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for i in range(1, 4):
+            f.write(row(i))
+            f.flush()
+            time.sleep(0.05)
+    monitor.terminate()
+
+    assert len(received) >= 1
+    metrics = received[-1]
+    assert metrics == monitor.metrics
+    assert metrics["rows"] == 3
+    assert np.isclose(metrics["t"], 3e-12)
+    assert metrics["step"] == 30
+    assert np.isclose(metrics["dt"], 1e-14)
+    assert np.isclose(metrics["maxtorque"], 0.03)
+    assert metrics["rate"] > 0
+    assert metrics["steps_per_second"] > 0
+    assert metrics["elapsed"] > 0
+    assert monitor.offset == filename.stat().st_size
+
+
+class TableWritingRunner(mc.mumax3.Mumax3Runner):
+    """Runner writing a table like mumax3 without running a simulation."""
+
+    def _call(self, argstr, need_stderr=False, dry_run=False):
+        name = argstr.removesuffix(".mx3")
+        with open(f"{name}.mx3", encoding="utf-8") as f:
+            assert 'TableAddVar(step, "step", "")' in f.read()
+        with open(f"{name}.out/table.txt", "w", encoding="utf-8") as f:
+            f.write(HEADER)
+            for i in range(1, 3):
+                f.write(row(i))
+                f.flush()
+                time.sleep(0.05)
+        return sp.CompletedProcess(args=[argstr], returncode=0)
+
+
+def test_drive_progress(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mc.mumax3.ProgressMonitor, "INTERVAL", 0.01)
+    system = mm.examples.macrospin()
+    (tmp_path / f"{system.name}.out").mkdir()
+    received = []
+
+    td = mc.TimeDriver()
+    kwargs = dict(t=2e-12, n=2, progress=received.append)
+    td.drive_kwargs_setup(kwargs)
+    td.write_mx3(system, **kwargs)
+    td._write_info_json(system, datetime.datetime.now(), **kwargs)
+    td._call(system, runner=TableWritingRunner(), verbose=0, **kwargs)
+
+    assert received[-1]["rows"] == 2
+    assert np.isclose(received[-1]["t"], 2e-12)
+    with open("info.json", encoding="utf-8") as f:
+        assert "progress" not in json.load(f)
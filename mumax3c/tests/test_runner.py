@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import textwrap
+import threading
+
+import pytest
+
+import mumax3c as mc
+
+FAKE_MUMAX3 = textwrap.dedent(
+    """\
+    #!{python}
+    import sys
+
+    with open(__file__ + ".calls", "a", encoding="utf-8") as f:
+        f.write(" ".join(sys.argv[1:]) + "\\n")
+    print("//mumax 3.10 linux_amd64 go1.20 (gc)")
+    print("//GPU info: Fake GPU(1024MB), cc=7.5")
+    sys.exit({returncode})
+    """
+)
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MUMAX3C_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def make_exe(path, returncode=0):
+    path.write_text(
+        FAKE_MUMAX3.format(python=sys.executable, returncode=returncode),
+        encoding="utf-8",
+    )
+    path.chmod(0o755)
+    return path
+
+
+def calls(exe):
+    calls = exe.with_name(exe.name + ".calls")
+    return calls.read_text(encoding="utf-8").splitlines() if calls.exists() else []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires executable scripts")
+def test_probe(tmp_path, cache, capsys):
+    exe = make_exe(tmp_path / "mumax3")
+    runner = mc.mumax3.ExeMumax3Runner(str(exe))
+
+    probe = runner.probe()
+    assert probe == {
+        "available": True,
+        "executable": str(exe.resolve()),
+        "version": "3.10",
+        "device": "Fake GPU(1024MB), cc=7.5",
+    }
+    assert calls(exe) == ["-version"]
+
+    # cached, also for new runners (e.g. in other processes)
+    assert mc.mumax3.ExeMumax3Runner(str(exe)).probe() == probe
+    assert len(calls(exe)) == 1
+    with open(cache / "probe.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 1
+
+    assert runner.status == 0
+    assert "mumax3 found (3.10, Fake GPU(1024MB), cc=7.5)." in capsys.readouterr().out
+    assert len(calls(exe)) == 1
+
+    # a modified executable invalidates the cache
+    stat = exe.stat()
+    os.utime(exe, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert runner.probe() == probe
+    assert len(calls(exe)) == 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires executable scripts")
+def test_probe_concurrent(tmp_path, cache):
+    exe = make_exe(tmp_path / "mumax3")
+    runner = mc.mumax3.ExeMumax3Runner(str(exe))
+    cache.mkdir()
+    # a partially written cache is a cache miss
+    (cache / "probe.json").write_text('{"other": {"mti', encoding="utf-8")
+    assert runner.probe()["available"]
+    assert len(calls(exe)) == 1
+
+    # entries written by other processes while probing are kept
+    def probe_other(*args, **kwargs):
+        other = {"other": {"mtime": 0, "probe": {}}}
+        (cache / "probe.json").write_text(json.dumps(other), encoding="utf-8")
+        return run(*args, **kwargs)
+
+    run = mc.mumax3.mumax3.sp.run
+    exe.touch()  # invalidates the cache entry
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(mc.mumax3.mumax3.sp, "run", probe_other)
+        runner.probe()
+    with open(cache / "probe.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 2
+
+    # the cache is only updated while holding the lock
+    exe.touch()
+    with mc.mumax3.mumax3._file_lock(cache / "probe.lock"):
+        thread = threading.Thread(target=runner.probe)
+        thread.start()
+        thread.join(timeout=1)
+        assert thread.is_alive()
+    thread.join()
+    assert not list(cache.glob("*.tmp"))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires executable scripts")
+def test_probe_unavailable(tmp_path, cache):
+    exe = make_exe(tmp_path / "mumax3", returncode=1)
+    runner = mc.mumax3.ExeMumax3Runner(str(exe))
+    assert not runner.probe()["available"]
+    assert runner.status == 1
+    # failed probes are not cached
+    assert not (cache / "probe.json").exists()
+
+    runner = mc.mumax3.ExeMumax3Runner(str(tmp_path / "does_not_exist"))
+    assert runner.probe()["executable"] is None
+    assert runner.status == 1
+
+    with pytest.raises(ValueError):
+        mc.runner.runner = runner
+
+
+def test_deep_check(fake_runner, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    # runners that cannot be probed run a simulation
+    assert fake_runner.probe() is None
+    assert fake_runner.status == 0
+    assert len(fake_runner.calls) == 1
+    assert fake_runner.check(deep=True) == 0
+    assert len(fake_runner.calls) == 2
+    assert "mumax3 found and running." in capsys.readouterr().out
+
+    fake_runner.returncode = 1
+    assert fake_runner.check(deep=True) == 1
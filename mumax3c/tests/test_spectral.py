@@ -0,0 +1,107 @@
+import discretisedfield as df
+import numpy as np
+import pandas as pd
+import pytest
+import ubermagtable as ut
+
+import mumax3c as mc
+
+F1, F2, DT = 4e9, 1e10, 2.5e-11
+
+
+@pytest.fixture
+def mesh():
+    subregions = {
+        "left": df.Region(p1=(0, 0, 0), p2=(2e-9, 2e-9, 1e-9)),
+        "right": df.Region(p1=(2e-9, 0, 0), p2=(4e-9, 2e-9, 1e-9)),
+    }
+    return df.Mesh(
+        p1=(0, 0, 0), p2=(4e-9, 2e-9, 1e-9), n=(4, 2, 1), subregions=subregions
+    )
+
+
+def snapshot(mesh, t):
+    """Left half oscillating at F1 in x, right half at F2 in y."""
+    array = np.zeros((*mesh.n, 3))
+    array[..., 2] = 1
+    array[:2, ..., 0] = 0.1 * np.cos(2 * np.pi * F1 * t)
+    array[2:, ..., 1] = 0.05 * np.sin(2 * np.pi * F2 * t)
+    return df.Field(mesh, nvdim=3, value=array)
+
+
+def test_spectral_analysis(mesh):
+    analysis = mc.spectral.SpectralAnalysis(mesh, frequencies=[F1, F2])
+    for t in np.arange(400) * DT:
+        analysis.add(t, snapshot(mesh, t))
+    assert len(analysis) == 400
+    assert analysis.dt == pytest.approx(DT)
+
+    spectrum = analysis.spectrum()
+    assert list(spectrum.columns[:3]) == ["mx", "my", "mz"]
+    assert spectrum["mx_left"].idxmax() == pytest.approx(F1)
+    assert spectrum["mx_left"].max() == pytest.approx(0.1)
+    assert spectrum["my_right"].idxmax() == pytest.approx(F2)
+    assert spectrum["mx"].max() == pytest.approx(0.05)  # average of both halves
+    assert np.allclose(spectrum["mz"], 0)
+
+    modes = analysis.modes
+    assert np.allclose(modes[F1].abs.array[:2, ..., 0], 0.1)
+    assert np.allclose(modes[F1].abs.array[2:], 0, atol=1e-12)
+    assert np.allclose(modes[F2].abs.array[2:, ..., 1], 0.05)
+    assert np.allclose(modes[F2].phase.array[2:, ..., 1], -np.pi / 2)
+
+    with pytest.raises(ValueError):
+        analysis.add(0, np.zeros((2, 2, 1, 3)))
+
+
+def test_not_equidistant(mesh):
+    analysis = mc.spectral.SpectralAnalysis(mesh)
+    for t in [0, 1e-12, 3e-12]:
+        analysis.add(t, snapshot(mesh, t))
+    with pytest.raises(ValueError):
+        analysis.spectrum()
+
+
+def test_analyse(mesh, tmp_path):
+    outdir = tmp_path / "system.out"
+    outdir.mkdir()
+    times = np.arange(100) * DT
+    with open(outdir / "table.txt", "w", encoding="utf-8") as f:
+        f.write("# t (s)\tmx ()\tmy ()\tmz ()\n")
+        for i, t in enumerate(times):
+            snapshot(mesh, t).to_file(str(outdir / f"m_full{i:06d}.ovf"))
+            f.write(f"{t}\t0\t0\t1\n")
+
+    analysis = mc.spectral.analyse(tmp_path, frequencies=[F1], regions={})
+    assert len(analysis) == 100
+    assert list(analysis.spectrum().columns) == []
+    assert np.allclose(analysis.modes[F1].abs.array[:2, ..., 0], 0.1, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        mc.spectral.analyse(outdir, times=times[:10])
+    with pytest.raises(FileNotFoundError):
+        mc.spectral.analyse(outdir / "missing")
+
+
+def test_rounded_times():
+    # mumax3 prints single-precision times and adaptive steps end close to,
+    # but not exactly at, the sampling times.
+    rng = np.random.default_rng(0)
+    dt = 1e-11 / 3
+    times = 1e-8 + np.arange(2000) * dt
+    times += rng.uniform(-1e-16, 1e-16, times.shape)
+    times = np.array([float(f"{t:.7g}") for t in times])
+    assert not np.allclose(np.diff(times), dt, rtol=1e-3, atol=0)
+    assert mc.spectral._interval(times) == pytest.approx(dt, rel=1e-6)
+
+    data = pd.DataFrame(
+        {"t": times, "mx": np.cos(2 * np.pi * 3e10 * (times - times[0]))}
+    )
+    table = ut.Table(data=data, units={"t": "s", "mx": ""}, x="t")
+    spectrum = mc.spectral.table_spectrum(table)
+    assert spectrum["mx"].idxmax() == pytest.approx(3e10, rel=1e-2)
+
+    with pytest.raises(ValueError):
+        mc.spectral._interval(np.r_[times[:-1], times[-1] + dt / 10])
+    with pytest.raises(ValueError):
+        mc.spectral._interval(times[::-1])
@@ -0,0 +1,86 @@
+import pathlib
+
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    return mm.examples.macrospin()
+
+
+def test_scratch(system, fake_runner, tmp_path, monkeypatch):
+    scratch = tmp_path / "scratch"
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    m0 = system.m.orientation.array
+    td = mc.TimeDriver()
+    td.drive(system, t=5e-12, n=5, runner=fake_runner, scratch=scratch, abspath=False)
+
+    # mumax3 ran in the scratch directory, with relative paths
+    assert fake_runner.calls == [f"{system.name}.mx3"]
+    assert list(scratch.iterdir()) == []
+    assert pathlib.Path.cwd() == workdir
+
+    drivedir = workdir / system.name / "drive-0"
+    names = {path.name for path in drivedir.iterdir()}
+    assert {f"{system.name}.mx3", "m0.omf", "info.json", "telemetry.json"} <= names
+    assert len(mc.io.snapshots(drivedir / f"{system.name}.out")) == 5
+    assert len(system.table.data) == 5
+    assert np.allclose(system.m.orientation.array, m0)
+
+    monkeypatch.setenv("MUMAX3C_SCRATCH", str(scratch))
+    td.drive(system, t=5e-12, n=5, runner=fake_runner, scratch=True, abspath=False)
+    assert (workdir / system.name / "drive-1" / "info.json").exists()
+    # not chained to drive-0 with a path relative to the scratch directory
+    mx3 = (workdir / system.name / "drive-1" / f"{system.name}.mx3").read_text()
+    assert 'm.LoadFile("m0.omf")' in mx3
+    assert (workdir / system.name / "drive-1" / "m0.omf").exists()
+    assert list(scratch.iterdir()) == []
+
+
+def test_scratch_failure(system, fake_runner, tmp_path):
+    scratch = tmp_path / "scratch"
+    fake_runner.returncode = 1
+    td = mc.TimeDriver()
+    with pytest.raises(RuntimeError):
+        td.drive(
+            system,
+            t=5e-12,
+            n=5,
+            dirname=tmp_path,
+            runner=fake_runner,
+            scratch=scratch,
+            abspath=False,
+        )
+    # the output of failed runs is kept in the drive directory
+    drivedir = tmp_path / system.name / "drive-0"
+    assert (drivedir / f"{system.name}.out" / "table.txt").exists()
+    assert (drivedir / "info.json").exists()
+    assert list(scratch.iterdir()) == []
+
+
+def test_scratch_dry_run(system, fake_runner, tmp_path, monkeypatch):
+    scratch = tmp_path / "scratch"
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    td = mc.TimeDriver()
+    td.drive(system, t=5e-12, n=5, runner=fake_runner, scratch=scratch, dry_run=True)
+    assert fake_runner.calls == []
+    assert pathlib.Path.cwd() == workdir
+    assert td._workingdir is None
+    assert list(scratch.iterdir()) == []
+    drivedir = workdir / system.name / "drive-0"
+    assert (drivedir / f"{system.name}.mx3").exists()
+    assert not (drivedir / f"{system.name}.out").exists()
+
+    # the next drive is staged from the working directory
+    td.drive(system, t=5e-12, n=5, runner=fake_runner, scratch=scratch)
+    assert (
+        len(mc.io.snapshots(workdir / system.name / "drive-1" / "macrospin.out")) == 5
+    )
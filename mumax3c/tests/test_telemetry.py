@@ -0,0 +1,128 @@
+import json
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import mumax3c as mc
+
+
+def make_system(name="telemetry"):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 3e-9), n=(10, 5, 3))
+    system = mm.System(name=name)
+    system.energy = mm.Exchange(A=1e-12) + mm.Zeeman(H=(0, 0, 1e5))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=1)
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0.1, 1), norm=8e5)
+    return system
+
+
+@pytest.fixture
+def system():
+    return make_system()
+
+
+def test_telemetry_sidecar(system, fake_runner, tmp_path):
+    mc.TimeDriver().drive(system, dirname=tmp_path, t=1e-12, n=3, runner=fake_runner)
+
+    with open(tmp_path / system.name / "drive-0" / "telemetry.json") as f:
+        telemetry = json.load(f)
+
+    assert telemetry["system"] == system.name
+    assert telemetry["drive_number"] == 0
+    assert telemetry["driver"] == "TimeDriver"
+    assert telemetry["runner"] == "FakeMumax3Runner"
+    assert telemetry["cells"] == 150
+    assert telemetry["mesh_n"] == [10, 5, 3]
+    assert telemetry["regions"] == 1
+    assert telemetry["returncode"] == 0
+    assert telemetry["success"]
+    assert set(telemetry["phases"]) == {
+        "write_inputs",
+        "write_ovf",
+        "regions",
+        "zeeman",
+        "script",
+        "run",
+        "read",
+    }
+    assert all(time >= 0 for time in telemetry["phases"].values())
+    assert set(telemetry["files_written"]) == {
+        "m0.omf",
+        "B_ext.ovf",
+        "telemetry.mx3",
+    }
+    assert telemetry["bytes_written"] == sum(telemetry["files_written"].values())
+    assert telemetry["bytes_read"] > 0
+
+
+def test_telemetry_failed_drive(system, fake_runner, tmp_path):
+    fake_runner.returncode = 1
+    with pytest.raises(RuntimeError):
+        mc.TimeDriver().drive(
+            system,
+            dirname=tmp_path,
+            t=1e-12,
+            n=1,
+            runner=fake_runner,
+        )
+
+    with open(tmp_path / system.name / "drive-0" / "telemetry.json") as f:
+        telemetry = json.load(f)
+    assert telemetry["returncode"] == 1
+    assert not telemetry["success"]
+    assert "run" in telemetry["phases"]
+    assert "read" not in telemetry["phases"]
+
+
+def test_collect(system, fake_runner, tmp_path):
+    td = mc.TimeDriver()
+    td.drive(system, dirname=tmp_path, t=1e-12, n=2, runner=fake_runner)
+    mc.RelaxDriver().drive(system, dirname=tmp_path, runner=fake_runner)
+    td.drive(make_system("other"), dirname=tmp_path, t=1e-12, n=2, runner=fake_runner)
+
+    table = mc.telemetry.collect(tmp_path)
+    assert len(table) == 3
+    assert list(table["system"]) == ["other", "telemetry", "telemetry"]
+    assert list(table["drive_number"]) == [0, 0, 1]
+    assert list(table["driver"]) == ["TimeDriver", "TimeDriver", "RelaxDriver"]
+    for column in ["run_time", "read_time", "script_time", "write_ovf_time"]:
+        assert (table[column] >= 0).all()
+    assert (table["bytes_written"] > 0).all()
+
+    assert len(mc.telemetry.collect(tmp_path / "telemetry")) == 2
+
+
+def test_telemetry_inactive(system, tmp_path):
+    # Writing files without an active telemetry must not fail.
+    assert mc.telemetry.current() is None
+    mc.scripts.util.write_field(system.m, tmp_path / "m.omf")
+    mc.telemetry.record(cells=1)
+    with mc.telemetry.phase("script"):
+        pass
+
+
+def test_telemetry_memory(system, fake_runner, tmp_path):
+    system.dynamics += mm.ZhangLi(u=100, beta=0.5)
+    mc.TimeDriver().drive(
+        system, dirname=tmp_path, t=1e-12, n=3, runner=fake_runner, memory=True
+    )
+    with open(tmp_path / system.name / "drive-0" / "telemetry.json") as f:
+        memory = json.load(f)["memory"]
+    assert {"write_inputs", "regions", "zeeman", "zhang_li", "read"} <= set(memory)
+    # nested phases: the peak of a phase includes the peaks of its sub-phases
+    assert memory["write_inputs"]["peak"] >= memory["zhang_li"]["peak"] > 0
+    assert all(phase["max_rss"] > 0 for phase in memory.values())
+
+    table = mc.telemetry.collect(tmp_path)
+    assert table.loc[0, "regions_peak_memory"] == memory["regions"]["peak"]
+
+
+def test_track_memory():
+    with mc.telemetry.track_memory("outer") as telemetry:
+        with mc.telemetry.phase("inner"):
+            array = bytearray(10**6)
+        del array
+    assert telemetry.memory["inner"]["peak"] >= 10**6
+    assert telemetry.memory["outer"]["peak"] >= 10**6
+    assert telemetry.memory["outer"]["allocated"] < 10**6
+    assert "memory" not in mc.telemetry.Telemetry().to_dict()
@@ -0,0 +1,180 @@
+import math
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import mumax3c as mc
+
+
+@pytest.fixture
+def system():
+    subregions = {
+        "left": df.Region(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9)),
+        "right": df.Region(p1=(5e-9, 0, 0), p2=(10e-9, 5e-9, 5e-9)),
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), n=(2, 1, 1), subregions=subregions
+    )
+    system = mm.System(name="zhangli")
+    system.energy = mm.Exchange(A=1e-11)
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    return system
+
+
+def script(system, u, **kwargs):
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.ZhangLi(
+        u=u, beta=0.5, **kwargs
+    )
+    mc.scripts.util.mumax3_regions(system)
+    return mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=10)
+
+
+def test_pulse():
+    pulse = mc.timedependence.Pulse(width=1e-9, amplitude=2)
+    assert pulse(-1e-10) == 0 and pulse(5e-10) == 2
+    assert pulse.expression == "2 * (heaviside(t - 0) * heaviside(0 + 1e-09 - t))"
+    with pytest.raises(ValueError):
+        mc.timedependence.Pulse(width=0)
+
+
+def test_sine():
+    sine = mc.timedependence.Sine(frequency=1e9, phase=np.pi / 2, offset=1)
+    assert sine(0) == pytest.approx(2)
+    assert sine.expression == (f"1 + sin(2 * pi * 1000000000.0 * t + {np.pi / 2})")
+
+
+def test_table():
+    table = mc.timedependence.Table(times=[1e-9, 2e-9], values=[3, 3])
+    assert table(0) == 0 and table(2.5e-9) == 3
+    assert table.expression == "3.0 * heaviside(t - 1e-09)"
+    assert mc.timedependence.Table([0], [0]).expression == "0"
+    with pytest.raises(ValueError):
+        mc.timedependence.Table(times=[1, 0], values=[1, 2])
+    with pytest.raises(ValueError):
+        mc.timedependence.Table(times=[0, 1], values=[1])
+
+    table = mc.timedependence.Table.sample(lambda t: t > 1, dt=0.5, t=2)
+    assert table.times.tolist() == [0, 0.5, 1, 1.5, 2]
+    assert table.expression == "1.0 * heaviside(t - 1.5)"
+    assert mc.timedependence.expression() == "1"
+    with pytest.raises(ValueError):
+        mc.timedependence.expression(math.sin)
+    with pytest.raises(TypeError):
+        mc.timedependence.TimeDependence()
+    with pytest.raises(ValueError, match="Pulse, Sine or Table"):
+        mc.timedependence.Table.sample(math.sin, dt=1e-13, t=1e-9)
+
+
+def test_uniform_current(system, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    factor = mc.scripts.driver._current_factor(mm.ZhangLi(u=1, beta=0.5))
+    j = 100 * factor * 8e5
+    mx3 = script(system, u=100)
+    assert f"J = vector({j}, 0.0, 0.0)\n" in mx3
+    assert "J.add" not in mx3
+    assert not (tmp_path / "j.ovf").exists()
+
+    pulse = mc.timedependence.Pulse(width=1e-10)
+    mx3 = script(system, u=(0, 0, 100), func=pulse)
+    assert f"J = vector(0.0 * ({pulse.expression}), " in mx3
+
+
+def test_region_current(system, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system.m.norm = {"left": 8e5, "right": 4e5}
+    mx3 = script(system, u=100, func=mc.timedependence.Sine(frequency=1e9))
+    factor = mc.scripts.driver._current_factor(mm.ZhangLi(u=1, beta=0.5))
+    sine = "sin(2 * pi * 1000000000.0 * t)"
+    assert f"J.setregion(0, vector({100 * factor * 8e5} * ({sine})," in mx3
+    assert f"J.setregion(1, vector({100 * factor * 4e5} * ({sine})," in mx3
+
+    mx3 = script(system, u={"right": (0, 50, 0)})
+    assert f"J.setregion(1, vector(0.0, {50 * factor * 4e5}, 0.0))\n" in mx3
+    assert "J.setregion(0" not in mx3
+    assert not (tmp_path / "j.ovf").exists()
+
+
+def test_field_current(system, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    u = df.Field(system.m.mesh, nvdim=1, value=100)
+    mx3 = script(system, u=u, func=lambda t: 1, dt=5e-10)
+    path = (tmp_path / "j.ovf").as_posix()
+    assert f'J.add(LoadFile("{path}"), 1.0 * heaviside(t - 0.0))\n' in mx3
+    j = df.Field.from_file(path)
+    factor = mc.scripts.driver._current_factor(mm.ZhangLi(u=1, beta=0.5))
+    assert np.allclose(j.array, [100 * factor * 8e5, 0, 0])
+
+
+def count_writes(monkeypatch):
+    writes = []
+    write_field = mc.scripts.util.write_field
+
+    def counting(*args, **kwargs):
+        writes.append(args)
+        write_field(*args, **kwargs)
+
+    monkeypatch.setattr(mc.scripts.util, "write_field", counting)
+    return writes
+
+
+def test_cached_current(system, tmp_path, monkeypatch):
+    writes = count_writes(monkeypatch)
+    u = df.Field(system.m.mesh, nvdim=3, value=(100, 0, 0))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.ZhangLi(u=u, beta=0.5)
+    (term,) = system.dynamics.get(type=mm.ZhangLi)
+    drive_0, drive_1 = tmp_path / "drive-0", tmp_path / "drive-1"
+    for dirname in [drive_0, drive_1]:
+        dirname.mkdir()
+        monkeypatch.chdir(dirname)
+        mx3 = mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    # The second drive loads the profile written by the first one.
+    assert len(writes) == 1
+    assert f'LoadFile("{(drive_0 / "j.ovf").as_posix()}")' in mx3
+    assert not (drive_1 / "j.ovf").exists()
+    # Relative paths only refer to the current directory.
+    mx3 = mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1, abspath=False)
+    assert len(writes) == 2 and 'LoadFile("j.ovf")' in mx3
+
+    norm = system.m.norm  # magnetisation read after a drive
+    system.m.array = np.float32([[[[0.6, 0, 0.8]]], [[[0, 1, 0]]]])
+    system.m.norm = norm
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 2
+
+    term.u.array[0, 0, 0, 1] = 50  # modified in place
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 3
+    j = df.Field.from_file(drive_1 / "j.ovf")
+    factor = mc.scripts.driver._current_factor(term)
+    assert np.allclose(j.array[0, 0, 0], [100 * factor * 8e5, 50 * factor * 8e5, 0])
+
+    system.m.norm = 4e5  # saturation magnetisation changed
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 4
+    (drive_1 / "j.ovf").unlink()  # e.g. deleted drive directory
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 5
+    term.u = df.Field(system.m.mesh, nvdim=3, value=(100, 0, 0))
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 6
+    mc.scripts.driver_script(mc.TimeDriver(), system, t=1e-9, n=1)
+    assert len(writes) == 6
+
+
+def test_pipeline_current(system, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    u = df.Field(system.m.mesh, nvdim=3, value=(100, 0, 0))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.ZhangLi(
+        u=u, beta=0.5, func=lambda t: t, dt=1e-9
+    )
+    mc.scripts.util.mumax3_regions(system)
+    stage = (mc.TimeDriver(), dict(t=1e-9, n=1))
+    pipeline = mc.PipelineDriver(stages=[stage, mc.RelaxDriver(), stage])
+    writes = count_writes(monkeypatch)
+    mx3 = mc.scripts.driver_script(pipeline, system)
+    assert len(writes) == 1  # the profile is written once
+    assert mx3.count("J.RemoveExtraTerms()") == 3
+    # The second time stage samples the time dependence up to t = 2 ns.
+    assert "1e-09 * heaviside(t - 2e-09)" in mx3.split("// Stage 2")[1]
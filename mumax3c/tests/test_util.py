@@ -15,7 +15,7 @@ def test_mumax3_regions__no_subregion():
     assert np.allclose(subregion_values, 0)
     assert len(subregions_dict) == 1
 
-    mc.scripts.mumax3_regions(system)
+    mc.scripts.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(subregions.array, 0.0)
     assert hasattr(system, "region_relator")
@@ -37,7 +37,7 @@ def test_mumax3_regions__two_subregions():
     assert len(subregions_dict) == 3
     assert subregions_dict == {0: "", 1: "r1", 2: "r2"}
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0.0, 1.0])
     assert hasattr(system, "region_relator")
@@ -65,7 +65,7 @@ def test_mumax3_regions__two_subregions_gap_ms():
     assert len(subregions_dict) == 3
     assert subregions_dict == {0: "", 1: "r1", 2: "r2"}
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
     assert hasattr(system, "region_relator")
@@ -79,7 +79,7 @@ def test_mumax3_regions__two_subregions_gap_ms():
 
     system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=ms_fun)
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0, 1, 2, 255])
     assert hasattr(system, "region_relator")
@@ -100,7 +100,7 @@ def test_identify_subregions__two_overlaping_subregions():
     assert subregion_values[1, 1, 1, 0] == 2
     assert len(subregions_dict) == 3
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0, 1])
     assert hasattr(system, "region_relator")
@@ -119,7 +119,7 @@ def test_identify_subregions__two_overlaping_subregions():
     assert subregion_values[1, 1, 1, 0] == 1
     assert len(subregions_dict) == 3
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0])
     assert hasattr(system, "region_relator")
@@ -142,7 +142,7 @@ def test_identify_subregions__three_subregions():
     assert subregion_values[1, 1, 2, 0] == 3
     assert len(subregions_dict) == 4
 
-    mc.scripts.util.mumax3_regions(system)
+    mc.scripts.util.mumax3_regions(system, shapes=False)
     subregions = df.Field.from_file("mumax3_regions.omf")
     assert np.allclose(np.unique(subregions.array), [0, 1, 2])
     assert hasattr(system, "region_relator")
@@ -163,4 +163,93 @@ def test_mumax3_regions__too_many_ms():
 
     system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=ms_fun)
     with pytest.raises(ValueError):
-        mc.scripts.mumax3_regions(system)
+        mc.scripts.mumax3_regions(system, shapes=False)
+
+
+def test_mumax3_regions__shapes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subregions = {"r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 4e-9, 1e-9))}
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(4e-9, 4e-9, 2e-9), n=(4, 4, 2), subregions=subregions
+    )
+    system = mm.System(name="test")
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1)
+
+    mx3 = mc.scripts.mumax3_regions(system)
+    assert (
+        "DefRegion(1, cuboid(2e-09, 4e-09, 1e-09).transl(-1e-09, 0.0, -5e-10))" in mx3
+    )
+    assert "universe" not in mx3
+    assert "LoadFile" not in mx3
+    assert not (tmp_path / "mumax3_regions.omf").exists()
+    assert system.region_relator == {"": [0], "r1": [1]}
+
+    # vacuum around a box: vacuum is the background
+    system.m = df.Field(
+        mesh, nvdim=3, value=(0, 0, 1), norm={"r1": 1, "default": 0}, valid="norm"
+    )
+    mx3 = mc.scripts.mumax3_regions(system)
+    assert "DefRegion(255, universe())" in mx3
+    assert (
+        "DefRegion(0, cuboid(2e-09, 4e-09, 1e-09).transl(-1e-09, 0.0, -5e-10))" in mx3
+    )
+    assert not (tmp_path / "mumax3_regions.omf").exists()
+
+
+def test_region_shapes():
+    indices = np.zeros((4, 3, 1, 1))
+    indices[1:3, 1:, 0] = 1
+    assert mc.scripts.util.region_shapes(indices, (1, 1, 1)) == (
+        "DefRegion(1, cuboid(2, 2, 1).transl(0.0, 0.5, 0.0))\n"
+    )
+    indices[0, 0] = 2
+    indices[3, 0] = 2  # region 2 and 0 are not boxes
+    assert mc.scripts.util.region_shapes(indices, (1, 1, 1)) is None
+
+
+class FailingField:
+    def to_file(self, filename, representation):
+        raise OSError(f"Cannot write {filename}.")
+
+
+def test_concurrent_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 2e-9, 2e-9), n=(4, 2, 2))
+    system = mm.System(name="concurrent")
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    H = df.Field(mesh, nvdim=3, value=(1, 0, 0))
+    system.energy = mm.Zeeman(H=H) + mm.Zeeman(H=2 * H, name="zeeman2")
+    mc.scripts.util.mumax3_regions(system, shapes=False)
+
+    telemetry = mc.telemetry.Telemetry(memory=True)
+    with telemetry.activate(), mc.scripts.util.concurrent_writes(max_workers=2):
+        mx3 = mc.scripts.energy_script(system, ovf_format="bin4", abspath=False)
+        mc.scripts.util.write_field(system.m, "m0.omf")
+    # The names of the files being written are not reused.
+    assert 'B_ext.add(LoadFile("B_ext.ovf"), 1)' in mx3
+    assert 'B_ext.add(LoadFile("B_ext_1.ovf"), 1)' in mx3
+    assert set(telemetry.files_written) == {"B_ext.ovf", "B_ext_1.ovf", "m0.omf"}
+    assert {"write_ovf", "write_wait"} <= set(telemetry.memory)
+    assert np.allclose(
+        df.Field.from_file("B_ext_1.ovf").array, [2 * mm.consts.mu0, 0, 0]
+    )
+
+    writes = mc.scripts.util.concurrent_writes()
+    with pytest.raises(OSError, match="failing.ovf"), writes:
+        mc.scripts.util.write_field(FailingField(), "failing.ovf")
+        mc.scripts.util.write_field(system.m, "m1.omf")
+    assert (tmp_path / "m1.omf").exists()
+
+    with pytest.raises(RuntimeError), mc.scripts.util.concurrent_writes():
+        mc.scripts.util.write_field(FailingField(), "failing.ovf")
+        raise RuntimeError("script generation failed")
+
+
+def test_drive_concurrent_writes(fake_runner, tmp_path):
+    system = mm.examples.macrospin()
+    mc.MinDriver().drive(system, dirname=tmp_path, runner=fake_runner)
+    mc.MinDriver().drive(system, dirname=tmp_path, write_workers=2, runner=fake_runner)
+    telemetry = mc.telemetry.collect(tmp_path)
+    assert np.isnan(telemetry["write_wait_time"][0])  # sequential by default
+    assert telemetry["write_wait_time"][1] >= 0
+    assert all(telemetry["script_time"] >= 0)
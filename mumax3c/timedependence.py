@@ -0,0 +1,196 @@
+"""Time dependences of excitations compiled into mumax3 expressions.
+
+mumax3 evaluates the time dependence of an excitation (e.g. the current density
+``J``) from an expression of the simulation time ``t`` in the mx3 script. The
+classes in this module are callables, so they can be passed as ``func`` to
+``micromagneticmodel.ZhangLi``, and know their mumax3 expression. Other callables
+are sampled at multiples of ``dt`` and converted to a ``Table``; mumax3 evaluates
+every step of the table at every time step, so at most 1000 samples are allowed.
+
+"""
+
+import abc
+import numbers
+
+import numpy as np
+
+_max_samples = 1000
+
+
+class TimeDependence(abc.ABC):
+    """Base class of time dependences with a mumax3 expression."""
+
+    @abc.abstractmethod
+    def __call__(self, t):
+        """Value of the time dependence at time ``t``."""
+
+    @property
+    @abc.abstractmethod
+    def expression(self):
+        """mumax3 expression of the time dependence."""
+
+    def __repr__(self):
+        arguments = ", ".join(f"{key}={value!r}" for key, value in vars(self).items())
+        return f"{self.__class__.__name__}({arguments})"
+
+
+class Pulse(TimeDependence):
+    """Rectangular pulse of ``amplitude`` between ``t0`` and ``t0 + width``.
+
+    Examples
+    --------
+    1. A pulse of 1 ns starting at 0.5 ns.
+
+    >>> import mumax3c as mc
+    ...
+    >>> pulse = mc.timedependence.Pulse(width=1e-9, t0=5e-10)
+    >>> pulse(1e-9), pulse(2e-9)
+    (1.0, 0.0)
+    >>> pulse.expression
+    'heaviside(t - 5e-10) * heaviside(5e-10 + 1e-09 - t)'
+
+    """
+
+    def __init__(self, width, t0=0, amplitude=1):
+        if not width > 0:
+            msg = f"Cannot define a pulse with {width=}."
+            raise ValueError(msg)
+        self.width = width
+        self.t0 = t0
+        self.amplitude = amplitude
+
+    def __call__(self, t):
+        return float(self.amplitude * (self.t0 <= t <= self.t0 + self.width))
+
+    @property
+    def expression(self):
+        t0, width = self.t0, self.width
+        expression = f"heaviside(t - {t0}) * heaviside({t0} + {width} - t)"
+        return _scale(self.amplitude, expression)
+
+
+class Sine(TimeDependence):
+    """Sinusoidal time dependence ``offset + amplitude sin(2 pi frequency t + phase)``.
+
+    Examples
+    --------
+    1. An alternating current at 1 GHz.
+
+    >>> import mumax3c as mc
+    ...
+    >>> sine = mc.timedependence.Sine(frequency=1e9)
+    >>> round(sine(2.5e-10), 3)
+    1.0
+    >>> sine.expression
+    'sin(2 * pi * 1000000000.0 * t)'
+
+    """
+
+    def __init__(self, frequency, phase=0, amplitude=1, offset=0):
+        self.frequency = frequency
+        self.phase = phase
+        self.amplitude = amplitude
+        self.offset = offset
+
+    def __call__(self, t):
+        phase = 2 * np.pi * self.frequency * t + self.phase
+        return float(self.offset + self.amplitude * np.sin(phase))
+
+    @property
+    def expression(self):
+        argument = f"2 * pi * {float(self.frequency)} * t"
+        if self.phase:
+            argument += f" + {self.phase}"
+        expression = _scale(self.amplitude, f"sin({argument})")
+        return f"{self.offset} + {expression}" if self.offset else expression
+
+
+class Table(TimeDependence):
+    """Piecewise-constant time dependence.
+
+    The value is ``values[i]`` from ``times[i]`` to ``times[i + 1]``, zero before
+    ``times[0]`` and ``values[-1]`` after ``times[-1]``. In the mumax3 expression,
+    every change of the value is a step function, so consecutive equal values do
+    not lengthen the expression.
+
+    Examples
+    --------
+    1. Switching a current on and reversing it.
+
+    >>> import mumax3c as mc
+    ...
+    >>> table = mc.timedependence.Table(times=[0, 1e-9, 2e-9], values=[1, 1, -1])
+    >>> table(1.5e-9), table(3e-9)
+    (1.0, -1.0)
+    >>> table.expression
+    '1.0 * heaviside(t - 0.0) + -2.0 * heaviside(t - 2e-09)'
+
+    """
+
+    def __init__(self, times, values):
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if times.ndim != 1 or times.shape != values.shape or not len(times):
+            msg = f"Cannot define a table with {len(times)=} and {len(values)=}."
+            raise ValueError(msg)
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("The times of a table must be increasing.")
+        self.times = times
+        self.values = values
+
+    @classmethod
+    def sample(cls, func, dt, t):
+        """Table of ``func`` evaluated at the multiples of ``dt`` up to ``t``.
+
+        Raises ``ValueError`` if more than 1000 samples are required.
+
+        """
+        if not isinstance(dt, numbers.Real) or dt <= 0:
+            msg = f"Cannot sample a time dependence with {dt=}."
+            raise ValueError(msg)
+        samples = int(np.ceil(t / dt)) + 1
+        if samples > _max_samples:
+            msg = (
+                f"Sampling {func!r} with {dt=} up to {t=} requires {samples} samples,"
+                f" but at most {_max_samples} are allowed. Use a larger dt or define"
+                " the time dependence with Pulse, Sine or Table."
+            )
+            raise ValueError(msg)
+        times = np.arange(samples) * dt
+        return cls(times, [func(time) for time in times])
+
+    def __call__(self, t):
+        index = np.searchsorted(self.times, t, side="right") - 1
+        return float(self.values[index]) if index >= 0 else 0.0
+
+    @property
+    def expression(self):
+        steps = np.diff(self.values, prepend=0)
+        terms = [
+            f"{step} * heaviside(t - {time})"
+            for time, step in zip(self.times.tolist(), steps.tolist())
+            if step != 0
+        ]
+        return " + ".join(terms) or "0"
+
+
+def _scale(amplitude, expression):
+    return expression if amplitude == 1 else f"{amplitude} * ({expression})"
+
+
+def expression(func=None, dt=None, t=None):
+    """mumax3 expression of the time dependence ``func``.
+
+    ``TimeDependence`` objects are converted directly, other callables are sampled
+    at the multiples of ``dt`` up to ``t`` (see ``Table.sample``). Without ``func``
+    the expression is ``"1"`` (constant in time).
+
+    """
+    if func is None:
+        return "1"
+    if not isinstance(func, TimeDependence):
+        if dt is None:
+            msg = f"A time step dt is required to sample {func!r}."
+            raise ValueError(msg)
+        func = Table.sample(func, dt, t)
+    return func.expression